@@ -1,14 +1,106 @@
 from typing import List, Union, Optional, Tuple
-from copy import deepcopy
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+import atexit
+import hashlib
+import json
 import math
+import os
+import sys
+import threading
+import zlib
 
 
 def _gcd(a: int, b: int) -> int:
-    """Calculate greatest common divisor using Euclidean algorithm."""
-    a, b = abs(a), abs(b)
-    while b:
-        a, b = b, a % b
-    return a
+    """Calculate greatest common divisor (non-negative)."""
+    return math.gcd(a, b)
+
+
+class CacheInfo(namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])):
+    """Cache statistics, same fields as functools.lru_cache().cache_info()."""
+    __slots__ = ()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of cacheable lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _OpCache:
+    """
+    Bounded LRU memo for Fraction binary operations.
+    
+    Only operands whose numerator and denominator are ints shorter than
+    `max_bits` bits are cached, so large intermediate values never evict the
+    small ones that keep recurring during elimination.
+    """
+    
+    def __init__(self, maxsize: int = 4096, max_bits: int = 32):
+        self.enabled = False
+        self.maxsize = maxsize
+        self.max_bits = max_bits
+        self.hits = 0
+        self.misses = 0
+        self._table = OrderedDict()
+    
+    def lookup(self, op: str, a, b, compute):
+        """Return compute(a, b), memoized when both operands are small."""
+        limit = 1 << self.max_bits
+        an, ad, bn, bd = a.num, a.den, b.num, b.den
+        if not (-limit < an < limit and ad < limit and -limit < bn < limit and bd < limit):
+            return compute(a, b)
+        key = (op, an, ad, bn, bd)
+        table = self._table
+        result = table.get(key)
+        if result is not None:
+            table.move_to_end(key)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute(a, b)
+        table[key] = result
+        if len(table) > self.maxsize:
+            table.popitem(last=False)
+        return result
+    
+    def clear(self):
+        self._table.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._table))
+
+
+_op_cache = _OpCache()
+
+# Interned values for the most common results (filled in after Fraction is defined)
+_INTERNED = {}
+
+
+def _reduced_fraction(num, den):
+    """
+    Build a Fraction from integer num/den without going through __init__.
+    Normalizes sign, reduces to lowest terms and returns interned 0, 1, -1.
+    """
+    if type(num) is not int or type(den) is not int:
+        return Fraction(num, den)
+    if den == 0:
+        raise ZeroDivisionError("Fraction denominator cannot be zero")
+    if den < 0:
+        num, den = -num, -den
+    g = math.gcd(num, den)
+    if g != 1:
+        num //= g
+        den //= g
+    if den == 1 and -1 <= num <= 1:
+        return _INTERNED[num]
+    result = object.__new__(Fraction)
+    result.num = num
+    result.den = den
+    return result
 
 
 def _simplify_expression(expr):
@@ -36,6 +128,10 @@ class Fraction:
             instance = super().__new__(cls)
             return instance
         
+        # Small common integers are shared (see _INTERNED)
+        if denominator is None and type(numerator) is int and -1 <= numerator <= 1 and _INTERNED:
+            return _INTERNED[numerator]
+        
         # Create Fraction normally
         instance = super().__new__(cls)
         return instance
@@ -175,13 +271,61 @@ class Fraction:
         den_val = int(self.den) if isinstance(self.den, Fraction) else self.den
         return num_val // den_val
     
+    @classmethod
+    def enable_cache(cls, maxsize: int = 4096, max_bits: int = 32):
+        """
+        Turn on the LRU memo for +, -, *, / on small operands.
+        
+        Operands qualify when numerator and denominator are shorter than
+        `max_bits` bits. Elimination over small-integer matrices recomputes
+        the same products and reductions constantly, so this pays off there.
+        """
+        _op_cache.maxsize = maxsize
+        _op_cache.max_bits = max_bits
+        _op_cache.enabled = True
+        while len(_op_cache._table) > maxsize:
+            _op_cache._table.popitem(last=False)
+    
+    @classmethod
+    def disable_cache(cls):
+        """Turn off the operation memo and drop its contents."""
+        _op_cache.enabled = False
+        _op_cache.clear()
+    
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """Return hit/miss statistics for the operation memo."""
+        return _op_cache.info()
+    
+    @classmethod
+    def cache_clear(cls):
+        """Clear the operation memo and reset its statistics."""
+        _op_cache.clear()
+    
+    def _add(self, other):
+        # (a/b) + (c/d) = (ad + bc) / bd
+        return _reduced_fraction(self.num * other.den + other.num * self.den,
+                                 self.den * other.den)
+    
+    def _sub(self, other):
+        # (a/b) - (c/d) = (ad - bc) / bd
+        return _reduced_fraction(self.num * other.den - other.num * self.den,
+                                 self.den * other.den)
+    
+    def _mul(self, other):
+        # (a/b) * (c/d) = ac / bd
+        return _reduced_fraction(self.num * other.num, self.den * other.den)
+    
+    def _div(self, other):
+        # (a/b) / (c/d) = ad / bc
+        return _reduced_fraction(self.num * other.den, self.den * other.num)
+    
     def __add__(self, other):
         """Addition."""
         if isinstance(other, Fraction):
-            # (a/b) + (c/d) = (ad + bc) / bd
-            num = self.num * other.den + other.num * self.den
-            den = self.den * other.den
-            return Fraction(num, den)
+            if _op_cache.enabled:
+                return _op_cache.lookup('+', self, other, Fraction._add)
+            return self._add(other)
         elif isinstance(other, (int, float)):
             other_frac = Fraction(other)
             return self + other_frac
@@ -193,10 +337,9 @@ class Fraction:
     def __sub__(self, other):
         """Subtraction."""
         if isinstance(other, Fraction):
-            # (a/b) - (c/d) = (ad - bc) / bd
-            num = self.num * other.den - other.num * self.den
-            den = self.den * other.den
-            return Fraction(num, den)
+            if _op_cache.enabled:
+                return _op_cache.lookup('-', self, other, Fraction._sub)
+            return self._sub(other)
         elif isinstance(other, (int, float)):
             other_frac = Fraction(other)
             return self - other_frac
@@ -212,15 +355,11 @@ class Fraction:
     def __mul__(self, other):
         """Multiplication."""
         if isinstance(other, Fraction):
-            # (a/b) * (c/d) = ac / bd
-            num = self.num * other.num
-            den = self.den * other.den
-            return Fraction(num, den)
+            if _op_cache.enabled:
+                return _op_cache.lookup('*', self, other, Fraction._mul)
+            return self._mul(other)
         elif isinstance(other, (int, float)):
-            other_frac = Fraction(other)
-            num = self.num * other_frac.num
-            den = self.den * other_frac.den
-            return Fraction(num, den)
+            return self * Fraction(other)
         return NotImplemented
     
     def __rmul__(self, other):
@@ -232,10 +371,9 @@ class Fraction:
             # Check for zero division
             if other.num == 0:
                 raise ZeroDivisionError("Cannot divide by zero")
-            # (a/b) / (c/d) = ad / bc
-            num = self.num * other.den
-            den = self.den * other.num
-            return Fraction(num, den)
+            if _op_cache.enabled:
+                return _op_cache.lookup('/', self, other, Fraction._div)
+            return self._div(other)
         elif isinstance(other, (int, float)):
             if other == 0:
                 raise ZeroDivisionError("Cannot divide by zero")
@@ -252,11 +390,11 @@ class Fraction:
     
     def __neg__(self):
         """Negation."""
-        return Fraction(-self.num, self.den)
+        return _reduced_fraction(-self.num, self.den)
     
     def __abs__(self):
         """Absolute value."""
-        return Fraction(abs(self.num), self.den)
+        return _reduced_fraction(abs(self.num), self.den)
     
     def __eq__(self, other):
         """Equality."""
@@ -308,6 +446,528 @@ class Fraction:
         return self.num != 0
 
 
+_INTERNED.update({n: Fraction(n, 1) for n in (-1, 0, 1)})
+
+
+_PRINT_OPTIONS = {'threshold': 1000, 'edgeitems': 3}
+
+
+def set_printoptions(threshold: Optional[int] = None, edgeitems: Optional[int] = None):
+    """
+    Configure how Matrix, System and Vector are displayed (same meaning as
+    numpy's options): anything with more than `threshold` entries only shows
+    `edgeitems` rows/columns at each edge, with '...' in between.
+    
+    Usage:
+        set_printoptions(threshold=100, edgeitems=2)
+    """
+    if threshold is not None:
+        if threshold < 0:
+            raise ValueError("threshold must be non-negative")
+        _PRINT_OPTIONS['threshold'] = threshold
+    if edgeitems is not None:
+        if edgeitems < 1:
+            raise ValueError("edgeitems must be at least 1")
+        _PRINT_OPTIONS['edgeitems'] = edgeitems
+
+
+def get_printoptions() -> dict:
+    """Current display options."""
+    return dict(_PRINT_OPTIONS)
+
+
+def _summary_indices(length: int, summarize: bool) -> List[Optional[int]]:
+    """Indices to display; None marks where the '...' goes."""
+    edge = _PRINT_OPTIONS['edgeitems']
+    if not summarize or length <= 2 * edge:
+        return list(range(length))
+    return list(range(edge)) + [None] + list(range(length - edge, length))
+
+
+def _format_grid(rows, num_rows: int, num_cols: int, align: bool = True) -> List[str]:
+    """
+    One '[a, b, c]' line per displayed row. Large grids are summarized and
+    only the displayed cells are ever converted to strings.
+    """
+    summarize = num_rows * num_cols > _PRINT_OPTIONS['threshold']
+    row_idx = _summary_indices(num_rows, summarize)
+    col_idx = _summary_indices(num_cols, summarize)
+    shown = [None if i is None else
+             ['...' if j is None else str(rows[i][j]) for j in col_idx]
+             for i in row_idx]
+    if align:
+        widths = [max(len(cells[k]) for cells in shown if cells is not None)
+                  for k in range(len(col_idx))]
+    else:
+        widths = [0] * len(col_idx)
+    return ['...' if cells is None else
+            '[' + ', '.join(c.rjust(w) for c, w in zip(cells, widths)) + ']'
+            for cells in shown]
+
+
+def _dump_rows(rows, file=None):
+    """Write every row as '[a, b, c]', one line at a time."""
+    out = file if file is not None else sys.stdout
+    for row in rows:
+        out.write('[' + ', '.join(str(c) for c in row) + ']\n')
+
+
+_UNIT_ROUNDOFF = 2.0 ** -53
+_SUBNORMAL_STEP = 2.0 ** -1074
+
+
+def _round_up(x: float) -> float:
+    return math.nextafter(x, math.inf)
+
+
+def _round_down(x: float) -> float:
+    return math.nextafter(x, -math.inf)
+
+
+def _gamma(k: int) -> float:
+    """Bound on the relative error of a k-term float dot product (rounded up)."""
+    ku = k * _UNIT_ROUNDOFF
+    return _round_up(ku / (1 - ku))
+
+
+class Interval:
+    """
+    Closed float interval [lo, hi] enclosing an exact value.
+    Returned by the verified-numeric mode for certified solution components.
+    """
+    
+    __slots__ = ('lo', 'hi')
+    
+    def __init__(self, lo: float, hi: Optional[float] = None):
+        self.lo = float(lo)
+        self.hi = float(lo) if hi is None else float(hi)
+    
+    @classmethod
+    def from_midrad(cls, mid: float, rad: float) -> "Interval":
+        """Interval containing [mid - rad, mid + rad], rounded outward."""
+        if rad == 0:
+            return cls(mid, mid)
+        return cls(_round_down(mid - rad), _round_up(mid + rad))
+    
+    def __repr__(self):
+        if self.lo == self.hi:
+            return f"Interval({self.lo!r})"
+        return f"Interval({self.lo!r}, {self.hi!r})"
+    
+    def __contains__(self, value):
+        if isinstance(value, Fraction):
+            # Compare exactly: floats are rationals too
+            lo_num, lo_den = self.lo.as_integer_ratio()
+            hi_num, hi_den = self.hi.as_integer_ratio()
+            return (lo_num * value.den <= value.num * lo_den
+                    and value.num * hi_den <= hi_num * value.den)
+        return self.lo <= value <= self.hi
+    
+    def sign(self) -> Optional[int]:
+        """Certified sign (-1, 0, 1), or None when the interval straddles zero."""
+        if self.lo > 0:
+            return 1
+        if self.hi < 0:
+            return -1
+        if self.lo == 0 and self.hi == 0:
+            return 0
+        return None
+    
+    def midpoint(self) -> float:
+        return (self.lo + self.hi) / 2
+    
+    def width(self) -> float:
+        return self.hi - self.lo
+
+
+def _float_midrad(rows):
+    """
+    Split exact rows into float values plus rigorous error bounds
+    (0 where the float is exact, one ulp otherwise).
+    Returns (mid, rad) or None if some entry doesn't fit in a float.
+    """
+    mid, rad = [], []
+    for row in rows:
+        m_row, r_row = [], []
+        for val in row:
+            try:
+                f = val.num / val.den  # int / int is correctly rounded
+            except OverflowError:
+                return None
+            m_row.append(f)
+            r_row.append(0.0 if f.as_integer_ratio() == (val.num, val.den) else math.ulp(f))
+        mid.append(m_row)
+        rad.append(r_row)
+    return mid, rad
+
+
+def _verified_product(X, X_rad, Y, Y_rad):
+    """
+    Float product Z = X @ Y plus a bound Z_rad such that |Z - X' @ Y'| <= Z_rad
+    elementwise for every X' within X_rad of X and Y' within Y_rad of Y.
+    X_rad / Y_rad may be None for operands that are exact.
+    The bound covers the dot-product rounding (gamma_k |X||Y|) and is itself
+    rounded upward.
+    """
+    k = len(Y)
+    g = _gamma(k + 2)
+    cols = list(zip(*Y))
+    abs_cols = [[abs(v) for v in col] for col in cols]
+    rad_cols = list(zip(*Y_rad)) if Y_rad is not None else None
+    Z, Z_rad = [], []
+    for i, row in enumerate(X):
+        abs_row = [abs(v) for v in row]
+        Z.append([sum(map(float.__mul__, row, col)) for col in cols])
+        rad = [g * sum(map(float.__mul__, abs_row, col)) for col in abs_cols]
+        if rad_cols is not None:
+            rad = [r + sum(map(float.__mul__, abs_row, rc)) for r, rc in zip(rad, rad_cols)]
+        if X_rad is not None:
+            x_rad = X_rad[i]
+            rad = [r + sum(map(float.__mul__, x_rad, ac)) for r, ac in zip(rad, abs_cols)]
+            if rad_cols is not None:
+                rad = [r + sum(map(float.__mul__, x_rad, rc)) for r, rc in zip(rad, rad_cols)]
+        Z_rad.append([_round_up(r * (1 + g) + k * _SUBNORMAL_STEP) for r in rad])
+    return Z, Z_rad
+
+
+def _float_pivot_columns(mid) -> Optional[List[int]]:
+    """
+    Pick one pivot column per row of a wide float matrix (rows <= cols) by
+    elimination with partial pivoting. Only a heuristic for choosing a
+    square block to verify; None if some row seems to have no pivot.
+    """
+    A = [row[:] for row in mid]
+    m, n = len(A), len(A[0])
+    scale = max((abs(v) for row in A for v in row), default=0.0)
+    tol = n * _UNIT_ROUNDOFF * scale * 64
+    cols = []
+    pivot_row = 0
+    for col in range(n):
+        if pivot_row >= m:
+            break
+        p = max(range(pivot_row, m), key=lambda r: abs(A[r][col]))
+        if abs(A[p][col]) <= tol:
+            continue
+        A[pivot_row], A[p] = A[p], A[pivot_row]
+        pivot_vals = A[pivot_row]
+        for r in range(pivot_row + 1, m):
+            f = A[r][col] / pivot_vals[col]
+            if f:
+                A[r] = [a - f * b for a, b in zip(A[r], pivot_vals)]
+        cols.append(col)
+        pivot_row += 1
+    return cols if len(cols) == m else None
+
+
+_CERTIFICATE_PRIME = (1 << 61) - 1
+
+
+def _nonzero_determinant_mod_p(rows: List[List[int]], p: int = _CERTIFICATE_PRIME) -> bool:
+    """
+    True when det(rows) mod p != 0, which proves the integer matrix is
+    nonsingular (a False answer is inconclusive).
+    """
+    M = [[v % p for v in row] for row in rows]
+    n = len(M)
+    for col in range(n):
+        pivot_row = next((r for r in range(col, n) if M[r][col]), None)
+        if pivot_row is None:
+            return False
+        M[col], M[pivot_row] = M[pivot_row], M[col]
+        inv = pow(M[col][col], -1, p)
+        pivot = M[col]
+        for r in range(col + 1, n):
+            factor = M[r][col] * inv % p
+            if factor:
+                row = M[r]
+                for j in range(col + 1, n):
+                    row[j] = (row[j] - factor * pivot[j]) % p
+    return True
+
+
+def _rational_from_float(x: float, tol: float) -> Tuple[int, int]:
+    """
+    First continued-fraction convergent p/q of x with |x - p/q| <= tol,
+    i.e. the simplest rational consistent with x's error bound.
+    """
+    xn, xd = x.as_integer_ratio()
+    n, d = xn, xd
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    while True:
+        a = n // d
+        p0, p1 = p1, a * p1 + p0
+        q0, q1 = q1, a * q1 + q0
+        if abs(xn * q1 - p1 * xd) / (xd * q1) <= tol:
+            return p1, q1
+        n, d = d, n - a * d
+        if d == 0:
+            return p1, q1
+
+
+_PIVOTING_STRATEGIES = ("partial", "rook", "complete")
+
+
+def _float_lu(M: List[List[float]], pivoting: str = "partial"):
+    """
+    LU factorization PAQ = LU of a square float matrix.
+    
+    pivoting: "partial" (largest entry in the column), "rook" (an entry
+    that is largest in both its row and column) or "complete" (largest
+    entry in the remaining block).
+    
+    Returns (L, U, row_perm, col_perm, swaps) with (PA)[i] = A[row_perm[i]]
+    and (AQ)[:, j] = A[:, col_perm[j]], or None if every remaining
+    candidate pivot is exactly zero.
+    """
+    if pivoting not in _PIVOTING_STRATEGIES:
+        raise ValueError(f"Unknown pivoting strategy: {pivoting}")
+    n = len(M)
+    A = [list(row) for row in M]
+    L = [[0.0] * n for _ in range(n)]
+    row_perm = list(range(n))
+    col_perm = list(range(n))
+    swaps = 0
+    for k in range(n):
+        if pivoting == "partial":
+            p, q = max(range(k, n), key=lambda r: abs(A[r][k])), k
+        elif pivoting == "complete":
+            p, q, best = k, k, -1.0
+            for r in range(k, n):
+                row = A[r]
+                c = max(range(k, n), key=lambda j: abs(row[j]))
+                if abs(row[c]) > best:
+                    p, q, best = r, c, abs(row[c])
+        else:
+            # Rook: alternate column and row searches until the entry is
+            # maximal in both (terminates since the value strictly grows)
+            p, q = max(range(k, n), key=lambda r: abs(A[r][k])), k
+            while True:
+                c = max(range(k, n), key=lambda j: abs(A[p][j]))
+                if abs(A[p][c]) <= abs(A[p][q]):
+                    break
+                q = c
+                r = max(range(k, n), key=lambda i: abs(A[i][q]))
+                if abs(A[r][q]) <= abs(A[p][q]):
+                    break
+                p = r
+        if A[p][q] == 0:
+            return None
+        if p != k:
+            A[k], A[p] = A[p], A[k]
+            L[k], L[p] = L[p], L[k]
+            row_perm[k], row_perm[p] = row_perm[p], row_perm[k]
+            swaps += 1
+        if q != k:
+            for row in A:
+                row[k], row[q] = row[q], row[k]
+            col_perm[k], col_perm[q] = col_perm[q], col_perm[k]
+            swaps += 1
+        pivot_vals = A[k]
+        pivot = pivot_vals[k]
+        for r in range(k + 1, n):
+            f = A[r][k] / pivot
+            L[r][k] = f
+            if f:
+                row = A[r]
+                row[k + 1:] = [a - f * b for a, b in zip(row[k + 1:], pivot_vals[k + 1:])]
+    for k in range(n):
+        L[k][k] = 1.0
+    U = [[A[i][j] if j >= i else 0.0 for j in range(n)] for i in range(n)]
+    return L, U, row_perm, col_perm, swaps
+
+
+class FloatLU:
+    """
+    Float LU factorization PAQ = LU of a square Matrix (see Matrix.lu).
+    Used for fast numeric solves and the 1-norm condition estimate.
+    """
+    
+    def __init__(self, L, U, row_perm, col_perm, swaps, norm1: float):
+        self.L = L
+        self.U = U
+        self.row_perm = row_perm
+        self.col_perm = col_perm
+        self.swaps = swaps
+        self.norm1 = norm1
+        self.n = len(U)
+    
+    def __repr__(self):
+        return f"FloatLU(n={self.n}, norm1={self.norm1!r})"
+    
+    def solve(self, b) -> List[float]:
+        """Solve A x = b in floats."""
+        n, L, U = self.n, self.L, self.U
+        y = [float(b[p]) for p in self.row_perm]
+        for i in range(n):
+            row = L[i]
+            y[i] -= sum(row[j] * y[j] for j in range(i))
+        for i in range(n - 1, -1, -1):
+            row = U[i]
+            y[i] = (y[i] - sum(row[j] * y[j] for j in range(i + 1, n))) / row[i]
+        x = [0.0] * n
+        for j, c in enumerate(self.col_perm):
+            x[c] = y[j]
+        return x
+    
+    def solve_transpose(self, b) -> List[float]:
+        """Solve A^T x = b in floats."""
+        n, L, U = self.n, self.L, self.U
+        w = [float(b[c]) for c in self.col_perm]
+        for i in range(n):
+            w[i] = (w[i] - sum(U[j][i] * w[j] for j in range(i))) / U[i][i]
+        for i in range(n - 1, -1, -1):
+            w[i] -= sum(L[j][i] * w[j] for j in range(i + 1, n))
+        x = [0.0] * n
+        for i, p in enumerate(self.row_perm):
+            x[p] = w[i]
+        return x
+    
+    def determinant(self) -> float:
+        det = -1.0 if self.swaps % 2 else 1.0
+        for i in range(self.n):
+            det *= self.U[i][i]
+        return det
+    
+    def inverse_norm1_estimate(self, max_iter: int = 5) -> float:
+        """
+        Estimate ||A^-1||_1 with Hager's method as refined by Higham
+        (LAPACK xLACON): a few solves instead of forming the inverse.
+        """
+        n = self.n
+        x = [1.0 / n] * n
+        estimate = 0.0
+        last_j = None
+        for _ in range(max_iter):
+            y = self.solve(x)
+            estimate = sum(abs(v) for v in y)
+            xi = [1.0 if v >= 0 else -1.0 for v in y]
+            z = self.solve_transpose(xi)
+            j = max(range(n), key=lambda i: abs(z[i]))
+            if abs(z[j]) <= sum(zi * xi_ for zi, xi_ in zip(z, x)) or j == last_j:
+                break
+            x = [0.0] * n
+            x[j] = 1.0
+            last_j = j
+        # Higham's extra test vector guards against Hager's worst cases
+        if n > 1:
+            alt = [(-1) ** i * (1 + i / (n - 1)) for i in range(n)]
+            alt_est = 2 * sum(abs(v) for v in self.solve(alt)) / (3 * n)
+            estimate = max(estimate, alt_est)
+        return estimate
+    
+    def cond1_estimate(self) -> float:
+        """Estimate of the 1-norm condition number ||A||_1 * ||A^-1||_1."""
+        return self.norm1 * self.inverse_norm1_estimate()
+
+
+class _VerifiedLU:
+    """
+    Float LU of a square matrix whose entries carry error bounds, plus a
+    certificate that the exact matrix is nonsingular.
+    
+    With PA ~ LU, X_L ~ L^-1 (unit lower, diagonal exactly 1) and
+    X_U ~ U^-1 (diagonal signs exactly those of U), G = X_L PA X_U is
+    enclosed rigorously. If ||I - G||_inf <= beta < 1 then G, and hence A,
+    is nonsingular and sign(det A) = sign(P) * prod(sign(U_ii)).
+    """
+    
+    def __init__(self, perm, swaps, U, X_L, X_U, G, G_rad, beta_rows):
+        self.perm = perm
+        self.swaps = swaps
+        self.U = U
+        self.X_L = X_L
+        self.X_U = X_U
+        self.G = G
+        self.G_rad = G_rad
+        self.beta_rows = beta_rows
+        self.beta = max(beta_rows) if beta_rows else 0.0
+    
+    @classmethod
+    def build(cls, mid, rad) -> Optional["_VerifiedLU"]:
+        """Factor and verify; None when verification doesn't succeed."""
+        n = len(mid)
+        lu = _float_lu(mid, "partial")
+        if lu is None:
+            return None
+        L, U, perm, _, swaps = lu
+        
+        # X_L = L^-1 row by row; the diagonal comes out exactly 1
+        X_L = []
+        for i in range(n):
+            acc = [0.0] * n
+            acc[i] = 1.0
+            for j in range(i):
+                lij = L[i][j]
+                if lij:
+                    acc = [a - lij * x for a, x in zip(acc, X_L[j])]
+            X_L.append(acc)
+        # X_U = U^-1 from the bottom row up
+        X_U = [None] * n
+        for i in range(n - 1, -1, -1):
+            acc = [0.0] * n
+            acc[i] = 1.0
+            for j in range(i + 1, n):
+                uij = U[i][j]
+                if uij:
+                    acc = [a - uij * x for a, x in zip(acc, X_U[j])]
+            d = U[i][i]
+            X_U[i] = [a / d for a in acc]
+            if not all(math.isfinite(v) for v in X_U[i]):
+                return None
+        
+        PA = [mid[p] for p in perm]
+        PA_rad = [rad[p] for p in perm]
+        T, T_rad = _verified_product(X_L, None, PA, PA_rad)
+        G, G_rad = _verified_product(T, T_rad, X_U, None)
+        beta_rows = []
+        for i in range(n):
+            terms = [_round_up(abs((1.0 if i == j else 0.0) - G[i][j])) + G_rad[i][j]
+                     for j in range(n)]
+            beta_rows.append(_round_up(_round_up(math.fsum(terms)) * (1 + _gamma(n))))
+        if max(beta_rows) >= 1:
+            return None
+        return cls(perm, swaps, U, X_L, X_U, G, G_rad, beta_rows)
+    
+    def determinant_sign(self) -> int:
+        sign = -1 if self.swaps % 2 else 1
+        for i in range(len(self.U)):
+            if self.U[i][i] < 0:
+                sign = -sign
+        return sign
+    
+    def solve(self, b_mid, b_rad) -> List[Interval]:
+        """Certified enclosures of x with A x = b (b given as value/bound lists)."""
+        n = len(self.U)
+        Pb = [[b_mid[p]] for p in self.perm]
+        Pb_rad = [[b_rad[p]] for p in self.perm]
+        # G y = c with c = X_L P b and x = X_U y; start from y_hat = c
+        c, c_rad = _verified_product(self.X_L, None, Pb, Pb_rad)
+        y_hat = [[row[0]] for row in c]
+        Gy, Gy_rad = _verified_product(self.G, self.G_rad, y_hat, None)
+        d = [_round_up(abs(c[i][0] - Gy[i][0])) + c_rad[i][0] + Gy_rad[i][0] for i in range(n)]
+        d = [_round_up(v * (1 + 2 * _UNIT_ROUNDOFF)) for v in d]
+        delta = _round_up(max(d) / _round_down(1 - self.beta))
+        y_err = [[_round_up(d[i] + _round_up(self.beta_rows[i] * delta))] for i in range(n)]
+        x, x_rad = _verified_product(self.X_U, None, y_hat, y_err)
+        return [Interval.from_midrad(x[i][0], x_rad[i][0]) for i in range(n)]
+
+
+# Held by every in-place Vector/Matrix operation and by Workspace.snapshot()
+# while it encodes an object, so an autosave never sees a half-applied change
+_MUTATION_LOCK = threading.RLock()
+
+
+def _mutates(method):
+    """Run an in-place operation under _MUTATION_LOCK and bump the object's version."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with _MUTATION_LOCK:
+            result = method(self, *args, **kwargs)
+            self._version += 1
+        return result
+    return wrapper
+
+
 class Vector:
     """Vector class using Fraction for exact arithmetic."""
     
@@ -327,6 +987,8 @@ class Vector:
                     raise ValueError(f"Cannot convert {c} to Fraction")
         self.components = processed
         self.dimension = len(self.components)
+        # Bumped by every in-place change (see _mutates)
+        self._version = 0
     
     @classmethod
     def FS(cls, s: str):
@@ -362,9 +1024,10 @@ class Vector:
         return cls(processed)
     
     def __repr__(self):
-        # Format with column alignment
-        str_components = [str(c) for c in self.components]
-        # Find max width for each column (just one row for vector)
+        # Format with alignment; long vectors are summarized
+        str_components = [('...' if i is None else str(self.components[i]))
+                          for i in _summary_indices(self.dimension, self.dimension > _PRINT_OPTIONS['threshold'])]
+        # Find max width (just one row for vector)
         max_width = max(len(s) for s in str_components) if str_components else 0
         # Right-align each component
         aligned = [s.rjust(max_width) for s in str_components]
@@ -372,7 +1035,11 @@ class Vector:
         return f"Vector(\n  {row_str}\n)"
     
     def __str__(self):
-        return f"[{', '.join(str(c) for c in self.components)}]"
+        return _format_grid([self.components], 1, self.dimension, align=False)[0]
+    
+    def dump(self, file=None):
+        """Write every component (no summarizing) to file, default stdout."""
+        _dump_rows([self.components], file)
     
     def __len__(self):
         return self.dimension
@@ -380,6 +1047,7 @@ class Vector:
     def __getitem__(self, index):
         return self.components[index]
     
+    @_mutates
     def __setitem__(self, index, value):
         if isinstance(value, Fraction):
             self.components[index] = value
@@ -526,6 +1194,33 @@ class Vector:
         return Vector(self.components.copy())
 
 
+class MatrixStructure(namedtuple("MatrixStructure", ["lower_bandwidth", "upper_bandwidth", "blocks"])):
+    """
+    Nonzero structure of a Matrix, see Matrix.structure().
+    
+    lower_bandwidth / upper_bandwidth: largest i - j / j - i over the
+    nonzero entries (i, j). blocks: (start, stop) ranges of the finest
+    block-diagonal split of a square matrix (None if not square).
+    """
+    __slots__ = ()
+    
+    @property
+    def is_upper_triangular(self) -> bool:
+        return self.lower_bandwidth == 0
+    
+    @property
+    def is_lower_triangular(self) -> bool:
+        return self.upper_bandwidth == 0
+    
+    @property
+    def is_diagonal(self) -> bool:
+        return self.lower_bandwidth == 0 and self.upper_bandwidth == 0
+    
+    @property
+    def is_block_diagonal(self) -> bool:
+        return self.blocks is not None and len(self.blocks) > 1
+
+
 class Matrix:
     """Matrix class using Fraction for exact arithmetic."""
     
@@ -598,15 +1293,51 @@ class Matrix:
         self.num_rows = len(self.rows)
         self.num_cols = num_cols
         
-        # Create vector representation for rows
-        self._row_vectors = [Vector(row) for row in self.rows]
+        # Row Vectors are built on demand (None = not built yet), so row
+        # operations during elimination don't pay for a second copy
+        self._row_vectors = [None] * self.num_rows
         # Columns will be computed on demand (lazy evaluation)
         self._column_vectors = None
+        # Float LU factorizations keyed by pivoting strategy
+        self._lu_cache = {}
+        # Per-row (first, last) nonzero column, None = not computed yet
+        self._row_spans = [None] * self.num_rows
+        # MatrixStructure, None = not detected yet
+        self._structure = None
+        # Bumped by every in-place change (see _mutates)
+        self._version = 0
+    
+    def _row_vector(self, index):
+        """Get (building if needed) the Vector for row index."""
+        vec = self._row_vectors[index]
+        if vec is None:
+            vec = Vector(self.rows[index])
+            self._row_vectors[index] = vec
+        return vec
+    
+    def _row_span(self, index):
+        """
+        Return (first, last) column holding a nonzero entry in row index.
+        A zero row gives (num_cols, -1), so range(first, last + 1) is empty.
+        """
+        span = self._row_spans[index]
+        if span is None:
+            row = self.rows[index]
+            # .num truthiness avoids a Fraction.__bool__ call per entry
+            first = 0
+            while first < self.num_cols and not row[first].num:
+                first += 1
+            last = self.num_cols - 1
+            while last >= first and not row[last].num:
+                last -= 1
+            span = (first, last)
+            self._row_spans[index] = span
+        return span
     
     @property
     def row_vectors(self):
         """Get rows as Vector objects."""
-        return self._row_vectors
+        return [self._row_vector(i) for i in range(self.num_rows)]
     
     @property
     def column_vectors(self):
@@ -620,15 +1351,52 @@ class Matrix:
     
     def get_row(self, index):
         """Get row at index as Vector."""
-        return self._row_vectors[index]
+        return self._row_vector(index)
     
     def get_column(self, index):
         """Get column at index as Vector."""
         return self.column_vectors[index]
     
     def _invalidate_column_cache(self):
-        """Invalidate column cache when rows are modified."""
+        """Invalidate column cache (and cached factorizations) when rows are modified."""
         self._column_vectors = None
+        self._lu_cache = {}
+        self._structure = None
+    
+    def structure(self) -> MatrixStructure:
+        """
+        Detect triangular / diagonal / banded / block-diagonal structure.
+        Built from the per-row nonzero spans and cached until a row changes.
+        
+        Example:
+            s = A.structure()
+            s.is_upper_triangular, s.upper_bandwidth, s.blocks
+        """
+        if self._structure is None:
+            spans = [self._row_span(i) for i in range(self.num_rows)]
+            nonzero = [(i, first, last) for i, (first, last) in enumerate(spans) if first <= last]
+            lower = max([i - first for i, first, _ in nonzero] + [0])
+            upper = max([last - i for i, _, last in nonzero] + [0])
+            blocks = None
+            if self.num_rows == self.num_cols:
+                n = self.num_rows
+                # A split after index k needs no nonzero (i, j) with i <= k < j or j <= k < i
+                min_first_after = [n] * (n + 1)
+                for i in range(n - 1, -1, -1):
+                    min_first_after[i] = min(min_first_after[i + 1], spans[i][0])
+                blocks = []
+                start, reach = 0, -1
+                for k in range(n):
+                    reach = max(reach, spans[k][1])
+                    if reach <= k and min_first_after[k + 1] > k:
+                        blocks.append((start, k + 1))
+                        start = k + 1
+            self._structure = MatrixStructure(lower, upper, blocks)
+        return self._structure
+    
+    def _block(self, start: int, stop: int) -> "Matrix":
+        """Square diagonal block rows/cols [start, stop)."""
+        return Matrix([row[start:stop] for row in self.rows[start:stop]])
     
     @classmethod
     def FS(cls, s: str):
@@ -761,26 +1529,23 @@ class Matrix:
         return cls(rows)
     
     def __repr__(self):
-        # Format with column alignment
-        # Convert all to strings
-        str_rows = [[str(c) for c in row] for row in self.rows]
-        # Find max width for each column
-        max_widths = []
-        for col_idx in range(self.num_cols):
-            max_width = max(len(str_rows[row_idx][col_idx]) 
-                          for row_idx in range(self.num_rows))
-            max_widths.append(max_width)
-        # Right-align each column
-        aligned_rows = []
-        for row in str_rows:
-            aligned_row = [row[col_idx].rjust(max_widths[col_idx]) 
-                          for col_idx in range(self.num_cols)]
-            row_str = '[' + ', '.join(aligned_row) + ']'
-            aligned_rows.append(f"  {row_str}")
-        return f"Matrix(\n" + '\n'.join(aligned_rows) + "\n)"
+        # Format with column alignment; large matrices show only the corners
+        lines = _format_grid(self.rows, self.num_rows, self.num_cols)
+        return f"Matrix(\n" + '\n'.join(f"  {line}" for line in lines) + "\n)"
     
     def __str__(self):
-        return '\n'.join('[' + ', '.join(str(c) for c in row) + ']' for row in self.rows)
+        return '\n'.join(_format_grid(self.rows, self.num_rows, self.num_cols, align=False))
+    
+    def dump(self, file=None):
+        """
+        Write the full matrix (no summarizing) row by row to file, default
+        stdout. Only one row is held as text at a time.
+        
+        Usage:
+            with open("A.txt", "w") as f:
+                A.dump(f)
+        """
+        _dump_rows(self.rows, file)
     
     def __eq__(self, other):
         if not isinstance(other, Matrix):
@@ -791,15 +1556,19 @@ class Matrix:
     
     def __getitem__(self, index):
         """Get row by index."""
-        return self._row_vectors[index]
+        return self._row_vector(index)
     
+    @_mutates
     def __setitem__(self, index, value):
         """Set row by index."""
         if isinstance(value, Vector):
             if len(value) != self.num_cols:
                 raise ValueError("Vector dimension must match matrix column count")
-            self._row_vectors[index] = value
-            self.rows[index] = value.components
+            # Copy: later writes through the caller's Vector must not reach the
+            # matrix behind its span/version bookkeeping
+            self.rows[index] = list(value.components)
+            self._row_vectors[index] = None
+            self._row_spans[index] = None
             self._invalidate_column_cache()
         else:
             raise TypeError("Must assign Vector to matrix row")
@@ -808,6 +1577,7 @@ class Matrix:
         """Get element at (row, col)."""
         return self.rows[row][col]
     
+    @_mutates
     def set(self, row, col, value):
         """Set element at (row, col)."""
         if isinstance(value, Fraction):
@@ -817,12 +1587,29 @@ class Matrix:
                 self.rows[row][col] = Fraction(str(value))
             except (ValueError, ZeroDivisionError):
                 raise ValueError(f"Cannot convert {value} to Fraction")
-        self._row_vectors[row][col] = self.rows[row][col]
+        if self._row_vectors[row] is not None:
+            self._row_vectors[row][col] = self.rows[row][col]
+        self._row_spans[row] = None
         self._invalidate_column_cache()
     
     def copy(self):
-        """Return a deep copy of the matrix."""
-        return Matrix(deepcopy(self.rows))
+        """
+        Return a copy of the matrix.
+        Fractions are never modified in place, so copying the row lists is
+        enough; the entries themselves can be shared.
+        """
+        result = Matrix([row[:] for row in self.rows])
+        result._row_spans = self._row_spans[:]
+        return result
+    
+    def freeze(self) -> "FrozenMatrix":
+        """
+        Return an immutable, hashable snapshot of this matrix. Results of
+        the expensive exact operations on it are memoized (see FrozenMatrix).
+        """
+        result = FrozenMatrix([row[:] for row in self.rows])
+        result._row_spans = self._row_spans[:]
+        return result
     
     def transpose(self):
         """Return transpose of matrix."""
@@ -948,17 +1735,123 @@ class Matrix:
 
         return result
     
+    def _identity(self) -> "Matrix":
+        return Matrix([
+            [Fraction(1) if i == j else Fraction(0) for j in range(self.num_cols)]
+            for i in range(self.num_rows)
+        ])
+    
+    def polyval(self, coeffs) -> "Matrix":
+        """
+        Evaluate the matrix polynomial p(A) exactly.
+        
+        coeffs are ordered highest degree first, like numpy.polyval:
+        [c_d, ..., c_1, c_0] means c_d A^d + ... + c_1 A + c_0 I.
+        
+        Uses Paterson-Stockmeyer: with s ~ sqrt(d), only A^2..A^s are formed
+        and p(A) is evaluated as a polynomial in A^s, so about 2*sqrt(d)
+        matrix products are needed instead of d.
+        """
+        if self.num_rows != self.num_cols:
+            raise ValueError("polyval is only defined for square matrices")
+        if not coeffs:
+            raise ValueError("polyval needs at least one coefficient")
+        coeffs = [c if isinstance(c, Fraction) else Fraction(str(c)) for c in coeffs]
+        coeffs.reverse()  # ascending: coeffs[k] multiplies A^k
+        degree = len(coeffs) - 1
+        n = self.num_rows
+        
+        block = max(1, math.isqrt(degree)) if degree else 1
+        powers = [None, self]  # powers[i] = A^i; A^0 is handled on the diagonal
+        for _ in range(2, block + 1):
+            powers.append(powers[-1] * self)
+        
+        def block_sum(start):
+            # sum_{i < block} coeffs[start + i] * A^i, using no matrix products
+            rows = [[Fraction(0)] * n for _ in range(n)]
+            for i in range(min(block, len(coeffs) - start)):
+                c = coeffs[start + i]
+                if not c:
+                    continue
+                if i == 0:
+                    for r in range(n):
+                        rows[r][r] = rows[r][r] + c
+                    continue
+                for r, power_row in enumerate(powers[i].rows):
+                    row = rows[r]
+                    for k, val in enumerate(power_row):
+                        if val:
+                            row[k] = row[k] + c * val
+            return Matrix(rows)
+        
+        # Horner's rule in A^block over the coefficient blocks
+        starts = list(range(0, len(coeffs), block))
+        A_block = powers[block] if block > 1 else self
+        result = block_sum(starts[-1])
+        for start in reversed(starts[:-1]):
+            result = result * A_block + block_sum(start)
+        return result
+    
+    def expm_action(self, v, t: float = 1.0) -> Tuple[float, ...]:
+        """
+        Compute exp(t*A) v in floats without forming exp(t*A) or any matrix
+        power: the time step is split so each piece has ||t*A/s||_1 <= 1 and
+        a truncated Taylor series of matrix-vector products is applied per
+        piece. Returns a tuple of floats, like Vector.floats().
+        """
+        if self.num_rows != self.num_cols:
+            raise ValueError("expm_action is only defined for square matrices")
+        v = Vector._coerce_vector_like(v, "expm_action")
+        if v.dimension != self.num_cols:
+            raise ValueError("Matrix columns must match vector dimension")
+        
+        M = self.floats()
+        cached = next(iter(self._lu_cache.values()), None)
+        norm1 = cached.norm1 if cached is not None else max(
+            (sum(abs(row[j]) for row in M) for j in range(self.num_cols)), default=0.0)
+        steps = max(1, math.ceil(abs(t) * norm1))
+        h = t / steps
+        
+        w = list(v.floats())
+        for _ in range(steps):
+            term = w
+            total = list(w)
+            for k in range(1, 60):
+                term = [h * sum(map(float.__mul__, row, term)) / k for row in M]
+                total = [a + b for a, b in zip(total, term)]
+                term_norm = max((abs(x) for x in term), default=0.0)
+                if term_norm <= _UNIT_ROUNDOFF * max((abs(x) for x in total), default=0.0):
+                    break
+            w = total
+        return tuple(w)
+    
     # Elementary Row Operations
+    # The public ones take _MUTATION_LOCK and bump _version; ref()/rref() and
+    # the determinant work on private copies and call the _ versions directly.
+    @_mutates
     def swap_rows(self, i, j):
         """Swap rows i and j."""
+        self._swap_rows(i, j)
+    
+    @_mutates
+    def scale_row(self, i, scalar):
+        """Multiply row i by scalar."""
+        self._scale_row(i, scalar)
+    
+    @_mutates
+    def add_row_multiple(self, i, j, scalar):
+        """Add scalar * row j to row i."""
+        self._add_row_multiple(i, j, scalar)
+    
+    def _swap_rows(self, i, j):
         if i < 0 or i >= self.num_rows or j < 0 or j >= self.num_rows:
             raise IndexError("Row index out of range")
         self.rows[i], self.rows[j] = self.rows[j], self.rows[i]
         self._row_vectors[i], self._row_vectors[j] = self._row_vectors[j], self._row_vectors[i]
+        self._row_spans[i], self._row_spans[j] = self._row_spans[j], self._row_spans[i]
         self._invalidate_column_cache()
     
-    def scale_row(self, i, scalar):
-        """Multiply row i by scalar."""
+    def _scale_row(self, i, scalar):
         if i < 0 or i >= self.num_rows:
             raise IndexError("Row index out of range")
         # Convert scalar to Fraction if needed
@@ -967,13 +1860,24 @@ class Matrix:
                 scalar = Fraction(str(scalar))
             except (ValueError, ZeroDivisionError):
                 raise ValueError(f"Cannot convert {scalar} to Fraction")
-        # Multiply and simplify each element
-        self.rows[i] = [_simplify_expression(scalar * val) for val in self.rows[i]]
-        self._row_vectors[i] = _simplify_expression(self._row_vectors[i] * scalar)
+        # Multiply and simplify each element inside the nonzero span
+        first, last = self._row_span(i)
+        row = list(self.rows[i])
+        for k in range(first, last + 1):
+            val = row[k]
+            if val:
+                row[k] = _simplify_expression(scalar * val)
+        self.rows[i] = row
+        self._row_vectors[i] = None
+        if not scalar:
+            self._row_spans[i] = None
         self._invalidate_column_cache()
     
-    def add_row_multiple(self, i, j, scalar):
-        """Add scalar * row j to row i."""
+    def _add_row_multiple(self, i, j, scalar):
+        """
+        Only columns inside row j's nonzero span are touched, and zero entries
+        of row j are skipped, so banded/block rows cost O(span) instead of O(n).
+        """
         if i < 0 or i >= self.num_rows or j < 0 or j >= self.num_rows:
             raise IndexError("Row index out of range")
         # Convert scalar to Fraction if needed
@@ -982,40 +1886,71 @@ class Matrix:
                 scalar = Fraction(str(scalar))
             except (ValueError, ZeroDivisionError):
                 raise ValueError(f"Cannot convert {scalar} to Fraction")
-        # Add and simplify each element
-        self.rows[i] = [_simplify_expression(self.rows[i][k] + scalar * self.rows[j][k])
-                       for k in range(self.num_cols)]
-        self._row_vectors[i] = _simplify_expression(self._row_vectors[i] + scalar * self._row_vectors[j])
+        if not scalar:
+            return
+        first_j, last_j = self._row_span(j)
+        if first_j > last_j:
+            return  # row j is all zeros
+        first_i, last_i = self._row_span(i)
+        
+        # Add and simplify each element that can change
+        row_i, row_j = list(self.rows[i]), self.rows[j]
+        for k in range(first_j, last_j + 1):
+            val = row_j[k]
+            if val:
+                row_i[k] = _simplify_expression(row_i[k] + scalar * val)
+        self.rows[i] = row_i
+        self._row_vectors[i] = None
+        
+        # New span is inside the union of both spans; trim ends that cancelled
+        first, last = min(first_i, first_j), max(last_i, last_j)
+        while first <= last and not row_i[first]:
+            first += 1
+        while last >= first and not row_i[last]:
+            last -= 1
+        self._row_spans[i] = (first, last) if first <= last else (self.num_cols, -1)
         self._invalidate_column_cache()
     
-    def ref(self):
-        """Return Row Echelon Form (REF) of matrix."""
+    def ref(self, pivoting: str = "first"):
+        """
+        Return Row Echelon Form (REF) of matrix.
+        
+        pivoting: "first" takes the first nonzero entry in the column;
+        "smallest" takes the nonzero entry with the fewest numerator plus
+        denominator bits, which keeps intermediate Fractions smaller.
+        """
+        if pivoting not in ("first", "smallest"):
+            raise ValueError(f"Unknown pivoting strategy: {pivoting}")
         result = self.copy()
         pivot_row = 0
+        # Rows below col + lower bandwidth are still untouched and zero in
+        # col, so banded matrices only look at O(bandwidth) rows per column
+        lower = self.structure().lower_bandwidth
         
         for col in range(result.num_cols):
+            limit = min(result.num_rows, col + lower + 1)
             # Find pivot
-            pivot_found = False
-            for row in range(pivot_row, result.num_rows):
-                if result.rows[row][col] != 0:
-                    if row != pivot_row:
-                        result.swap_rows(pivot_row, row)
-                    pivot_found = True
-                    break
-            
-            if not pivot_found:
+            candidates = [row for row in range(pivot_row, limit) if result.rows[row][col]]
+            if not candidates:
                 continue
+            if pivoting == "smallest":
+                row = min(candidates, key=lambda r: result.rows[r][col].num.bit_length()
+                                                    + result.rows[r][col].den.bit_length())
+            else:
+                row = candidates[0]
+            if row != pivot_row:
+                result._swap_rows(pivot_row, row)
             
             # Make pivot 1 (optional, but helpful)
             pivot_val = result.rows[pivot_row][col]
             if pivot_val != 1 and pivot_val != 0:
-                result.scale_row(pivot_row, Fraction(1) / pivot_val)
+                result._scale_row(pivot_row, Fraction(1) / pivot_val)
             
             # Eliminate below pivot
-            for row in range(pivot_row + 1, result.num_rows):
-                if result.rows[row][col] != 0:
+            for row in range(pivot_row + 1, limit):
+                if result.rows[row][col]:
                     factor = -result.rows[row][col] / result.rows[pivot_row][col]
-                    result.add_row_multiple(row, pivot_row, factor)
+                    result._add_row_multiple(row, pivot_row, factor)
             
             pivot_row += 1
             if pivot_row >= result.num_rows:
@@ -1023,9 +1958,9 @@ class Matrix:
         
         return result
     
-    def rref(self):
-        """Return Reduced Row Echelon Form (RREF) of matrix."""
-        result = self.ref()
+    def rref(self, pivoting: str = "first"):
+        """Return Reduced Row Echelon Form (RREF) of matrix (pivoting as in ref)."""
+        result = self.ref(pivoting)
         
         # Find pivot positions
         pivots = []
@@ -1035,73 +1970,219 @@ class Matrix:
                 pivots.append((pivot_row, col))
                 pivot_row += 1
         
-        # Back substitution
+        # Back substitution never fills pivot columns, so only rows within
+        # the REF's upper bandwidth of a pivot can hold a nonzero above it
+        upper = result.structure().upper_bandwidth
         for pivot_row, pivot_col in reversed(pivots):
             # Eliminate above pivot
             pivot_val = result.rows[pivot_row][pivot_col]
-            for row in range(pivot_row - 1, -1, -1):
-                if result.rows[row][pivot_col] != 0:
+            for row in range(pivot_row - 1, max(pivot_col - upper, 0) - 1, -1):
+                if result.rows[row][pivot_col]:
                     # Factor should eliminate the coefficient: factor * pivot_val + coeff = 0
                     # So factor = -coeff / pivot_val
                     factor = -result.rows[row][pivot_col] / pivot_val
-                    result.add_row_multiple(row, pivot_row, factor)
+                    result._add_row_multiple(row, pivot_row, factor)
         
         return result
     
     def determinant(self):
-        """Calculate determinant using cofactor expansion."""
+        """
+        Calculate determinant. Triangular matrices use the diagonal product,
+        block-diagonal ones the product of block determinants, anything else
+        exact elimination.
+        """
         if self.num_rows != self.num_cols:
             raise ValueError("Determinant only defined for square matrices")
         
-        if self.num_rows == 1:
-            return self.rows[0][0]
-        
-        if self.num_rows == 2:
-            return self.rows[0][0] * self.rows[1][1] - self.rows[0][1] * self.rows[1][0]
+        structure = self.structure()
+        if structure.is_upper_triangular or structure.is_lower_triangular:
+            det = Fraction(1)
+            for i in range(self.num_rows):
+                det = det * self.rows[i][i]
+                if not det:
+                    break
+            return det
         
-        # Use first row for cofactor expansion
-        det = Fraction(0)
-        for j in range(self.num_cols):
-            # Create minor matrix
-            minor_rows = []
-            for i in range(1, self.num_rows):
-                minor_rows.append([self.rows[i][k] for k in range(self.num_cols) if k != j])
-            minor = Matrix(minor_rows)
-            
-            cofactor = (-1) ** j * self.rows[0][j] * minor.determinant()
-            det += cofactor
+        if structure.is_block_diagonal:
+            det = Fraction(1)
+            for start, stop in structure.blocks:
+                det = det * self._block(start, stop).determinant()
+                if not det:
+                    break
+            return det
         
-        return det
+        return self._elimination_determinant()
     
     def inverse(self):
-        """Calculate inverse matrix using Gauss-Jordan elimination."""
+        """
+        Calculate inverse matrix using Gauss-Jordan elimination.
+        Diagonal matrices are inverted entrywise and block-diagonal ones
+        block by block.
+        """
         if self.num_rows != self.num_cols:
             raise ValueError("Inverse only defined for square matrices")
-        
-        det = self.determinant()
-        if det == 0:
-            raise ValueError("Matrix is singular (determinant is zero)")
+        n = self.num_rows
+        
+        structure = self.structure()
+        if structure.is_diagonal:
+            if not all(self.rows[i][i] for i in range(n)):
+                raise ValueError("Matrix is singular (determinant is zero)")
+            zero = Fraction(0)
+            return Matrix([[Fraction(1) / self.rows[i][i] if j == i else zero for j in range(n)]
+                           for i in range(n)])
+        
+        if structure.is_block_diagonal:
+            inverse_rows = [[Fraction(0)] * n for _ in range(n)]
+            for start, stop in structure.blocks:
+                block_inverse = self._block(start, stop).inverse()
+                for i, row in enumerate(block_inverse.rows):
+                    inverse_rows[start + i][start:stop] = row
+            return Matrix(inverse_rows)
         
         # Create augmented matrix [A | I]
         augmented_rows = []
-        for i in range(self.num_rows):
+        for i in range(n):
             row = self.rows[i].copy()
             row.extend([Fraction(1) if j == i else Fraction(0) 
-                       for j in range(self.num_rows)])
+                       for j in range(n)])
             augmented_rows.append(row)
         
         augmented = Matrix(augmented_rows)
         rref = augmented.rref()
         
+        # Singular exactly when the left half did not reduce to I
+        if any(rref.rows[i][i] != 1 for i in range(n)):
+            raise ValueError("Matrix is singular (determinant is zero)")
+        
         # Extract inverse from right half
         inverse_rows = []
-        for i in range(self.num_rows):
-            inverse_rows.append([rref.rows[i][j] for j in range(self.num_rows, rref.num_cols)])
+        for i in range(n):
+            inverse_rows.append([rref.rows[i][j] for j in range(n, rref.num_cols)])
         
         return Matrix(inverse_rows)
     
-    def rank(self):
-        """Calculate rank of matrix."""
+    def floats(self) -> Tuple[Tuple[float, ...], ...]:
+        """Return matrix entries as a tuple of float row tuples."""
+        return tuple(tuple(float(c) for c in row) for row in self.rows)
+    
+    def lu(self, pivoting: str = "partial") -> FloatLU:
+        """
+        Float LU factorization PAQ = LU for the numeric path.
+        
+        pivoting: "partial", "rook" or "complete". The factorization is
+        cached on the matrix until its rows change.
+        """
+        if self.num_rows != self.num_cols:
+            raise ValueError("LU factorization only defined for square matrices")
+        cached = self._lu_cache.get(pivoting)
+        if cached is not None:
+            return cached
+        M = [list(row) for row in self.floats()]
+        lu = _float_lu(M, pivoting)
+        if lu is None:
+            raise ValueError("Matrix is singular (zero pivot in float LU)")
+        norm1 = max(sum(abs(M[i][j]) for i in range(self.num_rows)) for j in range(self.num_cols))
+        result = FloatLU(*lu, norm1)
+        self._lu_cache[pivoting] = result
+        return result
+    
+    def condition_estimate(self, pivoting: str = "partial") -> float:
+        """
+        Cheap estimate of the 1-norm condition number (Hager/Higham) from
+        the float LU. Singular matrices give math.inf; entries outside
+        the float range raise ValueError.
+        """
+        if pivoting not in _PIVOTING_STRATEGIES:
+            raise ValueError(f"Unknown pivoting strategy: {pivoting}")
+        try:
+            return self.lu(pivoting).cond1_estimate()
+        except OverflowError:
+            raise ValueError("Matrix entries are too large for a float condition estimate") from None
+        except ValueError:
+            if self.num_rows != self.num_cols:
+                raise
+            return math.inf
+    
+    def _verified_lu(self) -> Optional[_VerifiedLU]:
+        """Verified float LU of a square matrix, or None if it can't be certified."""
+        parts = _float_midrad(self.rows)
+        if parts is None:
+            return None
+        return _VerifiedLU.build(*parts)
+    
+    def _verified_full_rank(self) -> bool:
+        """True when full rank min(m, n) is certified in float arithmetic."""
+        parts = _float_midrad(self.rows)
+        if parts is None:
+            return False
+        mid, rad = parts
+        if self.num_rows > self.num_cols:
+            mid, rad = [list(c) for c in zip(*mid)], [list(c) for c in zip(*rad)]
+        cols = _float_pivot_columns(mid)
+        if cols is None:
+            return False
+        block_mid = [[row[c] for c in cols] for row in mid]
+        block_rad = [[row[c] for c in cols] for row in rad]
+        return _VerifiedLU.build(block_mid, block_rad) is not None
+    
+    def _elimination_determinant(self):
+        """Exact determinant by Gaussian elimination (product of pivots)."""
+        work = self.copy()
+        n = work.num_rows
+        lower = self.structure().lower_bandwidth
+        det = Fraction(1)
+        for col in range(n):
+            limit = min(n, col + lower + 1)
+            pivot_row = next((r for r in range(col, limit) if work.rows[r][col]), None)
+            if pivot_row is None:
+                return Fraction(0)
+            if pivot_row != col:
+                work._swap_rows(col, pivot_row)
+                det = -det
+            pivot_val = work.rows[col][col]
+            det = det * pivot_val
+            for row in range(col + 1, limit):
+                if work.rows[row][col]:
+                    work._add_row_multiple(row, col, -work.rows[row][col] / pivot_val)
+        return det
+    
+    def determinant_sign(self, method: str = "exact") -> int:
+        """
+        Sign of the determinant: -1, 0 or 1.
+        
+        method="verified" factors in floats and certifies the sign with
+        rigorous error bounds; it only falls back to exact elimination when
+        the certificate fails (singular or badly conditioned input).
+        """
+        if self.num_rows != self.num_cols:
+            raise ValueError("Determinant only defined for square matrices")
+        if method == "verified":
+            lu = self._verified_lu()
+            if lu is not None:
+                return lu.determinant_sign()
+        elif method != "exact":
+            raise ValueError(f"Unknown method: {method}")
+        det = self._elimination_determinant()
+        return (det > 0) - (det < 0)
+    
+    def rank(self, method: str = "exact"):
+        """
+        Calculate rank of matrix.
+        
+        method="verified" certifies full rank in float arithmetic with
+        rigorous error bounds; rank-deficient or badly conditioned matrices
+        fall back to exact elimination.
+        """
+        if method == "verified":
+            if self._verified_full_rank():
+                return min(self.num_rows, self.num_cols)
+        elif method != "exact":
+            raise ValueError(f"Unknown method: {method}")
+        structure = self.structure()
+        if structure.is_diagonal:
+            return sum(1 for i in range(min(self.num_rows, self.num_cols)) if self.rows[i][i])
+        if structure.is_block_diagonal:
+            return sum(self._block(start, stop).rank() for start, stop in structure.blocks)
         ref_matrix = self.ref()
         rank = 0
         for row in ref_matrix.rows:
@@ -1110,6 +2191,117 @@ class Matrix:
         return rank
 
 
+class _ResultCache:
+    """Bounded LRU memo for FrozenMatrix results, keyed by (operation, args, matrix)."""
+    
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._table = OrderedDict()
+    
+    def lookup(self, key, compute):
+        table = self._table
+        if key in table:
+            table.move_to_end(key)
+            self.hits += 1
+            return table[key]
+        self.misses += 1
+        result = compute()
+        if isinstance(result, Matrix):
+            # Cached matrices are shared between callers, so they must not change
+            result = result.freeze()
+        table[key] = result
+        while len(table) > self.maxsize:
+            table.popitem(last=False)
+        return result
+    
+    def clear(self):
+        self._table.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._table))
+
+
+_result_cache = _ResultCache()
+
+
+class FrozenMatrix(Matrix):
+    """
+    Immutable Matrix with a cached content hash (create with Matrix.freeze()).
+    
+    rref, ref, inverse, determinant and rank results are kept in a shared
+    LRU cache keyed by (operation, arguments, matrix), so repeating them on
+    equal data is free. Matrix results come back frozen; use copy() for a
+    mutable Matrix.
+    """
+    
+    def __init__(self, rows, rows_as_vectors: bool = False):
+        super().__init__(rows, rows_as_vectors)
+        self._hash = None
+    
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenMatrix is immutable; use copy() for a mutable Matrix")
+    
+    __setitem__ = _immutable
+    set = _immutable
+    swap_rows = _immutable
+    scale_row = _immutable
+    add_row_multiple = _immutable
+    
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.num_rows, self.num_cols,
+                               tuple((val.num, val.den) for row in self.rows for val in row)))
+        return self._hash
+    
+    def __eq__(self, other):
+        if isinstance(other, FrozenMatrix) and hash(self) != hash(other):
+            return False
+        return super().__eq__(other)
+    
+    def freeze(self) -> "FrozenMatrix":
+        """Already frozen."""
+        return self
+    
+    def ref(self, pivoting: str = "first"):
+        return _result_cache.lookup(("ref", pivoting, self), lambda: Matrix.ref(self, pivoting))
+    
+    def rref(self, pivoting: str = "first"):
+        # Matrix.rref reduces the REF in place, so start from a mutable copy
+        return _result_cache.lookup(("rref", pivoting, self), lambda: Matrix.rref(self.copy(), pivoting))
+    
+    def determinant(self):
+        return _result_cache.lookup(("determinant", self), lambda: Matrix.determinant(self))
+    
+    def inverse(self):
+        return _result_cache.lookup(("inverse", self), lambda: Matrix.inverse(self))
+    
+    def rank(self, method: str = "exact"):
+        return _result_cache.lookup(("rank", method, self), lambda: Matrix.rank(self, method))
+    
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """Hit/miss statistics for the shared result cache."""
+        return _result_cache.info()
+    
+    @classmethod
+    def cache_clear(cls):
+        """Drop all memoized results."""
+        _result_cache.clear()
+    
+    @classmethod
+    def set_cache_size(cls, maxsize: int):
+        """Change how many results are kept (least recently used go first)."""
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+        _result_cache.maxsize = maxsize
+        while len(_result_cache._table) > maxsize:
+            _result_cache._table.popitem(last=False)
+
+
 class System:
     """System of linear equations represented as an augmented matrix."""
     
@@ -1233,13 +2425,142 @@ class System:
         matrix = Matrix.FI(prompt)
         return cls(matrix)
     
-    def solution(self):
+    def _verified_solution(self):
+        """
+        Solve a square system in float arithmetic with a certificate.
+        Returns a solution dict whose solution is a list of Interval
+        enclosures, or None when the coefficient matrix can't be certified
+        nonsingular.
+        """
+        n = self.num_variables
+        if self.num_equations != n:
+            return None
+        coeffs = [row[:n] for row in self.matrix.rows]
+        parts = _float_midrad(coeffs)
+        rhs = _float_midrad([[row[n]] for row in self.matrix.rows])
+        if parts is None or rhs is None:
+            return None
+        lu = _VerifiedLU.build(*parts)
+        if lu is None:
+            return None
+        x = lu.solve([r[0] for r in rhs[0]], [r[0] for r in rhs[1]])
+        return {
+            'type': 'unique',
+            'solution': x,
+            'message': f'Unique solution (enclosures): {x}',
+            'method': 'verified'
+        }
+    
+    def _numeric_then_exact_solution(self, max_refinements: int = 5):
+        """
+        Float LU solve with iterative refinement, continued-fraction
+        reconstruction of each component, then one exact integer check of
+        A x == b (uniqueness comes from det(A) mod p != 0). Returns a
+        solution dict, or None when any step can't be completed.
+        """
+        if self.num_equations != self.num_variables:
+            return None
+        try:
+            return self._numeric_then_exact(max_refinements)
+        except (ValueError, OverflowError, ZeroDivisionError):
+            # singular float LU, or entries/residuals outside float range
+            return None
+    
+    def _numeric_then_exact(self, max_refinements: int):
+        n = self.num_variables
+        coeff = Matrix([row[:n] for row in self.matrix.rows])
+        lu = coeff.lu("partial")
+        
+        # Scale each row [A_i | b_i] by the lcm of its denominators -> ints
+        int_rows, int_rhs, scales = [], [], []
+        for row in self.matrix.rows:
+            if any(type(v.num) is not int or type(v.den) is not int for v in row):
+                return None
+            scale = 1
+            for v in row:
+                scale = scale * v.den // math.gcd(scale, v.den)
+            ints = [v.num * (scale // v.den) for v in row]
+            int_rows.append(ints[:n])
+            int_rhs.append(ints[n])
+            scales.append(scale)
+        
+        # A x == b alone doesn't make x the only solution
+        if not _nonzero_determinant_mod_p(int_rows):
+            return None
+        
+        x = lu.solve([float(row[n]) for row in self.matrix.rows])
+        correction = math.inf
+        for _ in range(max_refinements):
+            if not all(math.isfinite(v) for v in x):
+                return None
+            # Exact residual: x_j = X_j / 2^E with a common exponent E
+            ratios = [v.as_integer_ratio() for v in x]
+            shift = max(d.bit_length() - 1 for _, d in ratios)
+            X = [p << (shift - (d.bit_length() - 1)) for p, d in ratios]
+            residual_ints = [(beta << shift) - sum(a * xj for a, xj in zip(row, X) if a)
+                             for row, beta in zip(int_rows, int_rhs)]
+            if not any(residual_ints):
+                correction = 0.0
+                break
+            denom = 1 << shift
+            residual = [r / (s_i * denom) for r, s_i in zip(residual_ints, scales)]
+            dx = lu.solve(residual)
+            x = [a + b for a, b in zip(x, dx)]
+            new_correction = max(abs(v) for v in dx)
+            if new_correction >= correction:
+                break
+            correction = new_correction
+            if correction <= _UNIT_ROUNDOFF * max(abs(v) for v in x):
+                break
+        
+        size = max(abs(v) for v in x)
+        # A normwise tolerance first, then a tighter componentwise one
+        for tolerances in ([4 * (correction + _UNIT_ROUNDOFF * size)] * n,
+                           [2 * _UNIT_ROUNDOFF * abs(v) for v in x]):
+            parts = [_rational_from_float(v, tol) for v, tol in zip(x, tolerances)]
+            common = 1
+            for _, q in parts:
+                common = common * q // math.gcd(common, q)
+            P = [p * (common // q) for p, q in parts]
+            if all(sum(a * pj for a, pj in zip(row, P) if a) == beta * common
+                   for row, beta in zip(int_rows, int_rhs)):
+                solution = Vector([_reduced_fraction(p, q) for p, q in parts])
+                return {
+                    'type': 'unique',
+                    'solution': solution,
+                    'message': f'Unique solution: {solution}',
+                    'method': 'numeric-then-exact'
+                }
+        return None
+    
+    def solution(self, method: str = "exact"):
         """
         Solve the system of linear equations.
         Returns a dictionary with:
         - 'type': 'no_solution', 'unique', or 'infinite'
         - 'solution': solution vector (if unique) or parameterization (if infinite)
+        
+        method="verified" solves square systems in float arithmetic with
+        rigorous error bounds. A certified unique solution comes back as a
+        list of Interval enclosures (and 'method': 'verified'); anything that
+        can't be certified falls back to the exact path.
+        
+        method="numeric-then-exact" solves in floats with iterative
+        refinement, recovers exact rationals by continued fractions and
+        checks A x == b exactly; if that fails it falls back to the exact
+        path, so the answer is always exact.
         """
+        if method == "verified":
+            result = self._verified_solution()
+            if result is not None:
+                return result
+        elif method == "numeric-then-exact":
+            result = self._numeric_then_exact_solution()
+            if result is not None:
+                return result
+        elif method != "exact":
+            raise ValueError(f"Unknown method: {method}")
+        
         rref = self.matrix.rref()
         
         # Check for inconsistency (row like [0, 0, ..., 0, |, non-zero])
@@ -1332,33 +2653,119 @@ class System:
             'message': f'Infinite solutions with {len(free_vars)} free variable(s)'
         }
     
-    def solve(self):
+    def parametric_solution(self) -> "ParametricSolution":
+        """
+        Solve for a symbolic right-hand side b = (b1, ..., bm).
+        
+        Only the coefficient part is used: [A | I] is reduced once and the
+        result is an exact affine map of b plus the consistency conditions,
+        so each new b costs a matrix-vector product instead of an
+        elimination.
+        
+        Usage:
+            P = S.parametric_solution()
+            P.evaluate([5, 11])    # same dictionary as S.solution()
+        """
+        n = self.num_variables
+        return ParametricSolution(Matrix([row[:n] for row in self.matrix.rows]))
+    
+    def integer_solution(self):
+        """
+        Solve the system over the integers (linear Diophantine system).
+        Stays in Python ints throughout; coefficients must be integers.
+        
+        Returns a dictionary with:
+        - 'type': 'no_solution', 'unique', or 'infinite'
+        - 'solution': one integer solution (list of ints) or None
+        - 'kernel': integer kernel basis; every solution is
+          solution + t1*kernel[0] + t2*kernel[1] + ... with integer t's
+        """
+        rows = _integer_rows(self.matrix, "Integer solving")
+        n = self.num_variables
+        b = [row[n] for row in rows]
+        # T A^T = E with T unimodular, so A T^T = E^T and x = T^T y
+        transposed = [[row[j] for row in rows] for j in range(n)]
+        E, T, rank = _echelon_with_transform(transposed)
+        
+        y = []
+        for k in range(rank):
+            c = next(j for j, v in enumerate(E[k]) if v)
+            acc = b[c] - sum(E[i][c] * y[i] for i in range(k))
+            q, rem = divmod(acc, E[k][c])
+            if rem:
+                y = None
+                break
+            y.append(q)
+        if y is not None:
+            # Every equation (not only the pivot ones) has to hold
+            for j in range(len(b)):
+                if sum(E[i][j] * y[i] for i in range(rank)) != b[j]:
+                    y = None
+                    break
+        if y is None:
+            return {
+                'type': 'no_solution',
+                'solution': None,
+                'kernel': [],
+                'message': 'No integer solution'
+            }
+        
+        x = [0] * n
+        for coeff, t_row in zip(y, T):
+            if coeff:
+                x = [a + coeff * t for a, t in zip(x, t_row)]
+        kernel = _hermite_rows(T[rank:], n)
+        x = _reduce_against(x, kernel)
+        if not kernel:
+            return {
+                'type': 'unique',
+                'solution': x,
+                'kernel': [],
+                'message': f'Unique integer solution: {x}'
+            }
+        return {
+            'type': 'infinite',
+            'solution': x,
+            'kernel': kernel,
+            'message': f'Infinite integer solutions with {len(kernel)} parameter(s)'
+        }
+    
+    def solve(self, file=None):
         """
         Solve the system and print the result nicely.
+        
+        Large solutions are summarized on screen (see set_printoptions);
+        pass a file object to write every variable in full instead.
         """
         result = self.solution()
+        out = file if file is not None else sys.stdout
+        summarize = file is None and self.num_variables > _PRINT_OPTIONS['threshold']
+        shown = _summary_indices(self.num_variables, summarize)
         
         if result['type'] == 'no_solution':
-            print("No solution - system is inconsistent")
+            print("No solution - system is inconsistent", file=out)
         
         elif result['type'] == 'unique':
             sol = result['solution']
-            print("Unique solution:")
+            print("Unique solution:", file=out)
             # Format as [x1, x2, ...] = [values] with nice fraction display
-            var_names = ', '.join(f"x{i+1}" for i in range(self.num_variables))
-            sol_str = '[' + ', '.join(str(c) for c in sol.components) + ']'
-            print(f"  [{var_names}] = {sol_str}")
+            var_names = ', '.join('...' if i is None else f"x{i+1}" for i in shown)
+            sol_str = '[' + ', '.join('...' if i is None else str(sol.components[i]) for i in shown) + ']'
+            print(f"  [{var_names}] = {sol_str}", file=out)
         
         elif result['type'] == 'infinite':
             param = result['solution']
             free_vars = param['free_variables']
             expressions = param['expressions']
             
-            print(f"Infinite solutions with {len(free_vars)} free variable(s):")
-            print()
+            print(f"Infinite solutions with {len(free_vars)} free variable(s):", file=out)
+            print(file=out)
             
             # Print each variable's expression
-            for var_idx in range(self.num_variables):
+            for var_idx in shown:
+                if var_idx is None:
+                    print("  ...", file=out)
+                    continue
                 expr = expressions[var_idx]
                 var_name = f"x{var_idx + 1}"
                 
@@ -1388,26 +2795,16 @@ class System:
                     parts.append("0")
                 
                 expr_str = " + ".join(parts).replace(" + -", " - ")
-                print(f"  {var_name} = {expr_str}")
+                print(f"  {var_name} = {expr_str}", file=out)
     
     def __repr__(self):
         # Format System with matrix aligned, same format as Matrix
-        # Convert all to strings
-        str_rows = [[str(c) for c in row] for row in self.matrix.rows]
-        # Find max width for each column
-        max_widths = []
-        for col_idx in range(self.matrix.num_cols):
-            max_width = max(len(str_rows[row_idx][col_idx]) 
-                          for row_idx in range(self.matrix.num_rows))
-            max_widths.append(max_width)
-        # Right-align each column
-        aligned_rows = []
-        for row in str_rows:
-            aligned_row = [row[col_idx].rjust(max_widths[col_idx]) 
-                          for col_idx in range(self.matrix.num_cols)]
-            row_str = '[' + ', '.join(aligned_row) + ']'
-            aligned_rows.append(f"  {row_str}")
-        return f"System(\n" + '\n'.join(aligned_rows) + "\n)"
+        lines = _format_grid(self.matrix.rows, self.matrix.num_rows, self.matrix.num_cols)
+        return f"System(\n" + '\n'.join(f"  {line}" for line in lines) + "\n)"
+    
+    def dump(self, file=None):
+        """Write the full augmented matrix (no summarizing) to file, default stdout."""
+        self.matrix.dump(file)
     
     def __str__(self):
         result = "System of Linear Equations:\n"
@@ -1415,6 +2812,362 @@ class System:
         return result
 
 
+class ParametricSolution:
+    """
+    Solution of A x = b as a function of b, from one reduction of [A | I]:
+    
+        x = solution_map * b + t1*null_space[0] + t2*null_space[1] + ...
+    
+    valid exactly when every consistency condition c satisfies c . b = 0.
+    free_variables / basic_variables match the 'infinite' output of
+    System.solution.
+    """
+    
+    def __init__(self, coeff_matrix: Matrix):
+        m, n = coeff_matrix.num_rows, coeff_matrix.num_cols
+        augmented = Matrix([
+            coeff_matrix.rows[i][:] + [Fraction(1) if j == i else Fraction(0) for j in range(m)]
+            for i in range(m)
+        ])
+        rref = augmented.rref()
+        
+        pivots = []
+        pivot_row = 0
+        for col in range(n):
+            if pivot_row < m and rref.rows[pivot_row][col] != 0:
+                pivots.append((pivot_row, col))
+                pivot_row += 1
+        rank = len(pivots)
+        
+        self.num_equations = m
+        self.num_variables = n
+        self.rank = rank
+        self.basic_variables = [pc for _, pc in pivots]
+        basic = set(self.basic_variables)
+        self.free_variables = [i for i in range(n) if i not in basic]
+        
+        # Row pr of the right block is the linear form giving basic variable pc
+        zero_row = [Fraction(0)] * m
+        map_rows = [zero_row] * n
+        for pr, pc in pivots:
+            map_rows[pc] = rref.rows[pr][n:]
+        self.solution_map = Matrix(map_rows)
+        # Zero rows of the left block: their right block must annihilate b
+        self.conditions = [Vector(rref.rows[i][n:]) for i in range(rank, m)]
+        
+        # Free-variable terms of each basic variable (moved to the right side)
+        self._terms = {}
+        for pr, pc in pivots:
+            self._terms[pc] = {fv: -rref.rows[pr][fv] for fv in self.free_variables if rref.rows[pr][fv]}
+        self.null_space = []
+        for fv in self.free_variables:
+            components = [Fraction(0)] * n
+            components[fv] = Fraction(1)
+            for pc, terms in self._terms.items():
+                if fv in terms:
+                    components[pc] = terms[fv]
+            self.null_space.append(Vector(components))
+    
+    def _rhs(self, b) -> List[Fraction]:
+        vector = b if isinstance(b, Vector) else Vector(list(b))
+        if vector.dimension != self.num_equations:
+            raise ValueError("RHS vector dimension must match number of equations")
+        return vector.components
+    
+    def is_consistent(self, b) -> bool:
+        """True when A x = b has a solution."""
+        b = self._rhs(b)
+        return all(not sum((c * v for c, v in zip(cond.components, b) if c), Fraction(0))
+                   for cond in self.conditions)
+    
+    def particular(self, b) -> Vector:
+        """solution_map * b: the solution with every free variable set to 0."""
+        b = self._rhs(b)
+        return Vector([sum((c * v for c, v in zip(row, b) if c), Fraction(0))
+                       for row in self.solution_map.rows])
+    
+    def evaluate(self, b):
+        """Solve for a concrete b; returns the same dictionary as System.solution()."""
+        if not self.is_consistent(b):
+            return {
+                'type': 'no_solution',
+                'solution': None,
+                'message': 'No solution - system is inconsistent'
+            }
+        x = self.particular(b)
+        if not self.free_variables:
+            return {
+                'type': 'unique',
+                'solution': x,
+                'message': f'Unique solution: {x}'
+            }
+        expressions = {}
+        for pc, terms in self._terms.items():
+            expressions[pc] = {'constant': x.components[pc], 'terms': dict(terms)}
+        for fv in self.free_variables:
+            expressions[fv] = {'constant': Fraction(0), 'terms': {fv: Fraction(1)}}
+        return {
+            'type': 'infinite',
+            'solution': {
+                'free_variables': self.free_variables,
+                'basic_variables': self.basic_variables,
+                'expressions': expressions
+            },
+            'message': f'Infinite solutions with {len(self.free_variables)} free variable(s)'
+        }
+    
+    __call__ = evaluate
+    
+    @staticmethod
+    def _linear_form(terms) -> str:
+        """Render [(coeff, name), ...] as '2*b1 - b2'."""
+        parts = []
+        for coeff, name in terms:
+            if not coeff:
+                continue
+            if coeff == 1:
+                parts.append(name)
+            elif coeff == -1:
+                parts.append(f"-{name}")
+            else:
+                parts.append(f"{coeff}*{name}")
+        return " + ".join(parts).replace(" + -", " - ") if parts else "0"
+    
+    def __repr__(self):
+        names = [f"b{i + 1}" for i in range(self.num_equations)]
+        lines = []
+        for var_idx in range(self.num_variables):
+            if var_idx in self._terms:
+                terms = list(zip(self.solution_map.rows[var_idx], names))
+                terms += [(coeff, f"t{fv + 1}") for fv, coeff in sorted(self._terms[var_idx].items())]
+            else:
+                terms = [(Fraction(1), f"t{var_idx + 1}")]
+            lines.append(f"  x{var_idx + 1} = {self._linear_form(terms)}")
+        for cond in self.conditions:
+            lines.append(f"  0 = {self._linear_form(zip(cond.components, names))}")
+        return "ParametricSolution(\n" + '\n'.join(lines) + "\n)"
+
+
+def _integer_rows(matrix, context: str = "Operation") -> List[List[int]]:
+    """Matrix (integer-valued) or list of int lists -> list of int lists."""
+    if isinstance(matrix, Matrix):
+        rows = []
+        for row in matrix.rows:
+            if any(val.den != 1 for val in row):
+                raise ValueError(f"{context} requires integer entries")
+            rows.append([val.num for val in row])
+        return rows
+    if isinstance(matrix, (list, tuple)) and all(isinstance(row, (list, tuple)) for row in matrix):
+        if not all(type(val) is int for row in matrix for val in row):
+            raise ValueError(f"{context} requires integer entries")
+        return [list(row) for row in matrix]
+    raise TypeError(f"{context} requires a Matrix or a list of int rows")
+
+
+def _xgcd(a: int, b: int) -> Tuple[int, int, int]:
+    """Return (g, x, y) with g = gcd(a, b) >= 0 and x*a + y*b = g."""
+    if a and b % a == 0:
+        # Keep the row/column a untouched when it already divides b
+        return (a, 1, 0) if a > 0 else (-a, -1, 0)
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    if a < 0:
+        a, x0, y0 = -a, -x0, -y0
+    return a, x0, y0
+
+
+def _bareiss_profile(rows: List[List[int]]):
+    """
+    Fraction-free (Bareiss) elimination with row pivoting.
+    Returns (rank, pivot_rows, pivot_cols, minor) where minor is the
+    determinant (up to sign) of rows[pivot_rows] restricted to pivot_cols.
+    """
+    M = [row[:] for row in rows]
+    m = len(M)
+    n = len(M[0]) if M else 0
+    order = list(range(m))
+    pivot_cols = []
+    prev = 1
+    r = 0
+    for c in range(n):
+        if r >= m:
+            break
+        p = next((i for i in range(r, m) if M[i][c]), None)
+        if p is None:
+            continue
+        M[r], M[p] = M[p], M[r]
+        order[r], order[p] = order[p], order[r]
+        pivot = M[r][c]
+        for i in range(r + 1, m):
+            lead = M[i][c]
+            row = M[i]
+            for j in range(c + 1, n):
+                row[j] = (row[j] * pivot - lead * M[r][j]) // prev
+            row[c] = 0
+        prev = pivot
+        pivot_cols.append(c)
+        r += 1
+    return r, order[:r], pivot_cols, prev
+
+
+def _hnf_full_rank_mod(rows: List[List[int]], D: int) -> List[List[int]]:
+    """
+    Hermite normal form of a full-rank lattice in Z^r spanned by rows,
+    computed modulo D, a positive multiple of the lattice determinant
+    (Domich-Kannan-Trotter). Every intermediate entry stays below D.
+    """
+    r = len(rows[0])
+    R = D
+    work = [[v % R for v in row] for row in rows]
+    H = []
+    for k in range(r):
+        w = [0] * r
+        w[k] = R
+        killed = []
+        for row in work:
+            b = row[k]
+            if b == 0:
+                if any(row):
+                    killed.append(row)
+                continue
+            a = w[k]
+            g, x, y = _xgcd(a, b)
+            u, v = a // g, b // g
+            new_w = [(x * wi + y * ri) % R for wi, ri in zip(w, row)]
+            new_w[k] = g
+            kill = [(u * ri - v * wi) % R for wi, ri in zip(w, row)]
+            kill[k] = 0
+            w = new_w
+            if any(kill):
+                killed.append(kill)
+        H.append(w)
+        # Lattice of the remaining coordinates contains (R / pivot) * Z^(r-k-1)
+        R //= w[k]
+        work = [[v % R for v in row] for row in killed] if R > 1 else []
+    # Reduce entries above each pivot into [0, pivot)
+    for k in range(r):
+        pivot = H[k][k]
+        for i in range(k):
+            q = H[i][k] // pivot
+            if q:
+                H[i] = [a - q * b for a, b in zip(H[i], H[k])]
+    return H
+
+
+def _fraction_free_solve(A: List[List[int]], B: List[List[int]]):
+    """
+    For nonsingular square integer A, return (d, X) with X = d * A^-1 * B
+    integral, using Bareiss elimination and exact back substitution.
+    """
+    r = len(A)
+    M = [a[:] + b[:] for a, b in zip(A, B)]
+    width = len(M[0])
+    prev = 1
+    for c in range(r):
+        p = next(i for i in range(c, r) if M[i][c])
+        M[c], M[p] = M[p], M[c]
+        pivot = M[c][c]
+        for i in range(c + 1, r):
+            lead = M[i][c]
+            row = M[i]
+            for j in range(c + 1, width):
+                row[j] = (row[j] * pivot - lead * M[c][j]) // prev
+            row[c] = 0
+        prev = pivot
+    d = M[r - 1][r - 1]
+    X = [None] * r
+    for i in range(r - 1, -1, -1):
+        row = M[i]
+        acc = [d * y for y in row[r:]]
+        for j in range(i + 1, r):
+            if row[j]:
+                acc = [a - row[j] * x for a, x in zip(acc, X[j])]
+        X[i] = [a // row[i] for a in acc]
+    return d, X
+
+
+def _hermite_rows(rows: List[List[int]], n: int) -> List[List[int]]:
+    """Nonzero rows of the row-style HNF of an integer matrix with n columns."""
+    if not rows:
+        return []
+    rank, pivot_rows, pivot_cols, minor = _bareiss_profile(rows)
+    if rank == 0:
+        return []
+    # Project onto the pivot columns: a full-rank lattice whose determinant
+    # divides the selected minor, so the modular algorithm applies
+    projected = [[row[c] for c in pivot_cols] for row in rows]
+    H_proj = _hnf_full_rank_mod(projected, abs(minor))
+    if rank == n:
+        return H_proj
+    # Lift back: the projection is injective on the row lattice
+    basis = [rows[i] for i in pivot_rows]
+    basis_proj = [[row[c] for c in pivot_cols] for row in basis]
+    d, X = _fraction_free_solve(basis_proj, basis)
+    H = []
+    for h in H_proj:
+        acc = [0] * n
+        for coeff, x_row in zip(h, X):
+            if coeff:
+                acc = [a + coeff * x for a, x in zip(acc, x_row)]
+        H.append([a // d for a in acc])
+    return H
+
+
+def _echelon_with_transform(rows: List[List[int]]):
+    """
+    Unimodular row reduction of an integer matrix to echelon form,
+    returning (E, T, rank) with T * rows = E and det(T) = +-1.
+    """
+    m = len(rows)
+    n = len(rows[0]) if rows else 0
+    E = [row[:] for row in rows]
+    T = [[1 if i == j else 0 for j in range(m)] for i in range(m)]
+    r = 0
+    for c in range(n):
+        if r >= m:
+            break
+        for i in range(r + 1, m):
+            b = E[i][c]
+            if not b:
+                continue
+            a = E[r][c]
+            g, x, y = _xgcd(a, b)
+            u, v = a // g, b // g
+            E[r], E[i] = ([x * p + y * q for p, q in zip(E[r], E[i])],
+                          [u * q - v * p for p, q in zip(E[r], E[i])])
+            T[r], T[i] = ([x * p + y * q for p, q in zip(T[r], T[i])],
+                          [u * q - v * p for p, q in zip(T[r], T[i])])
+        pivot = E[r][c]
+        if not pivot:
+            continue
+        if pivot < 0:
+            E[r] = [-v for v in E[r]]
+            T[r] = [-v for v in T[r]]
+            pivot = -pivot
+        # Keep rows above small by reducing them against the new pivot
+        for i in range(r):
+            q = E[i][c] // pivot
+            if q:
+                E[i] = [p - q * e for p, e in zip(E[i], E[r])]
+                T[i] = [p - q * t for p, t in zip(T[i], T[r])]
+        r += 1
+    return E, T, r
+
+
+def _reduce_against(vector: List[int], H: List[List[int]]) -> List[int]:
+    """Reduce vector modulo the lattice with HNF rows H (pivot entries into [0, pivot))."""
+    for h in H:
+        c = next(j for j, v in enumerate(h) if v)
+        q = vector[c] // h[c]
+        if q:
+            vector = [a - q * b for a, b in zip(vector, h)]
+    return vector
+
+
 class Ops:
     """Linear Algebra Operations - utility class for operations on vectors and matrices."""
     
@@ -1783,3 +3536,461 @@ class Ops:
         
         # Null space of this matrix is the orthogonal complement
         return Ops.null_space(matrix)
+    
+    @staticmethod
+    def hermite_normal_form(matrix: Union[Matrix, List[List[int]]]) -> List[List[int]]:
+        """
+        Row-style Hermite normal form of an integer matrix: H = U A with U
+        unimodular, H upper echelon, positive pivots and entries above each
+        pivot in [0, pivot). Returns all m rows (zero rows last) as plain
+        ints; no Fraction is built.
+        
+        Works modulo a nonzero maximal minor of A, so intermediate entries
+        never grow past that determinant.
+        
+        Example:
+            Ops.hermite_normal_form(Matrix([[2, 4], [3, 1]]))  # [[1, 7], [0, 10]]
+        """
+        rows = _integer_rows(matrix, "Hermite normal form")
+        n = len(rows[0]) if rows else 0
+        H = _hermite_rows(rows, n)
+        return H + [[0] * n for _ in range(len(rows) - len(H))]
+    
+    @staticmethod
+    def smith_normal_form(matrix: Union[Matrix, List[List[int]]]) -> List[int]:
+        """
+        Diagonal of the Smith normal form of an integer matrix: the
+        invariant factors d1 | d2 | ... (min(m, n) entries, zeros last).
+        
+        Starts from the HNF and diagonalizes modulo its determinant, so the
+        entries stay bounded; plain ints throughout.
+        
+        Example:
+            Ops.smith_normal_form(Matrix([[2, 4, 4], [-6, 6, 12], [10, 4, 16]]))  # [2, 2, 156]
+        """
+        rows = _integer_rows(matrix, "Smith normal form")
+        m, n = len(rows), len(rows[0]) if rows else 0
+        H = _hermite_rows(rows, n)
+        r = len(H)
+        diag = []
+        if r:
+            R = 1
+            for h in H:
+                R *= next(v for v in h if v)
+            A = [[v % R for v in row] for row in H]
+            for i in range(r):
+                while True:
+                    # Clear column i below the diagonal with row operations
+                    for k in range(i + 1, r):
+                        b = A[k][i]
+                        if b:
+                            a = A[i][i]
+                            g, x, y = _xgcd(a, b)
+                            u, v = a // g, b // g
+                            A[i], A[k] = ([(x * p + y * q) % R for p, q in zip(A[i], A[k])],
+                                          [(u * q - v * p) % R for p, q in zip(A[i], A[k])])
+                    # Clear row i right of the diagonal with column operations
+                    refilled = False
+                    for k in range(i + 1, n):
+                        b = A[i][k]
+                        if b:
+                            a = A[i][i]
+                            g, x, y = _xgcd(a, b)
+                            u, v = a // g, b // g
+                            for row in A:
+                                p, q = row[i], row[k]
+                                row[i], row[k] = (x * p + y * q) % R, (u * q - v * p) % R
+                                refilled = refilled or (row is not A[i] and row[i] != 0)
+                    if not refilled:
+                        break
+                d = math.gcd(A[i][i], R)
+                diag.append(d)
+                R //= d
+                if R == 1:
+                    diag.extend([1] * (r - i - 1))
+                    break
+                A = [[v % R for v in row] for row in A]
+            # diag(a, b) ~ diag(gcd, lcm) restores d1 | d2 | ...
+            for i in range(r):
+                for j in range(i + 1, r):
+                    g = math.gcd(diag[i], diag[j])
+                    diag[i], diag[j] = g, diag[i] * diag[j] // g
+        return diag + [0] * (min(m, n) - r)
+    
+    @staticmethod
+    def integer_null_space(matrix: Union[Matrix, List[List[int]]]) -> List[List[int]]:
+        """
+        Basis of the integer kernel {x in Z^n : A x = 0}, in Hermite normal
+        form, as plain int lists.
+        
+        Example:
+            Ops.integer_null_space(Matrix([[2, 4, 6]]))  # [[1, 1, -1], [0, 3, -2]]
+        """
+        rows = _integer_rows(matrix, "Integer null space")
+        n = len(rows[0]) if rows else 0
+        transposed = [list(col) for col in zip(*rows)]
+        _, T, rank = _echelon_with_transform(transposed)
+        return _hermite_rows(T[rank:], n)
+
+
+# Workspace binary format: b"LAW1" + type byte + zlib(payload). The payload
+# is uvarint dimensions followed by row-major entries, each a zigzag
+# numerator and (denominator - 1). Small ints take one byte; bigger ones
+# a length byte plus little-endian bytes.
+_WS_MAGIC = b"LAW1"
+_WS_TYPES = {"V": Vector, "M": Matrix, "F": FrozenMatrix, "S": System}
+
+
+def _ws_put_uint(out: bytearray, z: int):
+    if z < 0xF8:
+        out.append(z)
+        return
+    size = (z.bit_length() + 7) // 8
+    if size <= 6:
+        out.append(0xF7 + size)
+    else:
+        out.append(0xFF)
+        out += size.to_bytes(4, "little")
+    out += z.to_bytes(size, "little")
+
+
+def _ws_get_uint(data, pos: int) -> Tuple[int, int]:
+    b = data[pos]
+    pos += 1
+    if b < 0xF8:
+        return b, pos
+    if b == 0xFF:
+        size = int.from_bytes(data[pos:pos + 4], "little")
+        pos += 4
+    else:
+        size = b - 0xF7
+    return int.from_bytes(data[pos:pos + size], "little"), pos + size
+
+
+def _ws_encode(obj) -> bytes:
+    if isinstance(obj, System):
+        tag, rows = "S", obj.matrix.rows
+    elif isinstance(obj, FrozenMatrix):
+        tag, rows = "F", obj.rows
+    elif isinstance(obj, Matrix):
+        tag, rows = "M", obj.rows
+    elif isinstance(obj, Vector):
+        tag, rows = "V", [obj.components]
+    else:
+        raise TypeError(f"Cannot store {type(obj).__name__} in a workspace")
+    out = bytearray()
+    if tag != "V":
+        _ws_put_uint(out, len(rows))
+    _ws_put_uint(out, len(rows[0]) if rows else 0)
+    for row in rows:
+        for val in row:
+            num, den = val.num, val.den
+            if type(num) is not int or type(den) is not int:
+                raise ValueError("Workspace entries must have integer numerator and denominator")
+            _ws_put_uint(out, num << 1 if num >= 0 else ((-num) << 1) - 1)
+            _ws_put_uint(out, den - 1)
+    return _WS_MAGIC + tag.encode() + zlib.compress(bytes(out), 6)
+
+
+def _ws_source(obj):
+    """The Vector/Matrix whose entries _ws_encode reads for obj."""
+    return obj.matrix if isinstance(obj, System) else obj
+
+
+def _ws_decode(blob: bytes):
+    if blob[:4] != _WS_MAGIC:
+        raise ValueError("Not a workspace object")
+    tag = blob[4:5].decode()
+    data = zlib.decompress(blob[5:])
+    pos = 0
+    if tag == "V":
+        num_rows = 1
+    else:
+        num_rows, pos = _ws_get_uint(data, pos)
+    num_cols, pos = _ws_get_uint(data, pos)
+    rows = []
+    for _ in range(num_rows):
+        row = []
+        for _ in range(num_cols):
+            z, pos = _ws_get_uint(data, pos)
+            den, pos = _ws_get_uint(data, pos)
+            row.append(_reduced_fraction(z >> 1 if not z & 1 else -((z + 1) >> 1), den + 1))
+        rows.append(row)
+    if tag == "V":
+        return Vector(rows[0])
+    if tag == "S":
+        return System(Matrix(rows))
+    return _WS_TYPES[tag](rows)
+
+
+class Workspace:
+    """
+    On-disk store for the named Matrix, Vector and System objects of a REPL
+    session.
+    
+    The store is a directory holding a JSON manifest (name -> content
+    digest) plus one compact binary blob per distinct object content.
+    snapshot() only writes objects whose content changed since the last
+    snapshot; opening a workspace reads just the manifest and decodes an
+    object the first time it is asked for.
+    
+    Usage:
+        ws = Workspace("session.ws")
+        A = ws["A"]                  # decoded on first access
+        ws.autosave(60, globals())   # snapshot every minute and at exit
+    """
+    
+    _STORABLE = (Matrix, Vector, System)
+    
+    def __init__(self, path: str, namespace: Optional[dict] = None):
+        self.path = path
+        self.namespace = namespace
+        os.makedirs(path, exist_ok=True)
+        self._manifest_path = os.path.join(path, "manifest.json")
+        self._entries = {}
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, "r") as f:
+                self._entries = json.load(f)["objects"]
+        # Decoded objects and, per name, (source, version, digest) of what
+        # was last saved; source is the Vector/Matrix that was encoded
+        self._loaded = {}
+        self._saved = {}
+        self._lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+        self._atexit = False
+    
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.path, digest + ".law")
+    
+    def names(self) -> List[str]:
+        return sorted(self._entries)
+    
+    def __contains__(self, name):
+        return name in self._entries
+    
+    def __iter__(self):
+        return iter(self.names())
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __getitem__(self, name):
+        """Decode (once) and return the stored object."""
+        if name not in self._loaded:
+            entry = self._entries.get(name)
+            if entry is None:
+                raise KeyError(name)
+            with open(self._blob_path(entry["digest"]), "rb") as f:
+                obj = _ws_decode(f.read())
+            self._loaded[name] = obj
+            source = _ws_source(obj)
+            self._saved[name] = (source, source._version, entry["digest"])
+        return self._loaded[name]
+    
+    def restore(self, namespace: dict, names: Optional[List[str]] = None):
+        """Decode the given (default: all) objects into namespace."""
+        for name in (self.names() if names is None else names):
+            namespace[name] = self[name]
+    
+    def discard(self, name: str):
+        """Forget a stored object (its blob goes at the next snapshot)."""
+        with self._lock:
+            self._entries.pop(name, None)
+            self._loaded.pop(name, None)
+            self._saved.pop(name, None)
+            self._write_manifest()
+    
+    def snapshot(self, namespace: Optional[dict] = None) -> List[str]:
+        """
+        Save the public Matrix/Vector/System objects of namespace (default:
+        the one given at construction). An object that is still the one last
+        saved, at the same version, isn't even encoded. Returns the names
+        that were written.
+        """
+        namespace = self.namespace if namespace is None else namespace
+        if namespace is None:
+            raise ValueError("No namespace to snapshot")
+        written = []
+        with self._lock:
+            for name, obj in list(namespace.items()):
+                if name.startswith("_") or not isinstance(obj, self._STORABLE):
+                    continue
+                saved = self._saved.get(name)
+                with _MUTATION_LOCK:
+                    source = _ws_source(obj)
+                    version = source._version
+                    # _saved/_loaded hold references, so an id can't be recycled under us
+                    if (saved is not None and self._loaded.get(name) is obj
+                            and saved[0] is source and saved[1] == version):
+                        continue
+                    blob = _ws_encode(obj)
+                digest = hashlib.blake2b(blob, digest_size=16).hexdigest()
+                self._saved[name] = (source, version, digest)
+                self._loaded[name] = obj
+                entry = self._entries.get(name)
+                blob_path = self._blob_path(digest)
+                if entry is not None and entry["digest"] == digest and os.path.exists(blob_path):
+                    continue
+                if not os.path.exists(blob_path):
+                    self._write_file(blob_path, blob)
+                self._entries[name] = {"type": blob[4:5].decode(), "digest": digest, "bytes": len(blob)}
+                written.append(name)
+            if written:
+                self._write_manifest()
+        return written
+    
+    def _write_file(self, path: str, data: bytes):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    
+    def _write_manifest(self):
+        self._write_file(self._manifest_path,
+                         json.dumps({"format": 1, "objects": self._entries}, indent=1).encode())
+        # Drop blobs no name refers to any more
+        live = {entry["digest"] + ".law" for entry in self._entries.values()}
+        for filename in os.listdir(self.path):
+            if filename.endswith(".law") and filename not in live:
+                os.remove(os.path.join(self.path, filename))
+    
+    def autosave(self, interval: float = 60.0, namespace: Optional[dict] = None):
+        """
+        Snapshot every `interval` seconds from a background thread, and
+        once more when the interpreter exits.
+        """
+        if namespace is not None:
+            self.namespace = namespace
+        if self.namespace is None:
+            raise ValueError("No namespace to snapshot")
+        self.stop()
+        self._stop = threading.Event()
+        stop = self._stop
+        
+        def loop():
+            while not stop.wait(interval):
+                self.snapshot()
+        
+        self._thread = threading.Thread(target=loop, name="workspace-autosave", daemon=True)
+        self._thread.start()
+        if not self._atexit:
+            atexit.register(self.snapshot)
+            self._atexit = True
+    
+    def stop(self):
+        """Stop the autosave thread (if running)."""
+        if self._stop is not None:
+            self._stop.set()
+            self._thread.join()
+            self._stop = None
+            self._thread = None
+
+
+def _require_numpy():
+    """Import numpy for the numeric backend (optional dependency)."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("The numeric backend requires numpy (pip install numpy)") from None
+    return numpy
+
+
+def _as_float_array(np, value):
+    """Matrix / Vector / nested list / ndarray -> float64 ndarray."""
+    if isinstance(value, System):
+        value = value.matrix
+    if isinstance(value, (Matrix, Vector)):
+        return np.array(value.floats(), dtype=np.float64)
+    return np.asarray(value, dtype=np.float64)
+
+
+_NUMERIC_OPS = {
+    "matmul": lambda np, a, b: a @ b,
+    "solve": lambda np, a, b: np.linalg.solve(a, b),
+    "lstsq": lambda np, a, b: np.linalg.lstsq(a, b, rcond=None)[0],
+    "rank": lambda np, a: int(np.linalg.matrix_rank(a)),
+    "det": lambda np, a: float(np.linalg.det(a)),
+    "inverse": lambda np, a: np.linalg.inv(a),
+}
+
+_numeric_executor = None
+
+
+class NumericExecutor:
+    """
+    Thread pool for independent float64 jobs (products, solves, rank, ...).
+    
+    NumPy's LAPACK/BLAS calls release the GIL, so jobs really run in
+    parallel. Inputs may be Matrix, Vector, System (its augmented matrix),
+    nested lists or arrays; results are NumPy values. With many small jobs,
+    limit BLAS's own threads (e.g. OPENBLAS_NUM_THREADS=1) to avoid
+    oversubscription.
+    
+    Off by default: NumericExecutor.enable() starts the shared pool.
+    
+    Usage:
+        ex = NumericExecutor.enable()
+        f = ex.submit("solve", A, b)      # Future
+        f.result()
+        ex.map("det", [A, B, C])          # [det(A), det(B), det(C)]
+    """
+    
+    OPS = tuple(_NUMERIC_OPS)
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self._np = _require_numpy()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="numeric")
+    
+    def _run(self, op, mats):
+        np = self._np
+        arrays = [_as_float_array(np, m) for m in mats]
+        if callable(op):
+            return op(*arrays)
+        return _NUMERIC_OPS[op](np, *arrays)
+    
+    def submit(self, op, *mats) -> Future:
+        """
+        Queue op(*mats) and return a Future. op is one of OPS or a callable
+        taking float64 arrays.
+        """
+        if not callable(op) and op not in _NUMERIC_OPS:
+            raise ValueError(f"Unknown operation: {op}")
+        return self._pool.submit(self._run, op, mats)
+    
+    def map(self, op, *iterables) -> list:
+        """Run op over zipped lists of operands concurrently; results in order."""
+        futures = [self.submit(op, *mats) for mats in zip(*iterables)]
+        return [f.result() for f in futures]
+    
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+    
+    @classmethod
+    def enable(cls, max_workers: Optional[int] = None) -> "NumericExecutor":
+        """Start (or restart with a new size) the shared executor and return it."""
+        global _numeric_executor
+        cls.disable()
+        _numeric_executor = cls(max_workers)
+        return _numeric_executor
+    
+    @classmethod
+    def disable(cls):
+        """Shut the shared executor down (pending jobs still finish)."""
+        global _numeric_executor
+        if _numeric_executor is not None:
+            _numeric_executor.shutdown()
+            _numeric_executor = None
+    
+    @classmethod
+    def shared(cls) -> "NumericExecutor":
+        """The shared executor; raises if it hasn't been enabled."""
+        if _numeric_executor is None:
+            raise RuntimeError("Numeric executor is off; call NumericExecutor.enable() first")
+        return _numeric_executor
@@ -1,11 +1,20 @@
 #!/opt/homebrew/bin/python3
 
+import os
+import sys
 from fractions import Fraction
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "math", "lin_alg"))
+from rational_array import RationalArray
+
 DTYPE = Fraction
+# Fractions go in a RationalArray (int64 numerator/denominator arrays) so the
+# row updates below are vectorized; set ARRAY = None for a dtype=object array
+ARRAY = RationalArray if DTYPE is Fraction else None
 
-A = np.array([list(map(DTYPE, input().split())) for i in range(int(input()))], dtype=DTYPE)
+rows = [list(map(DTYPE, input().split())) for i in range(int(input()))]
+A = ARRAY(rows) if ARRAY else np.array(rows, dtype=DTYPE)
 
 total_row = len(A)
 total_column = len(A[0])
@@ -1,21 +1,36 @@
+import os
+import sys
 from fractions import Fraction
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "math", "lin_alg"))
+from rational_array import RationalArray
+
 class Matrix:
     def __init__(self, dt, _input=None):
+        self.ARRAY = None
         if dt == "F":
             self.DTYPE = Fraction
+        elif dt == "R":
+            # exact like "F", stored as int64 numerator/denominator arrays
+            self.DTYPE = Fraction
+            self.ARRAY = RationalArray
         elif dt == "D":
             self.DTYPE = np.float64
         else:
             exit(1)
         if _input != None:
-            self.SYSTEM = np.array(_input, dtype=self.DTYPE)
+            self.SYSTEM = self.make_array(_input)
             self.total_row = len(self.SYSTEM)
             self.total_column = len(self.SYSTEM[0])
 
+    def make_array(self, rows):
+        if self.ARRAY:
+            return self.ARRAY(rows)
+        return np.array(rows, dtype=self.DTYPE)
+
     def input_matrix(self):
-        self.SYSTEM = np.array([list(map(self.DTYPE, input().split())) for i in range(int(input()))])
+        self.SYSTEM = self.make_array([list(map(self.DTYPE, input().split())) for i in range(int(input()))])
         self.total_row = len(self.SYSTEM)
         self.total_column = len(self.SYSTEM[0])
 
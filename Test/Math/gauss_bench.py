@@ -0,0 +1,295 @@
+#!/opt/homebrew/bin/python3
+"""
+differential harness for the Gauss-reduction variants
+
+every engine (the stdin scripts in Lin_Alg_Endeavors_Part*, the Matrix
+classes, math/lin_alg and the REPL tool) gets the same generated systems.
+its RREF is checked against a plain Fraction Gauss-Jordan reference and
+it is timed after one untimed warm-up run. each case runs in its own
+child process (python gauss_bench.py --child ENGINE) so a script that
+calls exit(), hangs or leaks state can't take the others down, and so the
+tracemalloc peak is per engine.
+
+    python gauss_bench.py                        # everything, sizes 4 8 16 32
+    python gauss_bench.py --sizes 8 64 --engines float gauss.R lin_alg.matrix
+    python gauss_bench.py --kinds random large-denominator --repeat 3
+
+the table has one line per engine/kind/size: ok / WRONG / error / timeout,
+the best wall time over --repeat runs, and the peak traced memory. the
+summary at the end ranks the engines that were correct on every case by
+total time.
+"""
+import argparse
+import importlib.util
+import io
+import json
+import os
+import random
+import runpy
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from fractions import Fraction
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.normpath(os.path.join(HERE, "..", ".."))
+LIN_ALG = os.path.join(ROOT, "math", "lin_alg")
+REPL = os.path.join(ROOT, "Linear_Algebra_Repl_Tool")
+
+KINDS = ("random", "singular", "rank-deficient", "large-denominator")
+
+
+# --- inputs ---
+
+def generate(kind, n, rng):
+    """n x (n + 1) augmented system of Fractions"""
+    def small():
+        return Fraction(rng.randint(-9, 9))
+
+    if kind == "random":
+        return [[small() for _ in range(n + 1)] for _ in range(n)]
+    if kind == "singular":
+        # last coefficient row is a combination of two others, rhs is
+        # random, so the system is (almost always) inconsistent
+        rows = [[small() for _ in range(n + 1)] for _ in range(n)]
+        if n > 1:
+            a, b = small(), small()
+            rows[-1][:n] = [a * x + b * y for x, y in zip(rows[0][:n], rows[n // 2 - 1 if n > 2 else 0][:n])]
+        return rows
+    if kind == "rank-deficient":
+        # rank n // 2 (at least 1) augmented matrix: consistent, infinitely many solutions
+        basis = [[small() for _ in range(n + 1)] for _ in range(max(1, n // 2))]
+        rows = []
+        for _ in range(n):
+            coeffs = [small() for _ in basis]
+            rows.append([sum(c * b[j] for c, b in zip(coeffs, basis)) for j in range(n + 1)])
+        return rows
+    if kind == "large-denominator":
+        return [[Fraction(rng.randint(-10 ** 6, 10 ** 6), rng.randint(1, 10 ** 6)) for _ in range(n + 1)]
+                for _ in range(n)]
+    raise ValueError(f"unknown kind {kind}")
+
+
+def reference_rref(rows):
+    """textbook Gauss-Jordan on Fractions, shares no code with the engines"""
+    M = [list(row) for row in rows]
+    m, n = len(M), len(M[0])
+    r = 0
+    for c in range(n):
+        p = next((i for i in range(r, m) if M[i][c]), None)
+        if p is None:
+            continue
+        M[r], M[p] = M[p], M[r]
+        pivot = M[r][c]
+        M[r] = [x / pivot for x in M[r]]
+        for i in range(m):
+            if i != r and M[i][c]:
+                f = M[i][c]
+                M[i] = [x - f * y for x, y in zip(M[i], M[r])]
+        r += 1
+        if r == m:
+            break
+    return M
+
+
+def stdin_text(rows, header=""):
+    lines = [header] if header else []
+    lines.append(str(len(rows)))
+    lines.extend(" ".join(str(x) for x in row) for row in rows)
+    return "\n".join(lines) + "\n"
+
+
+# --- engines ---
+# each engine is run(rows) -> iterable of rows; entries can be any exact
+# number type (stdlib Fraction, the REPL's Fraction, ints)
+
+_modules = {}
+
+
+def _load(path, name):
+    if path not in _modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.path.insert(0, os.path.dirname(path))
+        spec.loader.exec_module(module)
+        _modules[path] = module
+    return _modules[path]
+
+
+def script_engine(relpath, result, header=""):
+    """stdin script; the reduced matrix is left in the global `result`"""
+    path = os.path.join(HERE, relpath)
+
+    def run(rows):
+        sys.stdin = io.StringIO(stdin_text(rows, header))
+        with redirect_stdout(io.StringIO()):
+            return runpy.run_path(path, run_name="__main__")[result]
+    return run
+
+
+def dtype_class_engine(relpath, dt="F"):
+    """numpy Matrix(dt, rows) classes with ref()/rref() on self.SYSTEM"""
+    path = os.path.join(HERE, relpath)
+
+    def run(rows):
+        cls = _load(path, "bench_engine").Matrix
+        A = cls(dt, rows)
+        A.ref()
+        A.rref()
+        return A.SYSTEM
+    return run
+
+
+def vector_class_engine(path):
+    """Vector/Matrix classes with in-place ref()/rref() over self._rows"""
+    def run(rows):
+        A = _load(path, "bench_engine").Matrix(rows)
+        A.ref()
+        A.rref()
+        return A._rows
+    return run
+
+
+def rational_array_engine(rows):
+    return _load(os.path.join(LIN_ALG, "rational_array.py"), "bench_engine").RationalArray(rows).rref()
+
+
+def repl_engine(rows):
+    LA = _load(os.path.join(REPL, "LA.py"), "bench_engine")
+    A = LA.Matrix([[LA.Fraction(x.numerator, x.denominator) for x in row] for row in rows])
+    return A.rref().rows
+
+
+P1, P2, P3 = "Lin_Alg_Endeavors_Part1", "Lin_Alg_Endeavors_Part2", "Lin_Alg_Endeavors_Part3"
+
+ENGINES = {
+    "1_gauss_reduce": script_engine(f"{P1}/1_gauss_reduce.py", "system"),
+    "2_gauss_reduce": script_engine(f"{P1}/2_gauss_reduce.py", "system", header="1"),
+    "3_gauss_reduce": script_engine(f"{P1}/3_gauss_reduce.py", "system"),
+    "4_gauss": script_engine(f"{P1}/4_gauss.py", "system"),
+    "gaussian_reduction_v1": script_engine(f"{P1}/gaussian_reduction_v1.py", "system"),
+    "gaussian_reduction_v2": script_engine(f"{P1}/gaussian_reduction_v2.py", "A"),
+    "gaussian_reduction_v3": script_engine(f"{P2}/gaussian_reduction_v3.py", "A"),
+    "F_gaussian_reduction": script_engine(f"{P1}/F_gaussian_reduction.py", "A"),
+    "float": script_engine(f"{P1}/float.py", "A"),
+    "gauss.F": dtype_class_engine(f"{P1}/gauss.py", "F"),
+    "gauss.R": dtype_class_engine(f"{P1}/gauss.py", "R"),
+    "part1.matrices": dtype_class_engine(f"{P1}/matrices.py"),
+    "part2.matrices": dtype_class_engine(f"{P2}/matrices.py"),
+    "part2.matrices_2": dtype_class_engine(f"{P2}/matrices_2.py"),
+    "part2.matrices_3": dtype_class_engine(f"{P2}/matrices_3.py"),
+    "part3.LA": vector_class_engine(os.path.join(HERE, P3, "LA.py")),
+    "part3.hw": vector_class_engine(os.path.join(HERE, P3, "hw.py")),
+    "part3.matrices": vector_class_engine(os.path.join(HERE, P3, "matrices.py")),
+    "lin_alg.matrix": vector_class_engine(os.path.join(LIN_ALG, "matrix.py")),
+    "lin_alg.LA": vector_class_engine(os.path.join(LIN_ALG, "LA.py")),
+    "rational_array": rational_array_engine,
+    "repl": repl_engine,
+}
+
+
+def _exact(x):
+    if isinstance(x, float):
+        raise TypeError("engine returned floats")
+    if hasattr(x, "numerator"):
+        return Fraction(int(x.numerator), int(x.denominator))
+    if hasattr(x, "num") and hasattr(x, "den"):
+        return Fraction(x.num, x.den)
+    return Fraction(int(x))
+
+
+def child(name, repeat):
+    """run one engine on the case in stdin (json), print a json result"""
+    case = json.load(sys.stdin)
+    rows = [[Fraction(x) for x in row] for row in case["rows"]]
+    stdin = sys.stdin
+    run = ENGINES[name]
+    try:
+        # untimed first run: imports and module loading aren't the engine's cost
+        out = run(rows)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(rows)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        tracemalloc.start()
+        run(rows)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result = {"rref": [[str(_exact(x)) for x in row] for row in out],
+                  "seconds": best, "peak": peak}
+    except SystemExit as e:
+        result = {"error": f"exit({e.code})"}
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"[:60]}
+    sys.stdin = stdin
+    sys.stdout.write(json.dumps(result))
+
+
+def run_case(name, rows, repeat, timeout):
+    payload = json.dumps({"rows": [[str(x) for x in row] for row in rows]})
+    try:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name,
+                               "--repeat", str(repeat)],
+                              input=payload, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": "timeout"}
+    try:
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {"error": (proc.stderr.strip().splitlines() or ["no output"])[-1][:60]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="compare the Gauss-reduction engines")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--kinds", nargs="+", default=list(KINDS), choices=KINDS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[4, 8, 16, 32])
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per case (best is kept)")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds per engine per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.repeat)
+        return
+
+    rng = random.Random(args.seed)
+    cases = [(kind, n, generate(kind, n, rng)) for n in args.sizes for kind in args.kinds]
+    expected = [[[str(x) for x in row] for row in reference_rref(rows)] for _, _, rows in cases]
+
+    totals = {name: [0, 0.0, 0] for name in args.engines}    # correct, seconds, peak
+    print(f"{'engine':<22} {'kind':<18} {'n':>4}  {'result':<28} {'ms':>10} {'peak KiB':>10}")
+    for name in args.engines:
+        for (kind, n, rows), want in zip(cases, expected):
+            res = run_case(name, rows, args.repeat, args.timeout)
+            if "error" in res:
+                status, ms, kib = res["error"], "", ""
+            else:
+                status = "ok" if res["rref"] == want else "WRONG"
+                ms, kib = f"{res['seconds'] * 1000:.2f}", f"{res['peak'] / 1024:.0f}"
+                if status == "ok":
+                    totals[name][0] += 1
+                    totals[name][1] += res["seconds"]
+                    totals[name][2] = max(totals[name][2], res["peak"])
+            print(f"{name:<22} {kind:<18} {n:>4}  {status[:28]:<28} {ms:>10} {kib:>10}", flush=True)
+
+    print()
+    correct = sorted((t[1], name) for name, t in totals.items() if t[0] == len(cases))
+    if not correct:
+        print("no engine was correct on every case")
+        return
+    print(f"correct on all {len(cases)} cases (fastest first):")
+    for seconds, name in correct:
+        print(f"  {name:<22} {seconds * 1000:10.2f} ms total   peak {totals[name][2] / 1024:.0f} KiB")
+    partial = [name for name, t in totals.items() if t[0] < len(cases)]
+    if partial:
+        print("failed somewhere: " + ", ".join(f"{name} ({totals[name][0]}/{len(cases)})" for name in partial))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,19 @@
 from fractions import Fraction
+from functools import lru_cache
+import importlib.util
+import os
+import re
+import sys
+
+# sibling module, loaded by path so the importer's cwd and sys.path don't
+# matter (and aren't touched); LA.py and matrix.py share the one copy
+engine = sys.modules.get("lin_alg_engine")
+if engine is None:
+    _spec = importlib.util.spec_from_file_location(
+        "lin_alg_engine", os.path.join(os.path.dirname(os.path.abspath(__file__)), "lin_alg_engine.py"))
+    engine = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(engine)
+    sys.modules["lin_alg_engine"] = engine
 
 class Vector:
     def __init__(self, nums=[]):
@@ -42,11 +57,13 @@ class Matrix:
         self._rows[ind] = new
     def __iter__(self):
         return iter(self._rows)
+    def _lists(self):
+        return [row._nums for row in self._rows]
     def __mul__(self, obj2):
-        if isinstance(obj2, Vector): #TODO
-            pass
-        if isinstance(obj2, Matrix): #TODO
-            pass
+        if isinstance(obj2, Vector):
+            return Vector(engine.matvec(self._lists(), obj2._nums))
+        if isinstance(obj2, Matrix):
+            return Matrix(engine.matmul(self._lists(), obj2._lists()))
         else:
             try:
                 return Matrix(
@@ -54,7 +71,12 @@ class Matrix:
                         )
             except:
                 raise TypeError()
-    __rmul__ = __mul__
+    def __rmul__(self, scalar):
+        return self * scalar
+    def __matmul__(self, obj2):
+        if not isinstance(obj2, (Matrix, Vector)):
+            raise TypeError("@ needs a Matrix or Vector")
+        return self * obj2
     def __truediv__(self, scalar):
         return Matrix(
                 [Vector([x / scalar for x in row]) for row in self._rows]
@@ -68,56 +90,11 @@ class Matrix:
 
     
     def det(self):
-        def __det__(system) -> int:
-            def sys_without(SYS, i):
-                return [[row[j] for j in range(len(row)) if j != i] for row in SYS[1:]]
-            if len(system) == 2:
-                return (system[0][0] * system[-1][-1]) - (system[-1][0] * system[0][-1])
-            else:
-                return sum(((-1) ** x) * system[0][x] * __det__(sys_without(system, x)) for x in range(len(system[0])))
-        return __det__(self._rows)
-
-
+        return engine.determinant(self._lists())
 
     def ref(self):
-        def make_swap(rows, start):
-            def first_nonzero(vec):
-                for i in range(len(vec)):
-                    if vec[i] != 0:
-                        return i
-                return float("inf")
-            F = first_nonzero(rows[start])
-            L = None
-            G = 0
-
-            for i in range(start + 1, len(rows)):
-                L = first_nonzero(rows[i])
-                if L < F:
-                    G = 1
-                    break
-            if G:
-                rows[i], rows[start] = rows[start], rows[i]
-
-            return
-
-        curr_row = 0
-        curr_column = 0
-        total_row = len(self)
-        total_column = len(self[0])
-
-        while curr_row < total_row and curr_column < total_column:
-            make_swap(self, curr_row)
-
-            if self[curr_row][curr_column] == 0:
-                curr_column += 1
-                continue
-
-            self[curr_row] /= self[curr_row][curr_column]
-            for i in range(curr_row + 1, total_row):
-                self[i] -= (self[i][curr_column] * self[curr_row])
-    
-            curr_row += 1
-            curr_column += 1
+        # fraction-free elimination on ints, rows end up with leading 1s
+        self._rows = [Vector(row) for row in engine.echelon(self._lists())]
     
     def find_pivots(self) -> set[tuple]:
         # Only works if REF already
@@ -133,67 +110,195 @@ class Matrix:
         return pivots
 
     def rref(self):
-        pivots = self.find_pivots()
+        # Only works if REF already
+        engine.back_substitute(self._lists())
 
-        for pivot in pivots:
-            r, c = pivot[0], pivot[1]
-            for i in range(r - 1, -1, -1):
-                self[i] -= (self[r] * self[i][c])
+# one token per match: a number (int, decimal, a/b), a name, or an operator.
+# No exponents: "2e1" is the coefficient 2 on the variable e1.
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<num>(?:\d+\.?\d*|\.\d+)(?:/(?:\d+\.?\d*|\.\d+))?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op>[-+*=])
+      | (?P<bad>\S)
+    )""", re.VERBOSE)
+ONE = Fraction(1)
+MINUS_ONE = Fraction(-1)
+ZERO = Fraction(0)
 
-        return
 
-class System:
-    def parse_eqs(self, lines):
-        n = len(lines)
-        eqs = lines
+def tokenize(eq):
+    """split an equation into (kind, text, column) tokens"""
+    tokens = []
+    for m in _TOKEN.finditer(eq):
+        kind = m.lastgroup
+        if kind is None:
+            break  # only trailing whitespace left
+        if kind == "bad":
+            raise ValueError(f"unexpected {m.group(kind)!r} at column {m.start(kind) + 1}: {eq.strip()}")
+        tokens.append((kind, m.group(kind), m.start(kind) + 1))
+    return tokens
+
+
+@lru_cache(maxsize=4096)
+def _number(text, negative=False):
+    # generated systems repeat the same few coefficients, hence the cache
+    if "/" in text:
+        num, den = text.split("/")
+        value = Fraction(num) / Fraction(den)
+    else:
+        value = Fraction(text)
+    return -value if negative else value
+
 
-        vars_order = []
-        parsed = []
+def parse_equation(eq, index, order):
+    """
+    parse one linear equation like "2x1 - 3/4*rate + 1 = y - 0.5" into
+    ({column: coefficient}, rhs) with every variable moved to the left and
+    every constant to the right. new names get the next column in index
+    (name -> column) and are appended to order.
+    """
+    coeffs = {}
+    rhs = ZERO
+    side = 1  # -1 once we're past "="
+    seen_eq = False
+    expect_term = True
+    sign = 1
+    tokens = tokenize(eq)
+    i, n = 0, len(tokens)
 
-        for eq in eqs:
-            lhs, rhs = eq.replace(" ", "").split("=")
-            rhs = int(rhs)
+    def fail(msg, tok):
+        raise ValueError(f"{msg} at column {tok[2]}: {eq.strip()}")
 
-            terms = lhs.replace("-", "+-").split("+")
-            coeffs = {}
+    while i < n:
+        tok = tokens[i]
+        kind, text = tok[0], tok[1]
+        if kind == "op" and text in "+-":
+            if not expect_term:
+                expect_term, sign = True, 1
+            if text == "-":
+                sign = -sign
+            i += 1
+            continue
+        if kind == "op" and text == "=":
+            if seen_eq or expect_term:
+                fail("unexpected '='", tok)
+            seen_eq, side, expect_term, sign = True, -1, True, 1
+            i += 1
+            continue
+        if not expect_term:
+            fail(f"missing operator before {text!r}", tok)
+        if kind == "op":
+            fail(f"unexpected {text!r}", tok)
 
-            for term in terms:
-                if not term:
-                    continue
-                if term[-1].isalpha():
-                    var = term[-1]
-                    coef = term[:-1]
+        negative = sign * side < 0
+        value, name = MINUS_ONE if negative else ONE, None
+        if kind == "num":
+            try:
+                value = _number(text, negative)
+            except ZeroDivisionError:
+                fail(f"division by zero in {text!r}", tok)
+            i += 1
+            if i < n and tokens[i][1] == "*":
+                i += 1
+                if i >= n or tokens[i][0] != "name":
+                    fail("expected a variable after '*'", tokens[i - 1])
+            if i < n and tokens[i][0] == "name":
+                name = tokens[i][1]
+                i += 1
+        else:
+            name = text
+            i += 1
 
-                    if coef in ("", "+"):
-                        coef = 1
-                    elif coef == "-":
-                        coef = -1
-                    else:
-                        coef = int(coef)
+        if name is None:
+            rhs -= value
+        else:
+            col = index.get(name)
+            if col is None:
+                col = index[name] = len(order)
+                order.append(name)
+            if col in coeffs:
+                coeffs[col] += value
+            else:
+                coeffs[col] = value
+        expect_term, sign = False, 1
 
-                    coeffs[var] = coef
-                    if var not in vars_order:
-                        vars_order.append(var)
+    if not tokens:
+        raise ValueError("empty equation")
+    if expect_term:
+        fail("equation ends with an operator", tokens[-1])
+    if not seen_eq:
+        raise ValueError(f"no '=' in equation: {eq.strip()}")
+    return {c: v for c, v in coeffs.items() if v}, rhs
 
-            parsed.append((coeffs, rhs))
 
-        # Build augmented matrix
+class System:
+    @staticmethod
+    def parse_sparse(lines):
+        """
+        parse equations (any iterable of strings, e.g. an open file) into
+        sparse rows [({column: coefficient}, rhs), ...] and the variable
+        order. blank lines and lines starting with '#' are skipped.
+        """
+        index, order, rows = {}, [], []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            rows.append(parse_equation(line, index, order))
+        return rows, order
+
+    @staticmethod
+    def _dense(rows, n):
         M = []
-        for coeffs, rhs in parsed:
-            row = [coeffs.get(v, 0) for v in vars_order]
+        for coeffs, rhs in rows:
+            row = [0] * n
+            for c, v in coeffs.items():
+                row[c] = v
             row.append(rhs)
             M.append(row)
+        return M
 
-        return M, vars_order
+    def parse_eqs(self, lines):
+        rows, vars_order = self.parse_sparse(lines)
+        self.sparse_rows = rows
+        return self._dense(rows, len(vars_order)), vars_order
 
-    def __init__(self, data=[[]]):
-        if isinstance(data[0], (list, Vector)):
+    @classmethod
+    def from_file(cls, path):
+        """stream equations from a text file, one per line"""
+        with open(path) as f:
+            rows, vars_order = cls.parse_sparse(f)
+        return cls(rows, vars_order)
+
+    def __init__(self, data=[[]], ordered_vars=None):
+        """
+        data is an augmented matrix (rows of numbers), a list of equation
+        strings, or, with ordered_vars, sparse rows from parse_sparse.
+        equations stay sparse; the dense Coeff_Matrix is only built when
+        something asks for it.
+        """
+        self._coeff_matrix = None
+        if ordered_vars is not None:
+            self.sparse_rows, self.ordered_vars = data, list(ordered_vars)
+        elif isinstance(data[0], (list, Vector)):
+            self.sparse_rows = None
             self.Coeff_Matrix = Matrix(data)
             self.ordered_vars = [f"x{i}" for i in range(len(self.Coeff_Matrix[0]) - 1)]
         else:
-            self.Coeff_Matrix, self.ordered_vars = self.parse_eqs(data)
-            self.Coeff_Matrix = Matrix(self.Coeff_Matrix)
+            self.sparse_rows, self.ordered_vars = self.parse_sparse(data)
+
+    @property
+    def Coeff_Matrix(self):
+        if self._coeff_matrix is None:
+            self._coeff_matrix = Matrix(self._dense(self.sparse_rows, len(self.ordered_vars)))
+        return self._coeff_matrix
+
+    @Coeff_Matrix.setter
+    def Coeff_Matrix(self, matrix):
+        self._coeff_matrix = matrix
     def take1(self):
+        self.sparse_rows = None
         self.Coeff_Matrix = Matrix([input().split() for i in range(int(input()))])
         self.ordered_vars = [f"x{i}" for i in range(len(self.Coeff_Matrix[0]) - 1)]
     def take2(self):
@@ -0,0 +1,157 @@
+"""
+shared exact kernels for matrix.py and LA.py
+
+rows are plain lists of fractions.Fraction. the heavy loops run on python
+ints: every row (or column) is scaled by the lcm of its denominators, the
+work is done fraction-free, and Fractions are only built for the results.
+"""
+from fractions import Fraction
+from math import gcd
+
+ZERO = Fraction(0)
+
+
+def _lcm_denominator(values):
+    d = 1
+    for x in values:
+        q = x.denominator
+        if q != 1:
+            d = d * q // gcd(d, q)
+    return d
+
+
+def integer_rows(rows):
+    """scale each row to ints -> (int rows, per-row scale factors)"""
+    out, scales = [], []
+    for row in rows:
+        d = _lcm_denominator(row)
+        out.append([x.numerator * (d // x.denominator) for x in row])
+        scales.append(d)
+    return out, scales
+
+
+def matmul(A, B):
+    """A @ B for row lists (A is m x k, B is k x n)"""
+    if not A:
+        return []
+    if len(A[0]) != len(B):
+        raise ValueError("inner dimensions don't match")
+    A_int, row_scales = integer_rows(A)
+    B_cols, col_scales = integer_rows([list(col) for col in zip(*B)])
+    B_int = [list(row) for row in zip(*B_cols)]
+    n = len(B_cols)
+    out = []
+    for a_row, da in zip(A_int, row_scales):
+        acc = [0] * n
+        for a, b_row in zip(a_row, B_int):
+            if a:
+                for j, b in enumerate(b_row):
+                    if b:
+                        acc[j] += a * b
+        out.append([Fraction(v, da * db) if v else ZERO for v, db in zip(acc, col_scales)])
+    return out
+
+
+def matvec(A, v):
+    """A @ v for a row list A and a sequence v"""
+    if not A:
+        return []
+    if len(A[0]) != len(v):
+        raise ValueError("dimensions don't match")
+    (v_int,), (dv,) = integer_rows([list(v)])
+    A_int, row_scales = integer_rows(A)
+    return [Fraction(sum(a * x for a, x in zip(row, v_int) if a and x), da * dv)
+            for row, da in zip(A_int, row_scales)]
+
+
+def _bareiss(M):
+    """
+    fraction-free elimination of the int rows M in place, pivot = first
+    nonzero entry of the column. returns (pivots, last pivot, swap count)
+    """
+    m = len(M)
+    n = len(M[0]) if M else 0
+    pivots = []
+    prev = 1
+    swaps = 0
+    r = 0
+    for c in range(n):
+        if r >= m:
+            break
+        p = next((i for i in range(r, m) if M[i][c]), None)
+        if p is None:
+            continue
+        if p != r:
+            M[r], M[p] = M[p], M[r]
+            swaps += 1
+        pivot_row = M[r]
+        pivot = pivot_row[c]
+        for i in range(r + 1, m):
+            row = M[i]
+            lead = row[c]
+            if lead:
+                for j in range(c + 1, n):
+                    pj = pivot_row[j]
+                    if pj:
+                        row[j] = (row[j] * pivot - lead * pj) // prev
+                    elif row[j]:
+                        row[j] = row[j] * pivot // prev
+                row[c] = 0
+            elif pivot != prev:
+                # no elimination needed, but the row still takes the scale
+                for j in range(c + 1, n):
+                    if row[j]:
+                        row[j] = row[j] * pivot // prev
+        prev = pivot
+        pivots.append((r, c))
+        r += 1
+    return pivots, prev, swaps
+
+
+def echelon(rows):
+    """row echelon form with leading 1s (new row lists)"""
+    M, _ = integer_rows(rows)
+    pivots, _, _ = _bareiss(M)
+    n = len(M[0]) if M else 0
+    out = []
+    for r, c in pivots:
+        p = M[r][c]
+        out.append([Fraction(x, p) if x else ZERO for x in M[r]])
+    out.extend([ZERO] * n for _ in range(len(M) - len(pivots)))
+    return out
+
+
+def back_substitute(rows):
+    """clear entries above the pivots of an echelon form, in place"""
+    pivots = []
+    for i, row in enumerate(rows):
+        c = next((j for j, x in enumerate(row) if x), None)
+        if c is not None:
+            pivots.append((i, c))
+    for r, c in reversed(pivots):
+        pivot_row = rows[r]
+        if pivot_row[c] != 1:
+            p = pivot_row[c]
+            pivot_row[:] = [x / p if x else x for x in pivot_row]
+        support = [j for j in range(c, len(pivot_row)) if pivot_row[j]]
+        for i in range(r):
+            row = rows[i]
+            f = row[c]
+            if f:
+                for j in support:
+                    row[j] -= f * pivot_row[j]
+
+
+def determinant(rows):
+    """exact determinant by fraction-free elimination"""
+    n = len(rows)
+    if any(len(row) != n for row in rows):
+        raise ValueError("determinant needs a square matrix")
+    M, scales = integer_rows(rows)
+    pivots, last, swaps = _bareiss(M)
+    if len(pivots) < n:
+        return ZERO
+    d = 1
+    for s in scales:
+        d *= s
+    return Fraction(-last if swaps % 2 else last, d)
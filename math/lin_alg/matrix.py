@@ -1,4 +1,17 @@
 from fractions import Fraction
+import importlib.util
+import os
+import sys
+
+# sibling module, loaded by path so the importer's cwd and sys.path don't
+# matter (and aren't touched); LA.py and matrix.py share the one copy
+engine = sys.modules.get("lin_alg_engine")
+if engine is None:
+    _spec = importlib.util.spec_from_file_location(
+        "lin_alg_engine", os.path.join(os.path.dirname(os.path.abspath(__file__)), "lin_alg_engine.py"))
+    engine = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(engine)
+    sys.modules["lin_alg_engine"] = engine
 
 class Vector:
     def __init__(self, nums=[]):
@@ -23,7 +36,7 @@ class Vector:
     def __add__(self, vec2):
         return Vector([x + y for x, y in zip(self, vec2)])
     def __sub__(self, vec2):
-        return self + (vect2 * -1)
+        return self + (vec2 * -1)
     def __abs__(self):
         return (sum(x ** 2 for x in self)) ** Fraction(1, 2)
 
@@ -42,11 +55,13 @@ class Matrix:
         self._rows[ind] = new
     def __iter__(self):
         return iter(self._rows)
+    def _lists(self):
+        return [row._nums for row in self._rows]
     def __mul__(self, obj2):
-        if isinstance(obj2, Vector): #TODO
-            pass
-        if isinstance(obj2, Matrix): #TODO
-            pass
+        if isinstance(obj2, Vector):
+            return Vector(engine.matvec(self._lists(), obj2._nums))
+        if isinstance(obj2, Matrix):
+            return Matrix(engine.matmul(self._lists(), obj2._lists()))
         else:
             try:
                 return Matrix(
@@ -54,7 +69,12 @@ class Matrix:
                         )
             except:
                 raise TypeError()
-    __rmul__ = __mul__
+    def __rmul__(self, scalar):
+        return self * scalar
+    def __matmul__(self, obj2):
+        if not isinstance(obj2, (Matrix, Vector)):
+            raise TypeError("@ needs a Matrix or Vector")
+        return self * obj2
     def __truediv__(self, scalar):
         return Matrix(
                 [Vector([x / scalar for x in row]) for row in self._rows]
@@ -68,76 +88,12 @@ class Matrix:
 
     
     def det(self):
-        def __det__(system) -> int:
-            def sys_without(SYS, i):
-                return [[row[j] for j in range(len(row)) if j != i] for row in SYS[1:]]
-            if len(system) == 2:
-                return (system[0][0] * system[-1][-1]) - (system[-1][0] * system[0][-1])
-            else:
-                return sum(((-1) ** x) * system[0][x] * __det__(sys_without(system, x)) for x in range(len(system[0])))
-        return __det__(self._rows)
-
-
+        return engine.determinant(self._lists())
 
     def ref(self):
-        def make_swap(rows, start):
-            def first_nonzero(vec):
-                for i in range(len(vec)):
-                    if vec[i] != 0:
-                        return i
-            F = first_nonzero(rows[start])
-            L = None
-            G = 0
-
-            for i in range(start + 1, len(rows)):
-                L = first_nonzero(rows[i])
-                if L < F:
-                    G = 1
-                    break
-            if G:
-                rows[i], rows[start] = rows[start], rows[i]
-
-            return
-
-        curr_row = 0
-        curr_column = 0
-        total_row = len(self)
-        total_column = len(self[0])
-
-        while curr_row < total_row and curr_column < total_column:
-            make_swap(self, curr_row)
-
-            if self[curr_row][curr_column] == 0:
-                curr_column += 1
-                continue
-
-            self[curr_row] /= self[curr_row][curr_column]
-            for i in range(curr_row + 1, total_row):
-                self[i] -= (self[i][curr_column] * self[curr_row])
-    
-            curr_row += 1
-            curr_column += 1
+        # fraction-free elimination on ints, rows end up with leading 1s
+        self._rows = [Vector(row) for row in engine.echelon(self._lists())]
     
     def rref(self):
-        def find_pivots() -> set[tuple]:
         # Only works if REF already
-
-            pivots = set()
-
-            for row_num, row in enumerate(self):
-                for i, x in enumerate(row):
-                    if x:
-                        pivots.add((row_num, i))
-                        break
-
-            return pivots
-
-        pivots = find_pivots()
-
-        for pivot in pivots:
-            r, c = pivot[0], pivot[1]
-            for i in range(r - 1, -1, -1):
-                self[i] -= (self[r] * self[i][c])
-
-        return
-
+        engine.back_substitute(self._lists())
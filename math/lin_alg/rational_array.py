@@ -0,0 +1,322 @@
+"""
+exact rational arrays for numpy
+
+a RationalArray keeps two integer arrays of the same shape, num and den,
+always reduced with den > 0. arithmetic is done on the whole arrays with
+ufuncs (np.gcd for the reduction), so a row update like
+
+    A[i] -= A[i][c] * A[r]
+
+is a handful of vectorized int64 ops instead of one Fraction op per entry.
+before each multiply/add the magnitudes are checked (in float64, with a
+bit of headroom); if a result could overflow int64 the operands are moved
+to dtype=object (python ints) for that op. object results drop back to
+int64 once they fit again.
+
+1-d and 2-d arrays are supported. scalar indexing gives a Fraction, so the
+Gauss scripts (and math/lin_alg Matrix/Vector) can take and give back the
+values unchanged:
+
+    A = RationalArray([[1, 2, 3], [4, 5, 6]])
+    Matrix(A)               # -> math/lin_alg Matrix
+    RationalArray(matrix)   # and back
+"""
+from fractions import Fraction
+from numbers import Rational
+
+import numpy as np
+
+# int64 tops out at 2**63 - 1; the float64 estimate is off by at most a
+# relative 2**-52, so anything under 2**62 is safe
+_LIMIT = float(2 ** 62)
+
+
+def _fits(values):
+    if values.dtype != object:
+        return True
+    if values.size == 0:
+        return True
+    return max(abs(int(x)) for x in values.flat) < 2 ** 62
+
+
+def _pack(values):
+    """list/array of python ints -> int64 array if it fits, else object"""
+    values = np.array(values, dtype=object)
+    if _fits(values):
+        return values.astype(np.int64)
+    return values
+
+
+def _compact(values):
+    if values.dtype == object and _fits(values):
+        return values.astype(np.int64)
+    return values
+
+
+def _checked(op, x, y):
+    """op(x, y) for np.multiply/np.add/np.subtract without int64 overflow"""
+    if x.dtype != object and y.dtype != object:
+        xf = np.abs(x.astype(np.float64))
+        yf = np.abs(y.astype(np.float64))
+        bound = xf * yf if op is np.multiply else xf + yf
+        if not (bound >= _LIMIT).any():
+            return op(x, y)
+    return op(x.astype(object), y.astype(object))
+
+
+def _reduce(num, den):
+    g = np.gcd(num, den)
+    return _compact(num // g), _compact(den // g)
+
+
+def _mul(an, ad, bn, bd):
+    # cross-cancel first so the products stay small and already reduced
+    g1 = np.gcd(an, bd)
+    g2 = np.gcd(bn, ad)
+    num = _checked(np.multiply, an // g1, bn // g2)
+    den = _checked(np.multiply, ad // g2, bd // g1)
+    return _compact(num), _compact(den)
+
+
+def _add(an, ad, bn, bd, op=np.add):
+    g = np.gcd(ad, bd)
+    bd_g = bd // g
+    num = _checked(op, _checked(np.multiply, an, bd_g),
+                   _checked(np.multiply, bn, ad // g))
+    den = _checked(np.multiply, ad, bd_g)
+    return _reduce(num, den)
+
+
+def _reciprocal(num, den):
+    if not np.all(num):
+        raise ZeroDivisionError("division by a zero entry")
+    sign = np.where(num < 0, -1, 1)
+    return den * sign, num * sign
+
+
+def _scalar(value):
+    """int/Fraction/str/float -> 0-d (num, den) arrays"""
+    value = Fraction(value)
+    return _pack(value.numerator), _pack(value.denominator)
+
+
+def _to_fractions(data):
+    """nested sequence -> (flat list of Fractions, shape)"""
+    if isinstance(data, (str, bytes)) or not hasattr(data, "__iter__"):
+        raise TypeError("RationalArray needs a 1-d or 2-d sequence")
+    rows = list(data)
+    if rows and all(hasattr(r, "__iter__") and not isinstance(r, (str, bytes)) for r in rows):
+        rows = [list(map(Fraction, r)) for r in rows]
+        width = len(rows[0])
+        if any(len(r) != width for r in rows):
+            raise ValueError("rows have different lengths")
+        return [x for r in rows for x in r], (len(rows), width)
+    return list(map(Fraction, rows)), (len(rows),)
+
+
+class RationalArray:
+    # make ndarray operands defer to our reflected methods
+    __array_priority__ = 1000
+
+    def __init__(self, data, den=None):
+        if isinstance(data, RationalArray):
+            self.num, self.den = data.num.copy(), data.den.copy()
+            return
+        if den is not None:
+            num = np.asarray(data)
+            den = np.broadcast_to(np.asarray(den), num.shape)
+            if not np.all(den):
+                raise ZeroDivisionError("zero denominator")
+            sign = np.where(den < 0, -1, 1)
+            self.num, self.den = _reduce(_pack((num * sign).tolist()),
+                                         _pack((den * sign).tolist()))
+            return
+        flat, shape = _to_fractions(data)
+        self.num = _pack([x.numerator for x in flat]).reshape(shape)
+        self.den = _pack([x.denominator for x in flat]).reshape(shape)
+
+    @classmethod
+    def _wrap(cls, num, den):
+        out = cls.__new__(cls)
+        out.num, out.den = num, den
+        return out
+
+    @classmethod
+    def zeros(cls, shape):
+        return cls._wrap(np.zeros(shape, dtype=np.int64), np.ones(shape, dtype=np.int64))
+
+    @classmethod
+    def identity(cls, n):
+        return cls._wrap(np.eye(n, dtype=np.int64), np.ones((n, n), dtype=np.int64))
+
+    # --- shape / access ---
+
+    @property
+    def shape(self):
+        return self.num.shape
+
+    @property
+    def ndim(self):
+        return self.num.ndim
+
+    @property
+    def size(self):
+        return self.num.size
+
+    @property
+    def is_big(self):
+        """True when the entries had to move to python ints"""
+        return self.num.dtype == object or self.den.dtype == object
+
+    def __len__(self):
+        return len(self.num)
+
+    def __getitem__(self, key):
+        num, den = self.num[key], self.den[key]
+        if np.ndim(num) == 0:
+            return Fraction(int(num), int(den))
+        return RationalArray._wrap(num, den)
+
+    def __setitem__(self, key, value):
+        num, den = self._operand(value)
+        if num.dtype == object and self.num.dtype != object:
+            self.num = self.num.astype(object)
+        if den.dtype == object and self.den.dtype != object:
+            self.den = self.den.astype(object)
+        self.num[key] = num
+        self.den[key] = den
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def copy(self):
+        return RationalArray._wrap(self.num.copy(), self.den.copy())
+
+    def nonzero(self):
+        # lets np.nonzero(row) work without building Fractions
+        return np.nonzero(self.num)
+
+    def tolist(self):
+        if self.ndim == 1:
+            return [Fraction(int(n), int(d)) for n, d in zip(self.num, self.den)]
+        return [row.tolist() for row in self]
+
+    def __array__(self, dtype=None, copy=None):
+        out = np.empty(self.shape, dtype=object)
+        for idx in np.ndindex(self.shape):
+            out[idx] = Fraction(int(self.num[idx]), int(self.den[idx]))
+        return out
+
+    def astype(self, dtype):
+        """float arrays for plotting/printing; anything else gets Fractions"""
+        if np.dtype(dtype).kind == "f":
+            return (self.num.astype(np.float64) / self.den.astype(np.float64)).astype(dtype)
+        return self.__array__()
+
+    def __repr__(self):
+        if self.ndim == 1:
+            return "RationalArray[" + " ".join(str(x) for x in self.tolist()) + "]"
+        return "RationalArray[\n" + "\n".join(
+                " ".join(str(x) for x in row) for row in self.tolist()) + "]"
+
+    # --- arithmetic ---
+
+    def _operand(self, other):
+        if isinstance(other, RationalArray):
+            return other.num, other.den
+        if isinstance(other, (Rational, str)) or np.ndim(other) == 0:
+            return _scalar(other)
+        other = RationalArray(other)
+        return other.num, other.den
+
+    def __add__(self, other):
+        try:
+            bn, bd = self._operand(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+        return RationalArray._wrap(*_add(self.num, self.den, bn, bd))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        try:
+            bn, bd = self._operand(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+        return RationalArray._wrap(*_add(self.num, self.den, bn, bd, np.subtract))
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        try:
+            bn, bd = self._operand(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+        return RationalArray._wrap(*_mul(self.num, self.den, bn, bd))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        try:
+            bn, bd = self._operand(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+        bn, bd = _reciprocal(bn, bd)
+        return RationalArray._wrap(*_mul(self.num, self.den, bn, bd))
+
+    def __rtruediv__(self, other):
+        num, den = _reciprocal(self.num, self.den)
+        return RationalArray._wrap(num, den) * other
+
+    def __neg__(self):
+        return RationalArray._wrap(-self.num, self.den.copy())
+
+    def __eq__(self, other):
+        try:
+            bn, bd = self._operand(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+        # both sides are reduced, so equal values have equal (num, den)
+        return (self.num == bn) & (self.den == bd)
+
+    __hash__ = None
+
+    def __bool__(self):
+        raise ValueError("truth value of a RationalArray is ambiguous")
+
+    # --- elimination ---
+
+    def _eliminate(self, reduced):
+        A = self.copy()
+        m, n = A.shape
+        r = 0
+        for c in range(n):
+            if r >= m:
+                break
+            nz = np.nonzero(A.num[r:, c])[0]
+            if not nz.size:
+                continue
+            p = r + nz[0]
+            if p != r:
+                A.num[[r, p]] = A.num[[p, r]]
+                A.den[[r, p]] = A.den[[p, r]]
+            A[r] = A[r] / A[r][c]
+            # every row below (and above, for rref) in one rank-1 update
+            rows = np.arange(r + 1, m) if not reduced else np.delete(np.arange(m), r)
+            rows = rows[np.nonzero(A.num[rows, c])[0]]
+            if rows.size:
+                factors = A._wrap(A.num[rows, c][:, None], A.den[rows, c][:, None])
+                pivot_row = A._wrap(A.num[r][None, :], A.den[r][None, :])
+                A[rows] = A[rows] - factors * pivot_row
+            r += 1
+        return A
+
+    def ref(self):
+        """row echelon form with leading 1s (new array)"""
+        return self._eliminate(False)
+
+    def rref(self):
+        """reduced row echelon form (new array)"""
+        return self._eliminate(True)
@@ -17,16 +17,29 @@ Requirements:
 pip install yfinance pandas numpy pytz
 """
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta, time as dt_time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, time as dt_time
+from functools import lru_cache
+from multiprocessing import get_context, shared_memory
+import csv
+import itertools
+import random
+import threading
 import time
 import logging
 import json
 import os
 import pytz
 
+try:
+    import yfinance as yf
+except ImportError:  # only YahooDataSource needs it
+    yf = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,6 +47,1025 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+OHLCV_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls at least 1 / rate seconds apart.
+    """
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the caller may make its request."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _as_dates(frame):
+    """Tz-naive midnight index, so sources with different index styles align."""
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame = frame.copy()
+    frame.index = index.normalize()
+    return frame[~frame.index.duplicated(keep='last')]
+
+
+def _close_bars(closes):
+    """dates x symbols closes -> {symbol: OHLCV DataFrame with only Close filled}"""
+    return {s: closes[s].dropna().to_frame('Close').reindex(columns=OHLCV_FIELDS)
+            for s in closes.columns if closes[s].notna().any()}
+
+
+class DataSource:
+    """
+    Pluggable market data backend.
+    
+    Subclasses implement history() for one symbol and, when the backend can
+    serve many symbols in one request, download(). closes() does one bulk
+    download and fetches whatever it missed concurrently (at most
+    max_workers requests in flight, paced by the source's rate limiter).
+    download_bars() is the bulk request alone, for callers that treat a
+    symbol missing from it as having no data.
+    """
+    
+    max_workers = 4
+    
+    def history(self, symbol, start, end):
+        """Daily closes for one symbol in [start, end) as a Series."""
+        raise NotImplementedError
+    
+    def download(self, symbols, start, end):
+        """Daily closes for many symbols (dates x symbols), or None if unsupported."""
+        return None
+    
+    def closes(self, symbols, start, end):
+        """
+        Aligned close-price DataFrame (dates x symbols) for all symbols that
+        returned data; missing days are NaN.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        frames = []
+        
+        try:
+            bulk = self.download(symbols, start, end)
+        except Exception as e:
+            logger.warning(f"Bulk download failed, fetching symbols one by one: {e}")
+            bulk = None
+        if bulk is not None and not bulk.empty:
+            bulk = bulk[[s for s in symbols if s in bulk.columns]].dropna(axis=1, how='all')
+            frames.append(_as_dates(bulk))
+        
+        fetched = set(frames[0].columns) if frames else set()
+        missing = [s for s in symbols if s not in fetched]
+        if missing:
+            frames.append(self._history_each(missing, start, end))
+        
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        closes = pd.concat(frames, axis=1, sort=False).sort_index()
+        return closes[[s for s in symbols if s in closes.columns]]
+    
+    def _history_each(self, symbols, start, end):
+        """history() of every symbol, concurrently, as one closes DataFrame."""
+        frames = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.history, s, start, end): s for s in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    series = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching history for {symbol}: {e}")
+                    continue
+                if series is not None and not series.empty:
+                    frames.append(_as_dates(series.rename(symbol).to_frame()))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1, sort=False)
+    
+    def download_bars(self, symbols, start, end):
+        """
+        {symbol: OHLCV DataFrame} for [start, end) from one bulk request, or
+        None if the source has no bulk endpoint. Symbols without bars in the
+        range are left out.
+        """
+        closes = self.download(symbols, start, end)
+        if closes is None:
+            return None
+        return _close_bars(_as_dates(closes))
+    
+    def bars(self, symbols, start, end):
+        """
+        {symbol: OHLCV DataFrame} for [start, end). Sources that only know
+        closes leave Open/High/Low/Volume as NaN.
+        """
+        return _close_bars(self.closes(symbols, start, end))
+    
+    def quotes(self, symbols):
+        """Latest price per symbol ({symbol: price}) from one batched closes() call."""
+        end = datetime.now() + timedelta(days=1)  # include today's (live) bar
+        closes = self.closes(symbols, end - timedelta(days=10), end)
+        return {s: float(closes[s].dropna().iloc[-1])
+                for s in closes.columns if closes[s].notna().any()}
+
+
+class PriceStore(DataSource):
+    """
+    Local OHLCV store in front of another DataSource.
+    
+    Each symbol is two .npy files in directory: SYMBOL.dates.npy (sorted
+    datetime64[D]) and SYMBOL.ohlcv.npy (float64 rows of open, high, low,
+    close, volume). Reads memory-map them and slice by binary search on the
+    dates. Before answering, closes()/history() fetch only the bars after
+    the last stored date, batched for all symbols that share it, and only
+    once a session has opened since the last check (nothing is requested
+    pre-open, on weekends or holidays). Only finished sessions are
+    written; the bar of a session still in progress is served from memory
+    and fetched again next time.
+    """
+    
+    def __init__(self, upstream, directory='price_store', calendar=None):
+        self.upstream = upstream
+        self.directory = directory
+        self.calendar = calendar or TradingCalendar()
+        self.max_workers = upstream.max_workers
+        self._live = {}  # {symbol: bars of the session in progress, from the last sync}
+        self._checked = {}  # {symbol: (first, last) day upstream has been asked about}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+    
+    def _paths(self, symbol):
+        base = os.path.join(self.directory, symbol)
+        return base + '.dates.npy', base + '.ohlcv.npy'
+    
+    def _load(self, symbol):
+        """(dates, values) memory-mapped; empty arrays if nothing is stored."""
+        dates_path, values_path = self._paths(symbol)
+        if not (os.path.exists(dates_path) and os.path.exists(values_path)):
+            return np.empty(0, dtype='datetime64[D]'), np.empty((0, len(OHLCV_FIELDS)))
+        dates = np.load(dates_path, mmap_mode='r')
+        values = np.load(values_path, mmap_mode='r')
+        n = min(len(dates), len(values))  # a write may have been cut off between the files
+        return dates[:n], values[:n]
+    
+    def _write(self, symbol, frame):
+        dates_path, values_path = self._paths(symbol)
+        for path, array in ((values_path, frame.to_numpy(dtype=np.float64)),
+                            (dates_path, frame.index.to_numpy().astype('datetime64[D]'))):
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp, path)
+    
+    def _stored_frame(self, symbol):
+        dates, values = self._load(symbol)
+        return pd.DataFrame(np.asarray(values), index=pd.DatetimeIndex(np.asarray(dates)),
+                            columns=OHLCV_FIELDS)
+    
+    def sync(self, symbols, start, now=None):
+        """
+        Fetch and store the bars each symbol is missing since start. now
+        (default the current time) only matters for replaying a sync.
+        """
+        now = now or datetime.now(self.calendar.tz)
+        # Bars up to finished are final; nothing after started can exist yet
+        finished = np.datetime64(self.calendar.last_close(now).date(), 'D')
+        started = np.datetime64(self.calendar.last_open(now).date(), 'D')
+        start_day = np.datetime64(pd.Timestamp(start).date(), 'D')
+        groups = defaultdict(list)
+        covered = {}  # {symbol: first day known once this fetch succeeds}
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                dates, _ = self._load(symbol)
+                # What's stored, plus what upstream already said it has nothing for
+                known_from, known_to = [], []
+                if len(dates):
+                    known_from.append(dates[0])
+                    known_to.append(dates[-1])
+                if symbol in self._checked:
+                    known_from.append(self._checked[symbol][0])
+                    known_to.append(self._checked[symbol][1])
+                # A few days of slack so a start on a weekend/holiday doesn't force a refetch
+                if known_from and min(known_from) <= start_day + 4:
+                    fetch_from = max(known_to) + 1
+                else:
+                    fetch_from = start_day  # backfill, whatever was checked after start
+                covered[symbol] = min(known_from + [fetch_from])
+                if fetch_from <= started:
+                    groups[fetch_from].append(symbol)
+            
+            for fetch_from, group in groups.items():
+                begin = pd.Timestamp(fetch_from).to_pydatetime()
+                end = pd.Timestamp(started + 1).to_pydatetime()
+                try:
+                    bars = self.upstream.download_bars(group, begin, end)
+                except Exception as e:
+                    logger.warning(f"Bulk bar download failed, fetching symbols one by one: {e}")
+                    bars = None
+                if bars is None:
+                    # No bulk endpoint, or it failed: one request per symbol
+                    bars = _close_bars(self.upstream._history_each(group, begin, end))
+                    answered = list(bars)
+                else:
+                    # The bulk request succeeded, so a symbol it left out has no new bars
+                    answered = group
+                for symbol in answered:
+                    self._checked[symbol] = (covered[symbol], finished)
+                
+                for symbol in group:
+                    frame = bars.get(symbol)
+                    if frame is None or frame.empty:
+                        continue
+                    frame = _as_dates(frame.reindex(columns=OHLCV_FIELDS))
+                    final = frame[frame.index <= pd.Timestamp(finished)]
+                    self._live[symbol] = frame[frame.index > pd.Timestamp(finished)]
+                    if not final.empty:
+                        merged = pd.concat([self._stored_frame(symbol), final])
+                        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                        self._write(symbol, merged)
+    
+    def _window(self, symbol, start, end):
+        """Stored bars plus today's live bar in [start, end)."""
+        lo = np.datetime64(pd.Timestamp(start).date(), 'D')
+        hi = np.datetime64(pd.Timestamp(end), 'D')
+        if pd.Timestamp(end) > pd.Timestamp(hi):
+            hi += 1  # end is exclusive, but a time past midnight still includes that day
+        dates, values = self._load(symbol)
+        i, j = np.searchsorted(dates, lo), np.searchsorted(dates, hi)
+        frame = pd.DataFrame(np.asarray(values[i:j]), index=pd.DatetimeIndex(np.asarray(dates[i:j])),
+                             columns=OHLCV_FIELDS)
+        live = self._live.get(symbol)
+        if live is not None and not live.empty:
+            live = live[(live.index >= pd.Timestamp(lo)) & (live.index < pd.Timestamp(hi))]
+            frame = pd.concat([frame, live])
+        return frame
+    
+    def history(self, symbol, start, end):
+        self.sync([symbol], start)
+        return self._window(symbol, start, end)['Close'].dropna()
+    
+    def bars(self, symbols, start, end):
+        self.sync(symbols, start)
+        out = {}
+        for symbol in symbols:
+            frame = self._window(symbol, start, end)
+            if not frame.empty:
+                out[symbol] = frame
+        return out
+    
+    def closes(self, symbols, start, end):
+        symbols = list(dict.fromkeys(symbols))
+        self.sync(symbols, start)
+        series = []
+        for symbol in symbols:
+            close = self._window(symbol, start, end)['Close'].dropna()
+            if not close.empty:
+                series.append(close.rename(symbol))
+        if not series:
+            return pd.DataFrame()
+        return pd.concat(series, axis=1, sort=False).sort_index()
+
+
+class QuoteCache:
+    """
+    Last-price cache with a TTL (seconds). quotes() answers fresh symbols
+    from memory and refreshes every stale or unknown one with a single
+    source.quotes() call.
+    """
+    
+    def __init__(self, source, ttl=60.0):
+        self.source = source
+        self.ttl = ttl
+        self._quotes = {}  # {symbol: (price, time.monotonic() when fetched)}
+        self._lock = threading.Lock()
+    
+    def quotes(self, symbols):
+        """{symbol: price} for the symbols that have a price."""
+        symbols = list(dict.fromkeys(symbols))
+        with self._lock:
+            now = time.monotonic()
+            stale = [s for s in symbols
+                     if s not in self._quotes or now - self._quotes[s][1] > self.ttl]
+            if stale:
+                try:
+                    fresh = self.source.quotes(stale)
+                except Exception as e:
+                    logger.error(f"Error refreshing quotes: {e}")
+                    fresh = {}
+                for symbol, price in fresh.items():
+                    self._quotes[symbol] = (price, now)
+            return {s: self._quotes[s][0] for s in symbols if s in self._quotes}
+    
+    def clear(self):
+        with self._lock:
+            self._quotes.clear()
+
+
+class YahooDataSource(DataSource):
+    """Yahoo Finance via yfinance: one yf.download for the universe."""
+    
+    def __init__(self, max_workers=4, requests_per_second=2.0):
+        if yf is None:
+            raise ImportError("YahooDataSource needs yfinance (pip install yfinance)")
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(requests_per_second)
+    
+    def history(self, symbol, start, end):
+        self.limiter.wait()
+        return yf.Ticker(symbol).history(start=start, end=end)['Close']
+    
+    def download(self, symbols, start, end):
+        self.limiter.wait()
+        data = yf.download(symbols, start=start, end=end, auto_adjust=True,
+                           group_by='column', threads=False, progress=False)
+        if data.empty:
+            return data
+        closes = data['Close']
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(symbols[0])
+        return closes
+    
+    def bars(self, symbols, start, end):
+        out = self.download_bars(symbols, start, end)
+        missing = [s for s in symbols if s not in out]
+        if missing:
+            out.update(DataSource.bars(self, missing, start, end))
+        return out
+    
+    def download_bars(self, symbols, start, end):
+        self.limiter.wait()
+        data = yf.download(symbols, start=start, end=end, auto_adjust=True,
+                           group_by='ticker', threads=False, progress=False)
+        out = {}
+        if data.empty:
+            return out
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                frame = data[symbol]
+            else:
+                frame = data
+            frame = frame.reindex(columns=OHLCV_FIELDS).dropna(how='all')
+            if not frame.empty:
+                out[symbol] = frame
+        return out
+
+
+class FrameDataSource(DataSource):
+    """
+    Local stand-in source backed by a dates x symbols close-price DataFrame
+    (tests, backtests, offline runs). No bulk endpoint unless bulk=True, so
+    it can exercise either path of closes().
+    """
+    
+    def __init__(self, closes, bulk=True, delay=0.0):
+        self.frame = _as_dates(closes)
+        self.bulk = bulk
+        self.delay = delay  # simulated per-request latency in seconds
+        self.requests = 0
+    
+    def _window(self, start, end):
+        index = self.frame.index
+        return self.frame[(index >= pd.Timestamp(start).normalize()) & (index < pd.Timestamp(end))]
+    
+    def history(self, symbol, start, end):
+        self.requests += 1
+        time.sleep(self.delay)
+        if symbol not in self.frame.columns:
+            return pd.Series(dtype=float)
+        return self._window(start, end)[symbol].dropna()
+    
+    def download(self, symbols, start, end):
+        if not self.bulk:
+            return None
+        self.requests += 1
+        time.sleep(self.delay)
+        return self._window(start, end)[[s for s in symbols if s in self.frame.columns]]
+
+
+def _window_volatility(returns, count):
+    """
+    Sample std of the last count rows of returns (count may differ per row of
+    the result), from cumulative sums so all windows share one pass. A NaN
+    return only blanks the windows that contain it.
+    """
+    count = np.asarray(count)
+    gaps = np.isnan(returns)
+    returns = np.where(gaps, 0.0, returns)
+    zero = np.zeros((1, returns.shape[1]))
+    c0 = np.vstack([zero, np.cumsum(gaps, axis=0)])
+    c1 = np.vstack([zero, np.cumsum(returns, axis=0)])
+    c2 = np.vstack([zero, np.cumsum(returns ** 2, axis=0)])
+    start = len(returns) - count
+    s1 = c1[-1] - c1[start]
+    s2 = c2[-1] - c2[start]
+    m = count[..., None] if count.ndim else count
+    var = np.maximum((s2 - s1 ** 2 / m) / (m - 1), 0.0)
+    var[c0[-1] - c0[start] > 0] = np.nan
+    return np.sqrt(var)
+
+
+def momentum_scores(prices, lookbacks=20, skip=0, vol_adjust=False):
+    """
+    Momentum of every symbol at the last row of a dates x symbols price
+    matrix (ndarray or DataFrame).
+    
+    Raw score is close[-1 - skip] / close[-lookback] - 1, the same as
+    calculate_momentum (as a fraction, not percent); skip > 0 drops the
+    most recent bars (e.g. lookback 252, skip 21 for 12-1 momentum).
+    vol_adjust divides by the volatility of the daily returns over the
+    window, std * sqrt(number of returns).
+    
+    lookbacks can be one int (-> 1-D array of scores) or a sequence
+    (-> len(lookbacks) x symbols); all lookbacks share one pass over the
+    data. Symbols without enough history score NaN.
+    """
+    P = np.asarray(prices, dtype=np.float64)
+    single = np.ndim(lookbacks) == 0
+    L = np.atleast_1d(np.asarray(lookbacks, dtype=np.intp))
+    # the window needs one return, or two for a sample std
+    shortest = skip + (3 if vol_adjust else 2)
+    if (L < shortest).any():
+        raise ValueError(f"every lookback must be at least {shortest} (skip + 2, one more with vol_adjust)")
+    if L.max() > len(P):
+        raise ValueError(f"need {L.max()} rows of prices, got {len(P)}")
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = P[-1 - skip] / P[-L] - 1
+        if vol_adjust:
+            tail = P[len(P) - L.max():len(P) - skip]
+            returns = tail[1:] / tail[:-1] - 1
+            count = L - 1 - skip
+            scores = scores / (_window_volatility(returns, count) * np.sqrt(count)[:, None])
+    scores[~np.isfinite(scores)] = np.nan
+    return scores[0] if single else scores
+
+
+def momentum_matrix(prices, lookback, skip=0, vol_adjust=False):
+    """
+    momentum_scores at every date at once: row t scores the data up to and
+    including row t (NaN until there is enough history).
+    """
+    P = np.asarray(prices, dtype=np.float64)
+    shortest = skip + (3 if vol_adjust else 2)
+    if lookback < shortest:
+        raise ValueError(f"lookback must be at least {shortest} (skip + 2, one more with vol_adjust)")
+    out = np.full(P.shape, np.nan)
+    first = lookback - 1
+    if first >= len(P):
+        return out
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[first:] = P[first - skip:len(P) - skip] / P[:len(P) - first] - 1
+        if vol_adjust:
+            count = lookback - 1 - skip
+            returns = P[1:] / P[:-1] - 1
+            gaps = np.isnan(returns)
+            returns[gaps] = 0.0
+            zero = np.zeros((1, P.shape[1]))
+            c0 = np.vstack([zero, np.cumsum(gaps, axis=0)])
+            c1 = np.vstack([zero, np.cumsum(returns, axis=0)])
+            c2 = np.vstack([zero, np.cumsum(returns ** 2, axis=0)])
+            # returns ending at rows (t - count - skip, t - skip] are c[t - skip] - c[t - skip - count]
+            hi = np.arange(first, len(P)) - skip
+            s1 = c1[hi] - c1[hi - count]
+            s2 = c2[hi] - c2[hi - count]
+            var = np.maximum((s2 - s1 ** 2 / count) / (count - 1), 0.0)
+            var[c0[hi] - c0[hi - count] > 0] = np.nan
+            out[first:] /= np.sqrt(var) * np.sqrt(count)
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def select_top_bottom(scores, num_long, num_short):
+    """
+    Indices of the num_long highest and num_short lowest non-NaN scores,
+    each ordered best/worst first. argpartition keeps it O(n) per call.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.ndim != 1:
+        raise ValueError("scores must be 1-D (one lookback, or a combination of several)")
+    valid = np.flatnonzero(~np.isnan(scores))
+    values = scores[valid]
+    
+    def extreme(keys, k):
+        k = min(k, len(keys))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        part = np.argpartition(keys, k - 1)[:k]
+        return valid[part[np.argsort(keys[part], kind='stable')]]
+    
+    return extreme(-values, num_long), extreme(values, num_short)
+
+
+SUMMARY_FIELDS = ('final_equity', 'total_return', 'cagr', 'sharpe', 'max_drawdown',
+                  'annual_turnover', 'rebalances')
+
+
+class BacktestResult:
+    """
+    Output of backtest(): the daily equity curve, the weights set at each
+    rebalance, the turnover of each rebalance and summary statistics.
+    """
+    
+    def __init__(self, equity, weights, turnover, periods_per_year=252):
+        self.equity = equity          # Series, one value per date
+        self.weights = weights        # DataFrame, rebalance dates x symbols
+        self.turnover = turnover      # Series, sum |weight change| per rebalance
+        self.periods_per_year = periods_per_year
+        self.returns = equity.pct_change().fillna(0.0)
+        self.drawdown = equity / equity.cummax() - 1
+    
+    @property
+    def total_return(self):
+        return self.equity.iloc[-1] / self.equity.iloc[0] - 1
+    
+    @property
+    def cagr(self):
+        years = (len(self.equity) - 1) / self.periods_per_year
+        if self.equity.iloc[-1] <= 0:
+            return -1.0  # a levered book can be wiped out; no real root of a negative growth
+        return (1 + self.total_return) ** (1 / years) - 1 if years > 0 else 0.0
+    
+    @property
+    def sharpe(self):
+        """Annualized Sharpe ratio of daily returns after the first rebalance (no risk-free rate)."""
+        returns = self.returns[self.returns.index > self.weights.index[0]]
+        std = returns.std()
+        if not std or np.isnan(std):
+            return 0.0
+        return returns.mean() / std * np.sqrt(self.periods_per_year)
+    
+    @property
+    def max_drawdown(self):
+        return self.drawdown.min()
+    
+    @property
+    def annual_turnover(self):
+        years = len(self.equity) / self.periods_per_year
+        return self.turnover.sum() / years if years else 0.0
+    
+    def summary(self):
+        """The SUMMARY_FIELDS statistics as a dict."""
+        return {
+            'final_equity': float(self.equity.iloc[-1]),
+            'total_return': float(self.total_return),
+            'cagr': float(self.cagr),
+            'sharpe': float(self.sharpe),
+            'max_drawdown': float(self.max_drawdown),
+            'annual_turnover': float(self.annual_turnover),
+            'rebalances': len(self.weights),
+        }
+    
+    def __repr__(self):
+        s = self.summary()
+        return (f"BacktestResult(final=${s['final_equity']:,.2f}, return={s['total_return']:.2%}, "
+                f"sharpe={s['sharpe']:.2f}, max_dd={s['max_drawdown']:.2%}, "
+                f"turnover={s['annual_turnover']:.1f}/yr)")
+
+
+def backtest(prices, lookback_period=20, rebalance_period=5, num_long=5, num_short=5,
+             position_size=0.15, initial_capital=100000, skip=0, vol_adjust=False,
+             cost=0.0, scores=None):
+    """
+    Replay a dates x symbols close-price history through the strategy's
+    selection: every rebalance_period bars (starting as soon as there are
+    lookback_period bars) go long the num_long best and short the
+    num_short worst momentum scores, position_size of equity each, and hold
+    the shares until the next rebalance.
+    
+    Accounting is vectorized over dates and symbols. Shares are fractional,
+    fills are at the rebalance close, and cost is charged per unit of
+    turnover (0.001 = 10 bps). scores can pass a precomputed
+    momentum_matrix(prices, lookback_period, skip, vol_adjust).
+    """
+    if lookback_period < 2:
+        raise ValueError("lookback_period must be at least 2")
+    if rebalance_period < 1:
+        raise ValueError("rebalance_period must be at least 1")
+    if num_long < 0 or num_short < 0:
+        raise ValueError("num_long and num_short can't be negative")
+    frame = prices if isinstance(prices, pd.DataFrame) else pd.DataFrame(prices)
+    frame = frame.ffill()
+    P = frame.to_numpy(dtype=np.float64)
+    T, N = P.shape
+    if scores is None:
+        scores = momentum_matrix(P, lookback_period, skip, vol_adjust)
+    first = lookback_period - 1
+    if first >= T:
+        raise ValueError(f"need more than {first} rows of prices for a rebalance")
+    
+    # Target weights at each rebalance row
+    rebalances = np.arange(first, T, rebalance_period)
+    W = np.zeros((len(rebalances), N))
+    for k, t in enumerate(rebalances):
+        longs, shorts = select_top_bottom(scores[t], num_long, num_short)
+        W[k, shorts[~np.isin(shorts, longs)]] = -position_size
+        W[k, longs] = position_size
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Return of each holding period, and the weights it drifts to
+        growth = np.nan_to_num(P[rebalances[1:]] / P[rebalances[:-1]], nan=1.0)
+        period_return = np.einsum('kn,kn->k', W[:-1], growth - 1)
+        drifted = W[:-1] * growth / (1 + period_return)[:, None]
+        turnover = np.abs(W - np.vstack([np.zeros(N), drifted])).sum(axis=1)
+        
+        # Equity at each rebalance (after costs), then marked daily in between
+        factors = np.concatenate([[1.0], 1 + period_return]) * (1 - cost * turnover)
+        start_equity = initial_capital * np.cumprod(factors)
+        
+        segment = np.searchsorted(rebalances, np.arange(T), side='right') - 1
+        held = segment >= 0
+        seg = segment[held]
+        relative = np.nan_to_num(P[held] / P[rebalances[seg]] - 1)
+    
+    equity = np.full(T, float(initial_capital))
+    equity[held] = start_equity[seg] * (1 + np.einsum('tn,tn->t', W[seg], relative))
+    
+    index = frame.index
+    return BacktestResult(
+        pd.Series(equity, index=index, name='equity'),
+        pd.DataFrame(W, index=index[rebalances], columns=frame.columns),
+        pd.Series(turnover, index=index[rebalances], name='turnover'),
+    )
+
+
+# Parameter sweeps: worker processes share one read-only price matrix
+
+SWEEP_PARAMETERS = ('lookback_period', 'rebalance_period', 'num_long', 'num_short',
+                    'position_size', 'skip', 'vol_adjust', 'cost')
+
+_sweep_prices = None
+_sweep_memory = None
+
+
+def parameter_grid(**space):
+    """Every combination of the given parameter lists, as a list of dicts."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_configs(space, n, seed=None):
+    """n configurations drawn uniformly from each parameter list in space."""
+    rng = random.Random(seed)
+    return [{name: rng.choice(list(values)) for name, values in space.items()} for _ in range(n)]
+
+
+def _attach_sweep_prices(name, shape):
+    """Pool initializer: view the parent's shared price matrix, no copy."""
+    global _sweep_prices, _sweep_memory
+    try:
+        _sweep_memory = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track=; the parent unlinks it
+        _sweep_memory = shared_memory.SharedMemory(name=name)
+    _sweep_prices = np.ndarray(shape, dtype=np.float64, buffer=_sweep_memory.buf)
+    _sweep_prices.flags.writeable = False
+    _sweep_scores.cache_clear()
+
+
+def _detach_sweep_prices():
+    global _sweep_prices, _sweep_memory
+    _sweep_prices = None
+    _sweep_scores.cache_clear()
+    if _sweep_memory is not None:
+        _sweep_memory.close()
+        _sweep_memory = None
+
+
+@lru_cache(maxsize=16)
+def _sweep_scores(lookback, skip, vol_adjust):
+    scores = momentum_matrix(_sweep_prices, lookback, skip, vol_adjust)
+    scores.flags.writeable = False
+    return scores
+
+
+def _sweep_task(configs):
+    """Backtest a batch of configurations against the shared prices."""
+    rows = []
+    for config in configs:
+        params = {k: v for k, v in config.items() if k in SWEEP_PARAMETERS}
+        lookback = params.get('lookback_period', 20)
+        skip = params.get('skip', 0)
+        vol_adjust = bool(params.get('vol_adjust', False))
+        try:
+            scores = _sweep_scores(lookback, skip, vol_adjust)
+            summary = backtest(_sweep_prices, scores=scores, **params).summary()
+        except ValueError as e:
+            summary = {'error': str(e)}
+        rows.append({**config, **summary})
+    return rows
+
+
+class _ResultWriter:
+    """Appends sweep rows to a .csv file or a JSON-lines file as they arrive."""
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', newline='') if path else None
+        self.json = bool(path) and path.endswith(('.json', '.jsonl'))
+        self.writer = None
+    
+    def write(self, rows):
+        if not self.file:
+            return
+        for row in rows:
+            if self.json:
+                self.file.write(json.dumps(row, default=float) + '\n')
+            else:
+                if self.writer is None:
+                    fields = [f for f in row if f not in SUMMARY_FIELDS and f != 'error']
+                    fields += list(SUMMARY_FIELDS) + ['error']
+                    self.writer = csv.DictWriter(self.file, fieldnames=fields, restval='')
+                    self.writer.writeheader()
+                self.writer.writerow(row)
+        self.file.flush()
+    
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+def sweep(prices, configs, workers=None, output=None, sort_by='sharpe', chunk_size=8):
+    """
+    Backtest many parameter configurations (dicts with keys from
+    SWEEP_PARAMETERS, see parameter_grid/random_configs) over one price
+    history.
+    
+    The forward-filled price matrix is placed in shared memory once and
+    every worker process maps it read-only. Configurations are grouped by
+    (lookback, skip, vol_adjust) so a worker computes each momentum matrix
+    once and reuses it from its cache. Rows are appended to output (.csv,
+    or JSON lines for .json/.jsonl) as batches finish; the return value is
+    the full leaderboard sorted by sort_by, best first. workers=0 runs
+    everything in this process.
+    """
+    frame = prices if isinstance(prices, pd.DataFrame) else pd.DataFrame(prices)
+    P = np.ascontiguousarray(frame.ffill().to_numpy(dtype=np.float64))
+    
+    def key(config):
+        return (config.get('lookback_period', 20), config.get('skip', 0),
+                bool(config.get('vol_adjust', False)))
+    
+    ordered = sorted(configs, key=key)
+    tasks = []
+    for _, group in itertools.groupby(ordered, key=key):
+        group = list(group)
+        tasks.extend(group[i:i + chunk_size] for i in range(0, len(group), chunk_size))
+    
+    writer = _ResultWriter(output)
+    results = []
+    memory = shared_memory.SharedMemory(create=True, size=max(P.nbytes, 1))
+    try:
+        np.ndarray(P.shape, dtype=np.float64, buffer=memory.buf)[:] = P
+        if workers == 0:
+            _attach_sweep_prices(memory.name, P.shape)
+            for rows in map(_sweep_task, tasks):
+                writer.write(rows)
+                results.extend(rows)
+        else:
+            with get_context().Pool(workers, initializer=_attach_sweep_prices,
+                                    initargs=(memory.name, P.shape)) as pool:
+                for rows in pool.imap_unordered(_sweep_task, tasks):
+                    writer.write(rows)
+                    results.extend(rows)
+    finally:
+        writer.close()
+        if workers == 0:
+            _detach_sweep_prices()
+        memory.close()
+        memory.unlink()
+    
+    board = pd.DataFrame(results)
+    if sort_by in board.columns:
+        board = board.sort_values(sort_by, ascending=False, na_position='last').reset_index(drop=True)
+    logger.info(f"Sweep finished: {len(board)} configurations")
+    return board
+
+
+# NYSE trading calendar
+
+def _nth_weekday(year, month, weekday, n):
+    """Date of the n-th (n >= 1) or last (n = -1) given weekday (Mon=0) of a month."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    """Saturday holidays are observed Friday, Sunday holidays Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _easter(year):
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nyse_holidays(year):
+    """{date: name} of the full-day NYSE holidays observed in a year."""
+    holidays = {}
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:  # a Saturday New Year's Day is not moved to Dec 31
+        holidays[_observed(new_year)] = "New Year's Day"
+    if year >= 1998:
+        holidays[_nth_weekday(year, 1, 0, 3)] = "Martin Luther King Jr. Day"
+    holidays[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+    holidays[_easter(year) - timedelta(days=2)] = "Good Friday"
+    holidays[_nth_weekday(year, 5, 0, -1)] = "Memorial Day"
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = "Juneteenth"
+    holidays[_observed(date(year, 7, 4))] = "Independence Day"
+    holidays[_nth_weekday(year, 9, 0, 1)] = "Labor Day"
+    holidays[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving Day"
+    holidays[_observed(date(year, 12, 25))] = "Christmas Day"
+    return holidays
+
+
+def nyse_early_closes(year):
+    """Dates the NYSE closes at 1:00 PM ET."""
+    holidays = nyse_holidays(year)
+    early = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}  # day after Thanksgiving
+    for day in (date(year, 7, 3), date(year, 12, 24)):  # Independence Day / Christmas Eve
+        if day.weekday() < 5 and day not in holidays:
+            early.add(day)
+    return early
+
+
+class TradingCalendar:
+    """
+    Precomputed NYSE sessions.
+    
+    Holds a day-indexed session mask (O(1) is_session), the sorted session
+    dates and the sorted open/close timestamps of every session in the
+    covered years (O(log n) is_open / next_open / next_close /
+    sessions_between by binary search). Queries outside the covered years
+    extend it. Naive datetimes are taken as Eastern Time.
+    """
+    
+    OPEN = dt_time(9, 30)
+    CLOSE = dt_time(16, 0)
+    EARLY_CLOSE = dt_time(13, 0)
+    
+    def __init__(self, start_year=None, end_year=None, extra_closures=()):
+        this_year = datetime.now().year
+        self.tz = pytz.timezone('America/New_York')
+        self.extra_closures = {pd.Timestamp(d).date() for d in extra_closures}
+        self._build(start_year or this_year - 10, end_year or this_year + 5)
+    
+    def _build(self, first_year, last_year):
+        self.first_year, self.last_year = first_year, last_year
+        closed, early = set(self.extra_closures), set()
+        for year in range(first_year, last_year + 1):
+            closed.update(nyse_holidays(year))
+            early.update(nyse_early_closes(year))
+        
+        self._day0 = date(first_year, 1, 1)
+        days = np.arange(np.datetime64(self._day0), np.datetime64(date(last_year + 1, 1, 1)))
+        weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        holiday_days = np.array(sorted(closed), dtype='datetime64[D]')
+        self._session_mask = (weekday < 5) & ~np.isin(days, holiday_days)
+        self.sessions = days[self._session_mask]
+        
+        opens, closes = [], []
+        for day in self.sessions.astype(date):
+            close = self.EARLY_CLOSE if day in early else self.CLOSE
+            opens.append(self.tz.localize(datetime.combine(day, self.OPEN)).timestamp())
+            closes.append(self.tz.localize(datetime.combine(day, close)).timestamp())
+        self.opens = np.array(opens)
+        self.closes = np.array(closes)
+        self.early_closes = early
+    
+    def _ensure(self, year):
+        if year < self.first_year or year > self.last_year:
+            self._build(min(year, self.first_year), max(year, self.last_year))
+    
+    def _day(self, value):
+        """date of a date/datetime (aware datetimes are converted to ET)."""
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(self.tz)
+            value = value.date()
+        elif not isinstance(value, date):
+            value = pd.Timestamp(value).date()
+        self._ensure(value.year)
+        return value
+    
+    def _timestamp(self, when):
+        if when is None:
+            return time.time()
+        if when.tzinfo is None:
+            when = self.tz.localize(when)
+        self._ensure(when.year)
+        return when.timestamp()
+    
+    def _at(self, timestamp):
+        return datetime.fromtimestamp(timestamp, self.tz)
+    
+    def is_session(self, day):
+        """True if the exchange trades on this date."""
+        day = self._day(day)
+        return bool(self._session_mask[(day - self._day0).days])
+    
+    def is_open(self, when=None):
+        """True if the exchange is open at when (default now)."""
+        t = self._timestamp(when)
+        i = np.searchsorted(self.opens, t, side='right') - 1
+        return i >= 0 and t < self.closes[i]
+    
+    def next_open(self, when=None):
+        """First session open strictly after when (default now), as an ET datetime."""
+        t = self._timestamp(when)
+        i = np.searchsorted(self.opens, t, side='right')
+        if i == len(self.opens):
+            self._build(self.first_year, self.last_year + 1)
+            return self.next_open(when)
+        return self._at(self.opens[i])
+    
+    def next_close(self, when=None):
+        """First session close strictly after when (default now), as an ET datetime."""
+        t = self._timestamp(when)
+        i = np.searchsorted(self.closes, t, side='right')
+        if i == len(self.closes):
+            self._build(self.first_year, self.last_year + 1)
+            return self.next_close(when)
+        return self._at(self.closes[i])
+    
+    def last_open(self, when=None):
+        """Latest session open at or before when (default now), as an ET datetime."""
+        t = self._timestamp(when)
+        i = np.searchsorted(self.opens, t, side='right') - 1
+        if i < 0:
+            self._build(self.first_year - 1, self.last_year)
+            return self.last_open(when)
+        return self._at(self.opens[i])
+    
+    def last_close(self, when=None):
+        """Latest session close at or before when (default now), as an ET datetime."""
+        t = self._timestamp(when)
+        i = np.searchsorted(self.closes, t, side='right') - 1
+        if i < 0:
+            self._build(self.first_year - 1, self.last_year)
+            return self.last_close(when)
+        return self._at(self.closes[i])
+    
+    def session_open(self, day):
+        """Open time of the session on day (None if it isn't one)."""
+        day = self._day(day)
+        if not self.is_session(day):
+            return None
+        i = np.searchsorted(self.sessions, np.datetime64(day))
+        return self._at(self.opens[i])
+    
+    def session_close(self, day):
+        """Close time of the session on day (None if it isn't one)."""
+        day = self._day(day)
+        if not self.is_session(day):
+            return None
+        i = np.searchsorted(self.sessions, np.datetime64(day))
+        return self._at(self.closes[i])
+    
+    def next_session(self, day):
+        """First session date strictly after day."""
+        day = self._day(day)
+        i = np.searchsorted(self.sessions, np.datetime64(day), side='right')
+        if i == len(self.sessions):
+            self._build(self.first_year, self.last_year + 1)
+            return self.next_session(day)
+        return self.sessions[i].astype(date)
+    
+    def sessions_between(self, start, end):
+        """Number of sessions with a date in (start, end]."""
+        lo = np.datetime64(self._day(start))
+        hi = np.datetime64(self._day(end))
+        return int(np.searchsorted(self.sessions, hi, side='right')
+                   - np.searchsorted(self.sessions, lo, side='right'))
+
 
 class MomentumTradingStrategy:
     """
@@ -41,13 +1073,20 @@ class MomentumTradingStrategy:
     and takes simulated long/short positions.
     """
     
-    def __init__(self, initial_capital=100000):
+    def __init__(self, initial_capital=100000, data_source=None, store_dir='price_store'):
         """
         Initialize the trading strategy.
         
         Args:
             initial_capital: Starting capital for paper trading
+            data_source: DataSource for prices (default: YahooDataSource
+                behind a PriceStore in store_dir)
+            store_dir: Directory of the local price store
         """
+        self.calendar = TradingCalendar()
+        if data_source is None:
+            data_source = PriceStore(YahooDataSource(), store_dir, self.calendar)
+        self.data_source = data_source
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.positions = {}  # {symbol: {'qty': int, 'entry_price': float, 'side': 'long'/'short'}}
@@ -58,6 +1097,15 @@ class MomentumTradingStrategy:
         self.num_long = 5          # Number of long positions
         self.num_short = 5         # Number of short positions
         self.position_size = 0.15  # 15% of portfolio per position
+        self.skip_period = 0       # Most recent days left out of momentum
+        self.vol_adjusted = False  # Divide momentum by its volatility
+        
+        # Scheduler: rebalance a little after the open, mark once the daily bar is final
+        self.rebalance_delay = timedelta(minutes=5)
+        self.mark_delay = timedelta(minutes=15)
+        self.max_sleep = 3600      # Longest single sleep (seconds), guards against clock jumps
+        self._last_mark = None     # Session date of the last end-of-day mark
+        self.quote_ttl = 60        # Seconds a cached price stays fresh
         
         # Stock universe (S&P 100 subset for demonstration)
         self.universe = [
@@ -75,6 +1123,11 @@ class MomentumTradingStrategy:
         # Timezone setup
         self.et_tz = pytz.timezone('America/New_York')
         
+        # Prices: TTL cache, plus the pinned snapshot of the current cycle
+        self.quote_cache = QuoteCache(self.data_source, ttl=self.quote_ttl)
+        self._prices = None
+        self._snapshot_depth = 0
+        
         # Load saved state if exists
         self.load_state()
         
@@ -83,75 +1136,27 @@ class MomentumTradingStrategy:
         return datetime.now(self.et_tz)
     
     def is_market_hours(self):
-        """Check if market is currently open (9:30 AM - 4:00 PM ET)."""
-        et_now = self.get_et_time()
-        
-        # Check if weekday
-        if et_now.weekday() >= 5:  # Saturday = 5, Sunday = 6
-            return False
-        
-        # Check if holiday
-        if not self.is_trading_day(et_now):
-            return False
-        
-        # Check if within market hours (9:30 AM - 4:00 PM ET)
-        market_open = dt_time(9, 30)
-        market_close = dt_time(16, 0)
-        current_time = et_now.time()
-        
-        return market_open <= current_time <= market_close
+        """Check if market is currently open (9:30 AM - 4:00 PM ET, 1:00 PM on early closes)."""
+        return self.calendar.is_open(self.get_et_time())
     
     def is_trading_day(self, check_date):
         """Check if a specific date is a trading day (not weekend/holiday)."""
-        # Check if weekend
-        if check_date.weekday() >= 5:
-            return False
-        
-        # Check common US market holidays
-        year = check_date.year
-        holidays = [
-            datetime(year, 1, 1),   # New Year's Day
-            datetime(year, 7, 4),   # Independence Day
-            datetime(year, 12, 25), # Christmas
-            # Add more holidays as needed
-        ]
-        
-        # Adjust holidays that fall on weekends
-        adjusted_holidays = []
-        for holiday in holidays:
-            if holiday.weekday() == 5:  # Saturday -> observe Friday
-                adjusted_holidays.append(holiday - timedelta(days=1))
-            elif holiday.weekday() == 6:  # Sunday -> observe Monday
-                adjusted_holidays.append(holiday + timedelta(days=1))
-            else:
-                adjusted_holidays.append(holiday)
-        
-        check = check_date.date()
-        return check not in [h.date() for h in adjusted_holidays]
+        return self.calendar.is_session(check_date)
     
     def next_trading_day(self):
         """Calculate the next trading day at market open."""
-        et_now = self.get_et_time()
-        next_day = et_now + timedelta(days=1)
-        next_day = next_day.replace(hour=9, minute=30, second=0, microsecond=0)
-        
-        while not self.is_trading_day(next_day):
-            next_day += timedelta(days=1)
-        
-        return next_day
+        return self.calendar.next_open(self.get_et_time())
     
     def seconds_until_market_open(self):
         """Calculate seconds until next market open."""
         et_now = self.get_et_time()
-        
-        # If it's a trading day but before market open
-        if self.is_trading_day(et_now) and et_now.time() < dt_time(9, 30):
-            market_open_today = et_now.replace(hour=9, minute=30, second=0, microsecond=0)
-            return (market_open_today - et_now).total_seconds()
-        
-        # Otherwise, get next trading day
-        next_open = self.next_trading_day()
-        return (next_open - et_now).total_seconds()
+        return (self.calendar.next_open(et_now) - et_now).total_seconds()
+    
+    def trading_days_since_rebalance(self):
+        """Sessions completed or started since the last rebalance (None if never)."""
+        if self.last_rebalance is None:
+            return None
+        return self.calendar.sessions_between(self.last_rebalance, self.get_et_time())
     
     def save_state(self):
         """Save current strategy state to JSON file."""
@@ -160,6 +1165,7 @@ class MomentumTradingStrategy:
                 'cash': self.cash,
                 'positions': self.positions,
                 'last_rebalance': self.last_rebalance.isoformat() if self.last_rebalance else None,
+                'last_mark': self._last_mark.isoformat() if self._last_mark else None,
                 'initial_capital': self.initial_capital
             }
             
@@ -180,6 +1186,8 @@ class MomentumTradingStrategy:
                 self.cash = state['cash']
                 self.positions = state['positions']
                 self.last_rebalance = datetime.fromisoformat(state['last_rebalance']) if state['last_rebalance'] else None
+                last_mark = state.get('last_mark')  # missing in state files from older versions
+                self._last_mark = date.fromisoformat(last_mark) if last_mark else None
                 self.initial_capital = state['initial_capital']
                 
                 logger.info(f"State loaded from {self.state_file}")
@@ -187,17 +1195,40 @@ class MomentumTradingStrategy:
         except Exception as e:
             logger.error(f"Error loading state: {e}")
     
-    def get_current_price(self, symbol):
-        """Get current price for a symbol."""
+    @contextmanager
+    def price_snapshot(self, symbols=()):
+        """
+        Pin one set of prices for a cycle: the symbols (plus every open
+        position) are refreshed in a single batched request, and every
+        get_current_price() inside the block reads from that snapshot.
+        Nested blocks share the outer snapshot.
+        """
+        wanted = list(symbols) + list(self.positions)
+        if self._prices is None:
+            self._prices = self.quote_cache.quotes(wanted)
+        else:
+            missing = [s for s in wanted if s not in self._prices]
+            if missing:
+                self._prices.update(self.quote_cache.quotes(missing))
+        self._snapshot_depth += 1
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period='1d')
-            if not data.empty:
-                return data['Close'].iloc[-1]
-            return None
-        except Exception as e:
-            logger.error(f"Error getting price for {symbol}: {e}")
-            return None
+            yield self._prices
+        finally:
+            self._snapshot_depth -= 1
+            if not self._snapshot_depth:
+                self._prices = None
+    
+    def get_current_price(self, symbol):
+        """Get current price for a symbol (from the cycle's snapshot if one is open)."""
+        if self._prices is not None:
+            if symbol not in self._prices:
+                self._prices.update(self.quote_cache.quotes([symbol]))
+            price = self._prices.get(symbol)
+        else:
+            price = self.quote_cache.quotes([symbol]).get(symbol)
+        if price is None:
+            logger.error(f"Error getting price for {symbol}: no quote")
+        return price
     
     def calculate_portfolio_value(self):
         """Calculate total portfolio value including positions."""
@@ -220,63 +1251,82 @@ class MomentumTradingStrategy:
     def write_positions_to_file(self):
         """Write current portfolio state to positions.txt."""
         try:
-            portfolio_value = self.calculate_portfolio_value()
-            et_now = self.get_et_time()
-            
-            with open(self.positions_file, 'w') as f:
-                f.write("="*80 + "\n")
-                f.write(f"PORTFOLIO STATUS - {et_now.strftime('%Y-%m-%d %I:%M:%S %p %Z')}\n")
-                f.write("="*80 + "\n\n")
-                
-                f.write(f"Initial Capital:    ${self.initial_capital:,.2f}\n")
-                f.write(f"Current Cash:       ${self.cash:,.2f}\n")
-                f.write(f"Portfolio Value:    ${portfolio_value:,.2f}\n")
-                f.write(f"Total P&L:          ${portfolio_value - self.initial_capital:,.2f} ")
-                f.write(f"({((portfolio_value / self.initial_capital - 1) * 100):.2f}%)\n\n")
-                
-                if self.positions:
-                    f.write("CURRENT POSITIONS:\n")
-                    f.write("-"*80 + "\n")
-                    f.write(f"{'Symbol':<10} {'Side':<8} {'Qty':<8} {'Entry':<12} {'Current':<12} {'P&L':<15} {'P&L %':<10}\n")
-                    f.write("-"*80 + "\n")
-                    
-                    for symbol, pos in self.positions.items():
-                        current_price = self.get_current_price(symbol)
-                        if current_price:
-                            if pos['side'] == 'long':
-                                pnl = pos['qty'] * (current_price - pos['entry_price'])
-                                pnl_pct = ((current_price / pos['entry_price']) - 1) * 100
-                            else:  # short
-                                pnl = pos['qty'] * (pos['entry_price'] - current_price)
-                                pnl_pct = ((pos['entry_price'] / current_price) - 1) * 100
-                            
-                            f.write(f"{symbol:<10} {pos['side']:<8} {pos['qty']:<8} "
-                                  f"${pos['entry_price']:<11.2f} ${current_price:<11.2f} "
-                                  f"${pnl:<14.2f} {pnl_pct:<9.2f}%\n")
-                else:
-                    f.write("No open positions\n")
-                
-                f.write("\n" + "="*80 + "\n")
-                
-                if self.last_rebalance:
-                    f.write(f"Last Rebalance: {self.last_rebalance.strftime('%Y-%m-%d %I:%M:%S %p')}\n")
-                    days_since = (et_now - self.last_rebalance).days
-                    next_rebalance_days = max(0, self.rebalance_period - days_since)
-                    f.write(f"Next Rebalance: In {next_rebalance_days} trading days\n")
-                
-                market_status = "OPEN" if self.is_market_hours() else "CLOSED"
-                f.write(f"Market Status: {market_status}\n")
-                
-                if not self.is_market_hours():
-                    seconds_until = self.seconds_until_market_open()
-                    hours_until = seconds_until / 3600
-                    f.write(f"Market opens in: {hours_until:.1f} hours\n")
-                
+            with self.price_snapshot():
+                self._write_positions()
             logger.info(f"Portfolio written to {self.positions_file}")
             
         except Exception as e:
             logger.error(f"Error writing positions to file: {e}")
     
+    def _write_positions(self):
+        """Write positions.txt (prices come from the open snapshot)."""
+        portfolio_value = self.calculate_portfolio_value()
+        et_now = self.get_et_time()
+        
+        with open(self.positions_file, 'w') as f:
+            f.write("="*80 + "\n")
+            f.write(f"PORTFOLIO STATUS - {et_now.strftime('%Y-%m-%d %I:%M:%S %p %Z')}\n")
+            f.write("="*80 + "\n\n")
+            
+            f.write(f"Initial Capital:    ${self.initial_capital:,.2f}\n")
+            f.write(f"Current Cash:       ${self.cash:,.2f}\n")
+            f.write(f"Portfolio Value:    ${portfolio_value:,.2f}\n")
+            f.write(f"Total P&L:          ${portfolio_value - self.initial_capital:,.2f} ")
+            f.write(f"({((portfolio_value / self.initial_capital - 1) * 100):.2f}%)\n\n")
+            
+            if self.positions:
+                f.write("CURRENT POSITIONS:\n")
+                f.write("-"*80 + "\n")
+                f.write(f"{'Symbol':<10} {'Side':<8} {'Qty':<8} {'Entry':<12} {'Current':<12} {'P&L':<15} {'P&L %':<10}\n")
+                f.write("-"*80 + "\n")
+                
+                for symbol, pos in self.positions.items():
+                    current_price = self.get_current_price(symbol)
+                    if current_price:
+                        if pos['side'] == 'long':
+                            pnl = pos['qty'] * (current_price - pos['entry_price'])
+                            pnl_pct = ((current_price / pos['entry_price']) - 1) * 100
+                        else:  # short
+                            pnl = pos['qty'] * (pos['entry_price'] - current_price)
+                            pnl_pct = ((pos['entry_price'] / current_price) - 1) * 100
+                        
+                        f.write(f"{symbol:<10} {pos['side']:<8} {pos['qty']:<8} "
+                              f"${pos['entry_price']:<11.2f} ${current_price:<11.2f} "
+                              f"${pnl:<14.2f} {pnl_pct:<9.2f}%\n")
+            else:
+                f.write("No open positions\n")
+            
+            f.write("\n" + "="*80 + "\n")
+            
+            if self.last_rebalance:
+                f.write(f"Last Rebalance: {self.last_rebalance.strftime('%Y-%m-%d %I:%M:%S %p')}\n")
+                days_since = self.trading_days_since_rebalance()
+                next_rebalance_days = max(0, self.rebalance_period - days_since)
+                f.write(f"Next Rebalance: In {next_rebalance_days} trading days\n")
+            
+            market_status = "OPEN" if self.is_market_hours() else "CLOSED"
+            f.write(f"Market Status: {market_status}\n")
+            
+            if not self.is_market_hours():
+                seconds_until = self.seconds_until_market_open()
+                hours_until = seconds_until / 3600
+                f.write(f"Market opens in: {hours_until:.1f} hours\n")
+    
+    @staticmethod
+    def _momentum(closes, lookback_days):
+        """(last close / close lookback_days bars ago - 1) * 100, or None if too short."""
+        closes = closes.dropna()
+        if len(closes) < lookback_days:
+            return None
+        return (closes.iloc[-1] / closes.iloc[-lookback_days] - 1) * 100
+    
+    def fetch_closes(self, symbols, lookback_days):
+        """Aligned close prices for symbols covering at least lookback_days bars."""
+        end = datetime.now()
+        # lookback_days counts trading days: ~7/5 calendar days each, plus a holiday buffer
+        start = end - timedelta(days=lookback_days * 7 // 5 + 30)
+        return self.data_source.closes(symbols, start, end)
+    
     def calculate_momentum(self, symbol, lookback_days):
         """
         Calculate momentum score for a given symbol.
@@ -290,22 +1340,10 @@ class MomentumTradingStrategy:
             Momentum score as a percentage
         """
         try:
-            # Get historical data
-            ticker = yf.Ticker(symbol)
-            end = datetime.now()
-            start = end - timedelta(days=lookback_days + 30)  # Extra buffer for weekends
-            
-            data = ticker.history(start=start, end=end)
-            
-            if len(data) < lookback_days:
+            closes = self.fetch_closes([symbol], lookback_days)
+            momentum = self._momentum(closes[symbol], lookback_days) if symbol in closes else None
+            if momentum is None:
                 logger.warning(f"Insufficient data for {symbol}")
-                return None
-            
-            # Calculate momentum
-            current_price = data['Close'].iloc[-1]
-            past_price = data['Close'].iloc[-lookback_days]
-            momentum = (current_price / past_price - 1) * 100
-            
             return momentum
             
         except Exception as e:
@@ -321,14 +1359,20 @@ class MomentumTradingStrategy:
         """
         logger.info("Calculating momentum scores for universe...")
         
-        momentum_data = []
-        for symbol in self.universe:
-            momentum = self.calculate_momentum(symbol, self.lookback_period)
-            if momentum is not None:
-                momentum_data.append({'symbol': symbol, 'momentum': momentum})
-            time.sleep(0.1)  # Be nice to Yahoo Finance
+        # One batched fetch for the whole universe instead of a request per symbol
+        closes = self.fetch_closes(self.universe, self.lookback_period)
+        closes = closes.reindex(columns=self.universe).ffill()
+        
+        if len(closes) >= self.lookback_period:
+            scores = momentum_scores(closes, self.lookback_period, self.skip_period,
+                                     self.vol_adjusted) * 100
+        else:
+            scores = np.full(len(self.universe), np.nan)
+        for symbol in closes.columns[np.isnan(scores)]:
+            logger.warning(f"Insufficient data for {symbol}")
         
-        df = pd.DataFrame(momentum_data)
+        ok = ~np.isnan(scores)
+        df = pd.DataFrame({'symbol': closes.columns[ok], 'momentum': scores[ok]})
         df = df.sort_values('momentum', ascending=False).reset_index(drop=True)
         
         logger.info(f"\nTop 5 momentum stocks:")
@@ -338,6 +1382,41 @@ class MomentumTradingStrategy:
         
         return df
     
+    def backtest(self, prices=None, start=None, end=None, **overrides):
+        """
+        Backtest the current parameters (see backtest()) over prices, or
+        over the universe's stored history between start and end (default:
+        the last five years). Keyword overrides replace single parameters.
+        """
+        if prices is None:
+            end = end or datetime.now()
+            start = start or end - timedelta(days=5 * 365)
+            prices = self.data_source.closes(self.universe, start, end)
+        params = dict(
+            lookback_period=self.lookback_period,
+            rebalance_period=self.rebalance_period,
+            num_long=self.num_long,
+            num_short=self.num_short,
+            position_size=self.position_size,
+            initial_capital=self.initial_capital,
+            skip=self.skip_period,
+            vol_adjust=self.vol_adjusted,
+        )
+        params.update(overrides)
+        return backtest(prices, **params)
+    
+    def sweep(self, space, prices=None, samples=None, seed=None, **kwargs):
+        """
+        Parameter sweep (see sweep()) over the universe's stored history, or
+        over prices. space maps parameter names to candidate lists; the full
+        grid is run unless samples asks for that many random draws.
+        """
+        if prices is None:
+            end = datetime.now()
+            prices = self.data_source.closes(self.universe, end - timedelta(days=5 * 365), end)
+        configs = random_configs(space, samples, seed) if samples else parameter_grid(**space)
+        return sweep(prices, configs, **kwargs)
+    
     def close_all_positions(self):
         """Close all open positions at current market prices."""
         logger.info("Closing all positions...")
@@ -431,33 +1510,63 @@ class MomentumTradingStrategy:
         logger.info(f"\nTarget Long Positions: {long_symbols}")
         logger.info(f"Target Short Positions: {short_symbols}")
         
-        # Close existing positions
-        self.close_all_positions()
-        
-        # Execute new trades
-        self.execute_trades(long_symbols, short_symbols)
-        
-        self.last_rebalance = self.get_et_time()
-        logger.info(f"\nRebalance completed at {self.last_rebalance.strftime('%Y-%m-%d %I:%M:%S %p %Z')}")
-        logger.info("="*60 + "\n")
-        
-        # Save state and write positions
-        self.save_state()
-        self.write_positions_to_file()
+        # Closes, fills and the positions report all use one price snapshot
+        with self.price_snapshot(long_symbols + short_symbols):
+            # Close existing positions
+            self.close_all_positions()
+            
+            # Execute new trades
+            self.execute_trades(long_symbols, short_symbols)
+            
+            self.last_rebalance = self.get_et_time()
+            logger.info(f"\nRebalance completed at {self.last_rebalance.strftime('%Y-%m-%d %I:%M:%S %p %Z')}")
+            logger.info("="*60 + "\n")
+            
+            # Save state and write positions
+            self.save_state()
+            self.write_positions_to_file()
     
     def should_rebalance(self):
         """Check if it's time to rebalance (only counts trading days)."""
         if self.last_rebalance is None:
             return True
         
-        et_now = self.get_et_time()
-        days_since = (et_now - self.last_rebalance).days
+        return self.trading_days_since_rebalance() >= self.rebalance_period
+    
+    def next_event(self, now=None):
+        """
+        (when, kind) of the next thing the strategy has to do:
+        'rebalance' at the open of a session where one is due (plus
+        rebalance_delay), otherwise 'mark' - write positions.txt - after
+        that session's close (plus mark_delay). when is never before now.
+        """
+        now = now or self.get_et_time()
+        today = now.astimezone(self.et_tz).date()
+        if self.calendar.is_session(today) and self._last_mark != today:
+            session = today
+        else:
+            session = self.calendar.next_session(today)
         
-        return days_since >= self.rebalance_period
+        open_at = self.calendar.session_open(session) + self.rebalance_delay
+        mark_at = self.calendar.session_close(session) + self.mark_delay
+        due = (self.last_rebalance is None
+               or self.calendar.sessions_between(self.last_rebalance, session) >= self.rebalance_period)
+        if due and now < mark_at:
+            return max(open_at, now), 'rebalance'
+        return max(mark_at, now), 'mark'
+    
+    def _sleep_until(self, when):
+        while True:
+            remaining = (when - self.get_et_time()).total_seconds()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, self.max_sleep))
     
     def run_continuous(self):
         """
-        Continuous execution loop that handles market hours, weekends, and holidays.
+        Event-driven loop: sleeps until the next rebalance or end-of-day mark
+        (see next_event) and does nothing - no downloads, no file writes -
+        in between, so weekends, holidays and nights cost nothing.
         """
         logger.info("Starting Momentum Trading Strategy (Continuous Mode)")
         logger.info(f"Initial Capital: ${self.initial_capital:,.2f}")
@@ -472,45 +1581,23 @@ class MomentumTradingStrategy:
         
         while True:
             try:
-                et_now = self.get_et_time()
+                when, kind = self.next_event()
+                wait = (when - self.get_et_time()).total_seconds()
+                if wait > 0:
+                    logger.info(f"Next event: {kind} at {when.strftime('%Y-%m-%d %I:%M %p %Z')} "
+                                f"(in {wait / 3600:.1f} hours)")
+                    self._sleep_until(when)
                 
-                # Check if market is currently open
-                if not self.is_market_hours():
-                    seconds_until = self.seconds_until_market_open()
-                    hours_until = seconds_until / 3600
-                    next_open = self.next_trading_day()
-                    
-                    logger.info(f"Market is CLOSED")
-                    logger.info(f"Next market open: {next_open.strftime('%Y-%m-%d %I:%M %p %Z')}")
-                    logger.info(f"Time until open: {hours_until:.1f} hours")
-                    
-                    # Update positions file
-                    self.write_positions_to_file()
-                    
-                    # Sleep for a reasonable time (check every hour when market is closed)
-                    sleep_time = min(3600, seconds_until)
-                    logger.info(f"Sleeping for {sleep_time/60:.0f} minutes...\n")
-                    time.sleep(sleep_time)
-                    continue
-                
-                # Market is open - check if we should rebalance
-                logger.info(f"Market is OPEN")
-                
-                if self.should_rebalance():
+                if kind == 'rebalance':
                     logger.info("Time to rebalance!")
                     self.rebalance_portfolio()
                 else:
                     if self.last_rebalance:
-                        days_since = (et_now - self.last_rebalance).days
-                        days_left = self.rebalance_period - days_since
+                        days_left = self.rebalance_period - self.trading_days_since_rebalance()
                         logger.info(f"Next rebalance in {days_left} trading days")
-                    
-                    # Update positions file
                     self.write_positions_to_file()
-                
-                # Check again in 1 hour during market hours
-                logger.info("Sleeping for 1 hour before next check...\n")
-                time.sleep(3600)
+                    self._last_mark = when.astimezone(self.et_tz).date()
+                    self.save_state()
                 
             except KeyboardInterrupt:
                 logger.info("\n" + "="*60)
@@ -535,7 +1622,7 @@ def main():
     - Waits until Monday if it's the weekend
     - Runs first rebalance when market opens
     - Saves state so you can stop/restart anytime
-    - Updates positions.txt regularly
+    - Updates positions.txt after every session close
     """
     
     # Initialize strategy with $100,000 starting capital
@@ -0,0 +1,202 @@
+"""
+Offline tests for momentum.py, run with pytest from this directory:
+
+    python -m pytest -q test_momentum.py
+
+Everything runs against FrameDataSource, the local stand-in for Yahoo, so
+no network access (or yfinance) is needed.
+"""
+
+import os
+import sys
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import momentum as M
+
+CALENDAR = M.TradingCalendar(2020, 2027)
+ET = CALENDAR.tz
+
+
+def sessions(start, end):
+    days = CALENDAR.sessions
+    return pd.DatetimeIndex(days[(days >= np.datetime64(start)) & (days <= np.datetime64(end))])
+
+
+def random_closes(index, symbols, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0005, 0.02, (len(index), len(symbols)))
+    return pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=index, columns=symbols)
+
+
+@pytest.fixture
+def frame():
+    closes = random_closes(sessions('2024-01-02', '2024-03-28'), ['AAA', 'BBB', 'CCC', 'DDD'])
+    closes.iloc[:10, 1] = np.nan   # BBB starts trading later
+    closes.iloc[30, 2] = np.nan    # CCC misses a day
+    return closes
+
+
+# --- DataSource.closes ---
+
+@pytest.mark.parametrize('bulk', [True, False])
+def test_closes_aligns_columns_and_dates(frame, bulk):
+    source = M.FrameDataSource(frame, bulk=bulk)
+    symbols = ['CCC', 'AAA', 'BBB', 'CCC', 'DDD']
+    closes = source.closes(symbols, datetime(2024, 1, 1), datetime(2024, 4, 1))
+
+    # requested order, duplicates dropped, every date of any symbol kept
+    assert list(closes.columns) == ['CCC', 'AAA', 'BBB', 'DDD']
+    assert closes.index.equals(frame.index)
+    pd.testing.assert_frame_equal(closes, frame[closes.columns], check_freq=False, check_names=False)
+    # one bulk request, or one request per symbol without a bulk endpoint
+    assert source.requests == (1 if bulk else 4)
+
+
+def test_closes_fetches_only_what_the_bulk_call_missed(frame):
+    source = M.FrameDataSource(frame, bulk=True)
+    closes = source.closes(['AAA', 'ZZZ'], datetime(2024, 1, 1), datetime(2024, 4, 1))
+    assert list(closes.columns) == ['AAA']
+    assert source.requests == 2  # the bulk call, then history() for ZZZ alone
+
+
+def test_closes_with_no_data_is_empty(frame):
+    source = M.FrameDataSource(frame, bulk=False)
+    assert source.closes(['ZZZ'], datetime(2024, 1, 1), datetime(2024, 4, 1)).empty
+
+
+# --- PriceStore ---
+
+@pytest.mark.parametrize('bulk', [True, False])
+def test_price_store_sync_is_incremental(tmp_path, frame, bulk):
+    source = M.FrameDataSource(frame, bulk=bulk)
+    store = M.PriceStore(source, str(tmp_path), CALENDAR)
+    symbols = list(frame.columns)
+
+    store.sync(symbols, '2024-01-02', now=ET.localize(datetime(2024, 3, 28, 17, 0)))
+    first = source.requests
+    assert first == (1 if bulk else len(symbols))
+
+    # Already current: same evening, Good Friday, the weekend, Monday pre-open
+    for now in (datetime(2024, 3, 28, 17, 0), datetime(2024, 3, 29, 12), datetime(2024, 3, 30, 12),
+                datetime(2024, 4, 1, 8)):
+        store.sync(symbols, '2024-01-02', now=ET.localize(now))
+    assert source.requests == first
+
+    # Monday after the open: one check for the new session, whatever the bulk call returned
+    store.sync(symbols, '2024-01-02', now=ET.localize(datetime(2024, 4, 1, 11, 0)))
+    assert source.requests == first + (1 if bulk else len(symbols))
+
+    closes = M.PriceStore(source, str(tmp_path), CALENDAR).closes(symbols, '2024-01-02', '2024-03-29')
+    pd.testing.assert_frame_equal(closes, frame, check_freq=False, check_names=False,
+                                  check_index_type=False)
+
+
+def test_price_store_backfills_an_earlier_start(tmp_path, frame):
+    source = M.FrameDataSource(frame)
+    store = M.PriceStore(source, str(tmp_path), CALENDAR)
+    now = ET.localize(datetime(2024, 3, 28, 17, 0))
+
+    store.sync(['AAA'], '2024-03-18', now=now)
+    assert store._load('AAA')[0][0] == np.datetime64('2024-03-18')
+
+    # A longer lookback for a symbol that was synced short, plus a new one
+    store.sync(['AAA', 'DDD'], '2024-01-02', now=now)
+    for symbol in ('AAA', 'DDD'):
+        dates, _ = store._load(symbol)
+        assert len(dates) == len(frame)
+    requests = source.requests
+    store.sync(['AAA', 'DDD'], '2024-01-02', now=now)
+    assert source.requests == requests
+
+    # BBB only has bars from mid-January: asking again from Jan 2 isn't a backfill
+    store.sync(['BBB'], '2024-01-02', now=now)
+    requests = source.requests
+    store.sync(['BBB'], '2024-01-02', now=now)
+    assert source.requests == requests
+    assert store._load('BBB')[0][0] == np.datetime64(frame['BBB'].first_valid_index().date())
+
+
+def test_price_store_keeps_the_live_bar_out_of_the_files(tmp_path, frame):
+    live = frame.iloc[[-1]].set_axis([pd.Timestamp('2024-04-01')]) * 1.01
+    source = M.FrameDataSource(pd.concat([frame, live]))
+    store = M.PriceStore(source, str(tmp_path), CALENDAR)
+
+    store.sync(['AAA'], '2024-01-02', now=ET.localize(datetime(2024, 4, 1, 11, 0)))
+    dates, _ = store._load('AAA')
+    assert dates[-1] == np.datetime64('2024-03-28')
+    assert store.history('AAA', '2024-03-28', '2024-04-02').index[-1] == pd.Timestamp('2024-04-01')
+
+    # Once the session has closed the bar is final and gets written
+    store.sync(['AAA'], '2024-01-02', now=ET.localize(datetime(2024, 4, 1, 17, 0)))
+    dates, _ = store._load('AAA')
+    assert dates[-1] == np.datetime64('2024-04-01')
+
+
+# --- backtest ---
+
+def share_by_share(prices, lookback, rebalance, num_long, num_short, size, capital):
+    """Equity curve from an explicit loop over days and symbols."""
+    P = prices.to_numpy()
+    cash, shares, equity = capital, {}, []
+    for t in range(len(P)):
+        if t >= lookback - 1 and (t - (lookback - 1)) % rebalance == 0:
+            value = cash + sum(q * P[t][s] for s, q in shares.items())
+            scores = M.momentum_scores(P[:t + 1], lookback)
+            ranked = sorted(range(P.shape[1]), key=lambda s: scores[s])
+            longs = ranked[::-1][:num_long]
+            shorts = [s for s in ranked[:num_short] if s not in longs]
+            shares = {s: size * value / P[t][s] for s in longs}
+            shares.update({s: -size * value / P[t][s] for s in shorts})
+            cash = value - sum(q * P[t][s] for s, q in shares.items())
+        equity.append(cash + sum(q * P[t][s] for s, q in shares.items()))
+    return np.array(equity)
+
+
+@pytest.mark.parametrize('lookback, rebalance, num_long, num_short, size', [
+    (20, 5, 2, 2, 0.15),
+    (10, 1, 3, 0, 0.3),
+    (30, 21, 1, 3, 0.2),
+])
+def test_backtest_matches_share_by_share_loop(lookback, rebalance, num_long, num_short, size):
+    prices = random_closes(pd.bdate_range('2022-01-03', periods=250), [f'S{i}' for i in range(8)], seed=3)
+    result = M.backtest(prices, lookback, rebalance, num_long, num_short, size, 100000)
+    expected = share_by_share(prices, lookback, rebalance, num_long, num_short, size, 100000)
+    np.testing.assert_allclose(result.equity.to_numpy(), expected, rtol=1e-9)
+    assert len(result.weights) == len(range(lookback - 1, len(prices), rebalance))
+
+
+def test_backtest_rejects_bad_parameters():
+    prices = random_closes(pd.bdate_range('2022-01-03', periods=60), ['A', 'B'])
+    for bad in ({'rebalance_period': 0}, {'num_long': -1}, {'lookback_period': 1}):
+        with pytest.raises(ValueError):
+            M.backtest(prices, **bad)
+
+
+# --- calendar ---
+
+NYSE_HOLIDAYS = {
+    2021: ['01-01', '01-18', '02-15', '04-02', '05-31', '07-05', '09-06', '11-25', '12-24'],
+    2022: ['01-17', '02-21', '04-15', '05-30', '06-20', '07-04', '09-05', '11-24', '12-26'],
+    2023: ['01-02', '01-16', '02-20', '04-07', '05-29', '06-19', '07-04', '09-04', '11-23', '12-25'],
+    2024: ['01-01', '01-15', '02-19', '03-29', '05-27', '06-19', '07-04', '09-02', '11-28', '12-25'],
+    2025: ['01-01', '01-20', '02-17', '04-18', '05-26', '06-19', '07-04', '09-01', '11-27', '12-25'],
+    2026: ['01-01', '01-19', '02-16', '04-03', '05-25', '06-19', '07-03', '09-07', '11-26', '12-25'],
+}
+
+
+@pytest.mark.parametrize('year', sorted(NYSE_HOLIDAYS))
+def test_nyse_holidays(year):
+    expected = {date.fromisoformat(f'{year}-{day}') for day in NYSE_HOLIDAYS[year]}
+    assert set(M.nyse_holidays(year)) == expected
+
+
+def test_calendar_sessions_and_early_closes():
+    assert not CALENDAR.is_session(date(2024, 3, 29))   # Good Friday
+    assert CALENDAR.next_session(date(2024, 3, 28)) == date(2024, 4, 1)
+    assert CALENDAR.session_close(date(2024, 11, 29)).hour == 13
+    assert CALENDAR.sessions_between(date(2024, 3, 25), date(2024, 4, 1)) == 4